@@ -0,0 +1,222 @@
+"""
+Call Quality Metrics
+Sound level, tonality, network issue, silence cutting and silence red-flag
+detectors for the agent channel, driven by the AppSettings thresholds.
+Every detector reads the whole-call frame feature matrix the VAD already
+computed (SpeechTimeline.features), so together they add only a few array
+reductions per call. The pipeline runs them through analyzer.detector_registry;
+compute_call_metrics() runs them all on a timeline directly.
+"""
+
+import numpy as np
+from config import app_settings
+
+# Result fields written by compute_call_metrics() (cached with the verdicts)
+METRIC_FIELDS = (
+    'sound_level',
+    'sound_level_dbfs',
+    'tonality',
+    'tonality_dbfs',
+    'network_issue',
+    'network_dropouts',
+    'cutting',
+    'silence_cuts',
+    'silence_red_flag',
+    'longest_silence_ms',
+)
+
+# Longest gap (frames, 25ms hop) between speech frames that counts as a network dropout
+DROPOUT_MAX_FRAMES = 2
+
+# Level change (dB over one hop) into and out of a silence for it to count as a cut
+# (natural pauses fade out; a cut drops straight to silence)
+CUT_MIN_STEP_DB = 20
+
+# RMS floor (int16 units) so digital silence maps to a finite level (about -150 dBFS)
+_MIN_RMS = 1e-3
+
+
+def _runs(mask):
+    """
+    Find the runs of True values in a boolean array.
+
+    Returns:
+        (starts, ends) index arrays, ends exclusive
+    """
+    padded = np.concatenate(([0], mask.astype(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(padded))
+    return edges[0::2], edges[1::2]
+
+
+def hop_ms(features):
+    """Milliseconds between frame starts."""
+    return features['hop_length'] / features['frame_rate'] * 1000
+
+
+def frame_rms_int16(features, peak):
+    """Frame RMS back in int16 units (frame features are peak-normalized)."""
+    return features['rms'] / 32767 * peak
+
+
+def frame_levels_dbfs(rms):
+    """Frame levels in dBFS from int16-unit RMS values."""
+    return 20 * np.log10(np.maximum(rms, _MIN_RMS) / 32768)
+
+
+def segment_frames(speech_segments, n_frames, frame_hop_ms):
+    """Boolean mask of the frames inside the given (start_ms, end_ms) speech segments."""
+    frame_times = np.arange(n_frames) * frame_hop_ms
+    mask = np.zeros(n_frames, dtype=bool)
+    for start_ms, end_ms in speech_segments:
+        mask[np.searchsorted(frame_times, start_ms):np.searchsorted(frame_times, end_ms)] = True
+    return mask
+
+
+def audible_frames(speech_mask, levels):
+    """VAD speech frames loud enough to hear (a near-silent line has no dropouts or cuts)."""
+    return speech_mask & (levels >= app_settings.silence_thresh)
+
+
+def _rate_level(dbfs, perfect, good, low, below_low):
+    """Rating for a dBFS level against descending perfect/good/low thresholds."""
+    if dbfs is None:
+        return "No Speech"
+    if dbfs >= perfect:
+        return "Perfect"
+    if dbfs >= good:
+        return "Good"
+    if dbfs >= low:
+        return "Low"
+    return below_low
+
+
+def sound_level_metric(rms, speech):
+    """
+    Agent speech loudness: RMS level of the speech frames in dBFS, rated
+    against sound_perfect / sound_good / sound_low.
+    """
+    if not speech.any():
+        return {'sound_level': "No Speech", 'sound_level_dbfs': None}
+    dbfs = 20 * np.log10(max(np.sqrt(np.mean(rms[speech] ** 2)), _MIN_RMS) / 32768)
+    perfect, good, low = app_settings.get_sound_thresholds()
+    return {
+        'sound_level': _rate_level(dbfs, perfect, good, low, "Very Low"),
+        'sound_level_dbfs': round(float(dbfs), 2)
+    }
+
+
+def tonality_metric(levels, speech):
+    """
+    Vocal projection: level of the agent's stressed syllables (90th
+    percentile speech-frame level, dBFS), rated against the tonality thresholds.
+    """
+    if not speech.any():
+        return {'tonality': "No Speech", 'tonality_dbfs': None}
+    dbfs = float(np.percentile(levels[speech], 90))
+    perfect, good, low = app_settings.get_tonality_thresholds()
+    return {
+        'tonality': _rate_level(dbfs, perfect, good, low, "Flat"),
+        'tonality_dbfs': round(dbfs, 2)
+    }
+
+
+def network_metric(features, rms, levels, speech, audible):
+    """
+    Network issues on the agent line.
+
+    Dropouts are gaps of at most DROPOUT_MAX_FRAMES between audible speech
+    frames where the level collapses below silence_thresh (lost packets); reaching
+    frag_count_thresh flags the call. It is also flagged when two of these
+    hold over the speech frames: amplitude coefficient of variation above
+    amp_cv_thresh, mean frame-to-frame ZCR change above zcr_diff_thresh,
+    median spectral rolloff above rolloff_thresh of Nyquist (static/hiss).
+    """
+    rolloff_thresh, zcr_diff_thresh, amp_cv_thresh, frag_count_thresh = app_settings.get_network_thresholds()
+
+    gap_starts, gap_ends = _runs(~audible)
+    bounded = (gap_starts > 0) & (gap_ends < len(audible)) & (gap_ends - gap_starts <= DROPOUT_MAX_FRAMES)
+    gap_starts, gap_ends = gap_starts[bounded], gap_ends[bounded]
+    gap_peaks = np.maximum(levels[gap_starts], levels[gap_ends - 1])
+    dropouts = int(np.count_nonzero(gap_peaks < app_settings.silence_thresh))
+
+    signals = 0
+    if np.count_nonzero(speech) >= 2:
+        amplitude = rms[speech]
+        if amplitude.mean() > 0 and amplitude.std() / amplitude.mean() > amp_cv_thresh:
+            signals += 1
+        zcr = features['zcr'] * features['zcr_scale']
+        pairs = speech[1:] & speech[:-1]
+        if pairs.any() and np.mean(np.abs(np.diff(zcr))[pairs]) > zcr_diff_thresh:
+            signals += 1
+        nyquist = features['frame_rate'] / 2
+        if np.median(features['rolloff'][speech]) > rolloff_thresh * nyquist:
+            signals += 1
+
+    is_issue = dropouts >= frag_count_thresh or signals >= 2
+    return {'network_issue': "Yes" if is_issue else "No", 'network_dropouts': dropouts}
+
+
+def cutting_metric(levels, audible, hop_ms):
+    """
+    Agent voice cutting out: silences (below silence_thresh, at least
+    min_silence_len ms) that start and end directly against audible speech
+    frames, with the level stepping by CUT_MIN_STEP_DB on both edges.
+    The cut count is rated against cutting_perfect_max / cutting_good_max.
+    """
+    min_silence_len, silence_thresh, perfect_max, good_max = app_settings.get_silence_thresholds()
+    starts, ends = _runs(levels < silence_thresh)
+    long_enough = (ends - starts) * hop_ms >= min_silence_len
+    bounded = (starts > 0) & (ends < len(levels))
+    starts, ends = starts[long_enough & bounded], ends[long_enough & bounded]
+    abrupt = ((levels[starts - 1] - levels[starts] >= CUT_MIN_STEP_DB) &
+              (levels[ends] - levels[ends - 1] >= CUT_MIN_STEP_DB))
+    cuts = int(np.count_nonzero(audible[starts - 1] & audible[ends] & abrupt))
+
+    if cuts <= perfect_max:
+        rating = "Perfect"
+    elif cuts <= good_max:
+        rating = "Good"
+    else:
+        rating = "Poor"
+    return {'cutting': rating, 'silence_cuts': cuts}
+
+
+def silence_red_flag_metric(levels, hop_ms):
+    """
+    Red flag for dead air: the agent channel stays below silent_thresh for
+    at least silent_duration ms in one stretch (muted or dropped line).
+    """
+    starts, ends = _runs(levels < app_settings.silent_thresh)
+    longest_ms = float((ends - starts).max() * hop_ms) if len(starts) else 0.0
+    return {
+        'silence_red_flag': "Yes" if longest_ms >= app_settings.silent_duration else "No",
+        'longest_silence_ms': round(longest_ms, 1)
+    }
+
+
+def compute_call_metrics(timeline):
+    """
+    Run every call quality detector on a timeline's shared frame features.
+
+    Args:
+        timeline: SpeechTimeline built with with_features=True
+
+    Returns:
+        Dict with the METRIC_FIELDS, or None if the timeline has no features
+    """
+    if timeline is None or timeline.features is None:
+        return None
+    features = timeline.features
+    frame_hop_ms = hop_ms(features)
+    rms = frame_rms_int16(features, timeline.peak)
+    levels = frame_levels_dbfs(rms)
+    speech = segment_frames(timeline.speech_segments, len(rms), frame_hop_ms)
+    audible = audible_frames(timeline.speech_mask, levels)
+
+    metrics = {}
+    metrics.update(sound_level_metric(rms, speech))
+    metrics.update(tonality_metric(levels, speech))
+    metrics.update(network_metric(features, rms, levels, speech, audible))
+    metrics.update(cutting_metric(levels, audible, frame_hop_ms))
+    metrics.update(silence_red_flag_metric(levels, frame_hop_ms))
+    return metrics
@@ -0,0 +1,120 @@
+"""
+Conversation Metrics
+Customer-side metrics for stereo recordings: customer first speech, talk-over
+(both parties speaking), dead air (neither speaking) and who hung up. Both
+channels come out of one 2-channel frame pass (compute_frame_features() on
+the agent and customer samples together), so the customer side reuses the
+decode, framing and FFT work of the agent analysis. The pipeline runs them
+through analyzer.detector_registry.
+"""
+
+import numpy as np
+
+from analyzer.call_metrics import _runs
+
+# Result fields written by the conversation detector (cached with the verdicts)
+CONVERSATION_FIELDS = (
+    'customer_onset_ms',
+    'talk_over_ms',
+    'talk_over_ratio',
+    'dead_air_ms',
+    'hung_up_by',
+)
+
+# Shortest mutual silence (ms) between the first and last speech that counts as dead air
+DEAD_AIR_MIN_MS = 2000
+
+# Frame level (dBFS) below which a channel's line is dead (digital silence after hang-up)
+DEAD_LINE_DBFS = -90
+
+# How much longer (ms) one channel's trailing dead line must be to say that party hung up
+HANGUP_MIN_MS = 500
+
+
+def customer_onset_metric(customer_timeline):
+    """Start time (ms) of the customer's first speech segment (None if they never speak)."""
+    return {'customer_onset_ms': customer_timeline.first_speech_onset_ms}
+
+
+def talk_over_metric(agent_speech, customer_speech, hop_ms):
+    """
+    Time both parties speak at once, and its share of the time either speaks.
+
+    Args:
+        agent_speech: Agent speech frame mask
+        customer_speech: Customer speech frame mask (same frame grid)
+        hop_ms: Milliseconds between frame starts
+    """
+    overlap = int(np.count_nonzero(agent_speech & customer_speech))
+    either = int(np.count_nonzero(agent_speech | customer_speech))
+    return {
+        'talk_over_ms': round(overlap * hop_ms, 1),
+        'talk_over_ratio': round(overlap / either, 3) if either else 0.0
+    }
+
+
+def dead_air_metric(agent_speech, customer_speech, hop_ms):
+    """
+    Total dead air: stretches of at least DEAD_AIR_MIN_MS where neither party
+    speaks, between the first and the last speech of the call.
+    """
+    spoken = np.flatnonzero(agent_speech | customer_speech)
+    if len(spoken) == 0:
+        return {'dead_air_ms': 0.0}
+    starts, ends = _runs(~(agent_speech | customer_speech)[spoken[0]:spoken[-1] + 1])
+    lengths = (ends - starts) * hop_ms
+    return {'dead_air_ms': round(float(lengths[lengths >= DEAD_AIR_MIN_MS].sum()), 1)}
+
+
+def _trailing_frames(mask):
+    """Frames after the last True value (all of them if there is none)."""
+    hits = np.flatnonzero(mask)
+    return len(mask) - (hits[-1] + 1) if len(hits) else len(mask)
+
+
+def hang_up_metric(agent_levels, customer_levels, agent_speech, customer_speech, hop_ms):
+    """
+    Who ended the call.
+
+    The party whose line goes dead (below DEAD_LINE_DBFS until the end of the
+    recording) at least HANGUP_MIN_MS before the other's hung up. When both
+    lines stay open, or close together, the last party to speak is taken to
+    have hung up (they said goodbye and ended the call).
+
+    Returns:
+        {'hung_up_by': "Agent", "Customer" or "Unknown"}
+    """
+    agent_dead = _trailing_frames(agent_levels >= DEAD_LINE_DBFS)
+    customer_dead = _trailing_frames(customer_levels >= DEAD_LINE_DBFS)
+    if abs(agent_dead - customer_dead) * hop_ms >= HANGUP_MIN_MS:
+        return {'hung_up_by': "Agent" if agent_dead > customer_dead else "Customer"}
+
+    if not agent_speech.any() and not customer_speech.any():
+        return {'hung_up_by': "Unknown"}
+    agent_quiet = _trailing_frames(agent_speech)
+    customer_quiet = _trailing_frames(customer_speech)
+    if agent_quiet == customer_quiet:
+        return {'hung_up_by': "Unknown"}
+    return {'hung_up_by': "Agent" if agent_quiet < customer_quiet else "Customer"}
+
+
+def compute_conversation_metrics(customer_timeline, agent_speech, customer_speech,
+                                 agent_levels, customer_levels, hop_ms):
+    """
+    Run every conversation metric on the two channels' shared frame grid.
+
+    Args:
+        customer_timeline: Customer channel SpeechTimeline
+        agent_speech, customer_speech: Speech frame masks
+        agent_levels, customer_levels: Frame levels in dBFS
+        hop_ms: Milliseconds between frame starts
+
+    Returns:
+        Dict with the CONVERSATION_FIELDS
+    """
+    metrics = {}
+    metrics.update(customer_onset_metric(customer_timeline))
+    metrics.update(talk_over_metric(agent_speech, customer_speech, hop_ms))
+    metrics.update(dead_air_metric(agent_speech, customer_speech, hop_ms))
+    metrics.update(hang_up_metric(agent_levels, customer_levels, agent_speech, customer_speech, hop_ms))
+    return metrics
@@ -0,0 +1,416 @@
+"""
+Detector Registry
+Detectors declare the per-call features they need (agent/customer channel,
+frame RMS, ZCR and spectral stats, speech segments, ...). For each call an
+AnalysisContext computes every required feature exactly once, in dependency
+order, runs only the detectors enabled for the run and times each feature
+and detector for profiling. When a detector needs customer_* features the
+agent and customer channels share one 2-channel frame pass (channel_features).
+
+Adding a check:
+
+    @register_detector('my_check', requires=('frame_levels', 'speech_frames'),
+                       fields=('my_check',), optional=True)
+    def my_check(ctx):
+        return {'my_check': ...}
+"""
+
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from config import app_settings
+from analyzer.intro_detection import (
+    SpeechTimeline, compute_frame_features, extract_left_channel, frame_rms, vad_frame_threshold,
+    _normalized_samples, _zcr_scale,
+    releasing_detection, late_hello_detection
+)
+from analyzer import call_metrics, conversation_metrics
+
+
+class FeatureSpec(NamedTuple):
+    """A per-call feature: compute(ctx) may read the features listed in requires."""
+    name: str
+    compute: Callable
+    requires: Tuple[str, ...]
+
+
+class DetectorSpec(NamedTuple):
+    """
+    A registered detector.
+
+    compute(ctx) returns a dict of result fields. A detector with a setting
+    only runs while that AppSettings attribute is truthy; optional detectors
+    never fail the call (their fields are left out on error).
+    """
+    name: str
+    compute: Callable
+    requires: Tuple[str, ...]
+    fields: Tuple[str, ...]
+    setting: Optional[str]
+    optional: bool
+
+
+# Registered features and detectors, by name (detectors run in registration order)
+FEATURES: Dict[str, FeatureSpec] = {}
+DETECTORS: Dict[str, DetectorSpec] = {}
+
+
+def register_feature(name: str, requires: Iterable[str] = ()):
+    """Decorator registering compute(ctx) as the feature `name`."""
+    def decorator(compute):
+        FEATURES[name] = FeatureSpec(name, compute, tuple(requires))
+        return compute
+    return decorator
+
+
+def register_detector(name: str, requires: Iterable[str], fields: Iterable[str],
+                      setting: Optional[str] = None, optional: bool = False):
+    """
+    Decorator registering compute(ctx) as the detector `name`.
+
+    Args:
+        name: Detector name
+        requires: Features the detector reads from the context
+        fields: Result fields it returns
+        setting: AppSettings attribute that enables it (None = always on)
+        optional: Swallow errors instead of failing the call's classification
+    """
+    def decorator(compute):
+        DETECTORS[name] = DetectorSpec(name, compute, tuple(requires), tuple(fields), setting, optional)
+        return compute
+    return decorator
+
+
+def enabled_detectors() -> List[str]:
+    """Names of the registered detectors enabled by the current settings."""
+    return [
+        name for name, spec in DETECTORS.items()
+        if spec.setting is None or getattr(app_settings, spec.setting, False)
+    ]
+
+
+class AnalysisContext:
+    """
+    Per-call feature scheduler.
+
+    Features are computed on first access and kept for the rest of the call.
+    `required` is the closure of the features the run's detectors declared;
+    features may consult it to pick a cheaper computation (e.g. onset-only
+    VAD when no detector needs the full frame features). `timings` holds
+    seconds per feature (excluding nested features) and per 'detector:<name>'
+    (excluding the features it requires).
+    """
+
+    def __init__(self, audio, detectors: Optional[List[str]] = None, timeline: Optional[SpeechTimeline] = None):
+        self.audio = audio
+        if detectors is None:
+            detectors = enabled_detectors()
+            if getattr(audio, 'channels', 1) != 2:
+                # Mono call: customer-channel detectors have nothing to read
+                detectors = [name for name in detectors if 'customer_channel' not in self._resolve([name])]
+        self.detectors = list(detectors)
+        self.required = self._resolve(self.detectors)
+        self.timings: Dict[str, float] = {}
+        self._values = {}
+        self._nested = 0.0
+        if timeline is not None:
+            self._seed_timeline(timeline)
+
+    @staticmethod
+    def _resolve(detectors: List[str]) -> set:
+        required = set()
+        pending = [feature for name in detectors for feature in DETECTORS[name].requires]
+        while pending:
+            feature = pending.pop()
+            if feature not in required:
+                required.add(feature)
+                pending.extend(FEATURES[feature].requires)
+        return required
+
+    def _seed_timeline(self, timeline: SpeechTimeline):
+        """Reuse a timeline built earlier in the call (and its features, if it kept them)."""
+        self._values['agent_channel'] = timeline.agent_channel
+        if timeline.onset_only and 'frame_features' in self.required:
+            return  # Frame-based detectors need every speech segment
+        self._values['speech_timeline'] = timeline
+        if timeline.features is not None:
+            self._values['frame_features'] = timeline.features
+            self._values['peak'] = timeline.peak
+
+    def has(self, name: str) -> bool:
+        """True once the feature has been computed (or seeded from a timeline)."""
+        return name in self._values
+
+    def __getitem__(self, name: str):
+        if name in self._values:
+            return self._values[name]
+        spec = FEATURES[name]
+        for dependency in spec.requires:
+            self[dependency]
+
+        # Time this feature alone; nested computations are charged to themselves
+        outer_nested, self._nested = self._nested, 0.0
+        start = time.perf_counter()
+        value = spec.compute(self)
+        elapsed = time.perf_counter() - start
+        self.timings[name] = self.timings.get(name, 0.0) + elapsed - self._nested
+        self._nested = outer_nested + elapsed
+
+        self._values[name] = value
+        return value
+
+    def run(self) -> Tuple[Dict, Dict[str, str]]:
+        """
+        Evaluate the run's detectors.
+
+        Returns:
+            (result fields from every detector that succeeded,
+             {detector name: error message} for optional detectors that failed)
+        """
+        results, errors = {}, {}
+        for name in self.detectors:
+            spec = DETECTORS[name]
+            try:
+                for feature in spec.requires:
+                    self[feature]
+                start = time.perf_counter()
+                results.update(spec.compute(self))
+            except Exception as e:
+                if not spec.optional:
+                    raise
+                errors[name] = str(e)
+                continue
+            self.timings[f"detector:{name}"] = time.perf_counter() - start
+        return results, errors
+
+
+def run_detectors(audio, detectors: Optional[List[str]] = None,
+                  timeline: Optional[SpeechTimeline] = None) -> Tuple[Dict, AnalysisContext]:
+    """
+    Run the enabled detectors on one call.
+
+    Args:
+        audio: Full audio segment (stereo or mono) or agent channel
+        detectors: Detector names to run (None = enabled_detectors())
+        timeline: SpeechTimeline already built for this call, reused instead of re-running VAD
+
+    Returns:
+        (result fields, the AnalysisContext with the features and timings)
+
+    Raises:
+        Errors from non-optional detectors
+    """
+    ctx = AnalysisContext(audio, detectors, timeline)
+    results, _ = ctx.run()
+    return results, ctx
+
+
+# ────────────── Built-in features ──────────────
+
+@register_feature('agent_channel')
+def _agent_channel(ctx):
+    return extract_left_channel(ctx.audio)
+
+
+@register_feature('customer_channel')
+def _customer_channel(ctx):
+    # Imported here: core imports this module
+    from core.audio_decoder import select_channel
+    return select_channel(ctx.audio, 1) if ctx.audio.channels == 2 else None
+
+
+@register_feature('samples', requires=('agent_channel',))
+def _samples(ctx):
+    """Peak-normalized float32 agent samples and the peak value."""
+    return _normalized_samples(ctx['agent_channel'], return_peak=True)
+
+
+@register_feature('peak', requires=('samples',))
+def _peak(ctx):
+    return ctx['samples'][1]
+
+
+def _channel_features(features, channel):
+    features['zcr_scale'] = _zcr_scale(channel)
+    features['frame_rate'] = channel.frame_rate
+    return features
+
+
+@register_feature('frame_features', requires=('samples', 'agent_channel'))
+def _frame_features(ctx):
+    """Frame RMS, ZCR and spectral stats for the whole call (one batched FFT pass)."""
+    if 'channel_features' in ctx.required:
+        return ctx['channel_features'][0]  # Agent row of the 2-channel pass
+    agent_channel = ctx['agent_channel']
+    return _channel_features(compute_frame_features(ctx['samples'][0], agent_channel.frame_rate), agent_channel)
+
+
+@register_feature('customer_samples', requires=('customer_channel',))
+def _customer_samples(ctx):
+    """Peak-normalized float32 customer samples and the peak value (None for mono calls)."""
+    customer_channel = ctx['customer_channel']
+    return _normalized_samples(customer_channel, return_peak=True) if customer_channel is not None else None
+
+
+@register_feature('channel_features', requires=('samples', 'agent_channel', 'customer_samples'))
+def _channel_features_pair(ctx):
+    """
+    (agent, customer) frame features from one 2-channel pass: each block of
+    both channels' frames goes through a single batched FFT. The customer
+    entry is None for mono calls.
+
+    The customer features only feed the customer VAD and levels, so its ZCR
+    and spectral stats are computed just for frames above its VAD energy
+    threshold (the rest can never be speech); the agent's are complete.
+    """
+    agent_channel = ctx['agent_channel']
+    customer = ctx['customer_samples']
+    if customer is None:
+        agent = compute_frame_features(ctx['samples'][0], agent_channel.frame_rate)
+        return _channel_features(agent, agent_channel), None
+    customer_channel = ctx['customer_channel']
+    frame_rate = customer_channel.frame_rate
+    rms = frame_rms(customer[0], frame_rate)
+    customer_frames = rms > vad_frame_threshold(rms, frame_rate)
+    if ctx.has('frame_features'):
+        # Agent features came with a seeded timeline: only the customer is left
+        features = compute_frame_features(customer[0], frame_rate, spectral_frames=customer_frames)
+        return ctx['frame_features'], _channel_features(features, customer_channel)
+
+    features = compute_frame_features((ctx['samples'][0], customer[0]), frame_rate,
+                                      spectral_frames=(None, customer_frames))
+    rows = [
+        {key: value[row] if isinstance(value, np.ndarray) else value for key, value in features.items()}
+        for row in range(2)
+    ]
+    return _channel_features(rows[0], agent_channel), _channel_features(rows[1], customer_channel)
+
+
+@register_feature('customer_frame_features', requires=('channel_features',))
+def _customer_frame_features(ctx):
+    return ctx['channel_features'][1]
+
+
+@register_feature('speech_timeline', requires=('agent_channel',))
+def _speech_timeline(ctx):
+    agent_channel = ctx['agent_channel']
+    if 'frame_features' in ctx.required:
+        # The features are computed anyway: run the full VAD on them
+        return SpeechTimeline.from_features(
+            agent_channel, ctx['frame_features'], ctx['peak'], len(ctx['samples'][0])
+        )
+    return SpeechTimeline.from_audio(agent_channel, onset_only=app_settings.vad_onset_only)
+
+
+@register_feature('customer_timeline', requires=('customer_frame_features', 'customer_samples'))
+def _customer_timeline(ctx):
+    """Full VAD of the customer channel on its frame features (None for mono calls)."""
+    features = ctx['customer_frame_features']
+    if features is None:
+        return None
+    samples, peak = ctx['customer_samples']
+    return SpeechTimeline.from_features(ctx['customer_channel'], features, peak, len(samples))
+
+
+@register_feature('frame_rms', requires=('frame_features', 'peak'))
+def _frame_rms(ctx):
+    return call_metrics.frame_rms_int16(ctx['frame_features'], ctx['peak'])
+
+
+@register_feature('frame_levels', requires=('frame_rms',))
+def _frame_levels(ctx):
+    return call_metrics.frame_levels_dbfs(ctx['frame_rms'])
+
+
+@register_feature('speech_frames', requires=('speech_timeline', 'frame_features'))
+def _speech_frames(ctx):
+    """Frames inside the speech segments."""
+    features = ctx['frame_features']
+    return call_metrics.segment_frames(ctx['speech_timeline'].speech_segments,
+                                       len(features['rms']), call_metrics.hop_ms(features))
+
+
+@register_feature('audible_frames', requires=('speech_timeline', 'speech_frames', 'frame_levels'))
+def _audible_frames(ctx):
+    speech_mask = ctx['speech_timeline'].speech_mask
+    if speech_mask is None:
+        speech_mask = ctx['speech_frames']  # Timeline built without the frame features
+    return call_metrics.audible_frames(speech_mask, ctx['frame_levels'])
+
+
+@register_feature('customer_frame_levels', requires=('customer_frame_features', 'customer_samples'))
+def _customer_frame_levels(ctx):
+    features = ctx['customer_frame_features']
+    if features is None:
+        return None
+    return call_metrics.frame_levels_dbfs(call_metrics.frame_rms_int16(features, ctx['customer_samples'][1]))
+
+
+@register_feature('customer_speech_frames', requires=('customer_timeline', 'customer_frame_features'))
+def _customer_speech_frames(ctx):
+    timeline = ctx['customer_timeline']
+    if timeline is None:
+        return None
+    features = ctx['customer_frame_features']
+    return call_metrics.segment_frames(timeline.speech_segments, len(features['rms']),
+                                       call_metrics.hop_ms(features))
+
+
+# ────────────── Built-in detectors ──────────────
+
+@register_detector('releasing', requires=('speech_timeline',), fields=('releasing_detection',))
+def _releasing(ctx):
+    return {'releasing_detection': releasing_detection(ctx.audio, timeline=ctx['speech_timeline'])}
+
+
+@register_detector('late_hello', requires=('speech_timeline',), fields=('late_hello_detection',))
+def _late_hello(ctx):
+    return {'late_hello_detection': late_hello_detection(ctx.audio, timeline=ctx['speech_timeline'])}
+
+
+@register_detector('sound_level', requires=('frame_rms', 'speech_frames'),
+                   fields=('sound_level', 'sound_level_dbfs'), setting='call_metrics_enabled', optional=True)
+def _sound_level(ctx):
+    return call_metrics.sound_level_metric(ctx['frame_rms'], ctx['speech_frames'])
+
+
+@register_detector('tonality', requires=('frame_levels', 'speech_frames'),
+                   fields=('tonality', 'tonality_dbfs'), setting='call_metrics_enabled', optional=True)
+def _tonality(ctx):
+    return call_metrics.tonality_metric(ctx['frame_levels'], ctx['speech_frames'])
+
+
+@register_detector('network_issue',
+                   requires=('frame_features', 'frame_rms', 'frame_levels', 'speech_frames', 'audible_frames'),
+                   fields=('network_issue', 'network_dropouts'), setting='call_metrics_enabled', optional=True)
+def _network_issue(ctx):
+    return call_metrics.network_metric(ctx['frame_features'], ctx['frame_rms'], ctx['frame_levels'],
+                                       ctx['speech_frames'], ctx['audible_frames'])
+
+
+@register_detector('cutting', requires=('frame_features', 'frame_levels', 'audible_frames'),
+                   fields=('cutting', 'silence_cuts'), setting='call_metrics_enabled', optional=True)
+def _cutting(ctx):
+    return call_metrics.cutting_metric(ctx['frame_levels'], ctx['audible_frames'],
+                                       call_metrics.hop_ms(ctx['frame_features']))
+
+
+@register_detector('silence_red_flag', requires=('frame_features', 'frame_levels'),
+                   fields=('silence_red_flag', 'longest_silence_ms'), setting='call_metrics_enabled', optional=True)
+def _silence_red_flag(ctx):
+    return call_metrics.silence_red_flag_metric(ctx['frame_levels'], call_metrics.hop_ms(ctx['frame_features']))
+
+
+@register_detector('conversation',
+                   requires=('frame_features', 'speech_frames', 'frame_levels', 'customer_timeline',
+                             'customer_speech_frames', 'customer_frame_levels'),
+                   fields=conversation_metrics.CONVERSATION_FIELDS, setting='dual_channel_enabled', optional=True)
+def _conversation(ctx):
+    if ctx['customer_timeline'] is None:
+        return {}  # Mono recording: no customer channel
+    return conversation_metrics.compute_conversation_metrics(
+        ctx['customer_timeline'], ctx['speech_frames'], ctx['customer_speech_frames'],
+        ctx['frame_levels'], ctx['customer_frame_levels'], call_metrics.hop_ms(ctx['frame_features'])
+    )
@@ -7,18 +7,14 @@ from scipy.fft import rfft, rfftfreq
 
 def extract_left_channel(audio_segment):
     """
-    Extract left channel (agent) from stereo audio.
+    Extract left channel (agent) from stereo audio as a zero-copy strided view.
     If mono, return the original segment.
     """
-    if audio_segment.channels == 2:
-        # Split stereo into left and right channels
-        left_channel = audio_segment.split_to_mono()[0]
-        return left_channel
-    else:
-        # Already mono, assume it's the agent channel
-        return audio_segment
+    # Imported here: core imports this module
+    from core.audio_decoder import select_channel
+    return select_channel(audio_segment, 0)
 
-def estimate_noise_floor(audio_array, frame_rate, percentile=10):
+def estimate_noise_floor(audio_array, frame_rate, percentile=10, rms=None, select=True):
     """
     Estimate adaptive noise floor from audio signal.
     Uses the lower percentile of frame energies to determine baseline noise.
@@ -27,25 +23,45 @@ def estimate_noise_floor(audio_array, frame_rate, percentile=10):
         audio_array: Normalized audio array
         frame_rate: Sample rate
         percentile: Percentile to use for noise floor (default 10th percentile)
+        rms: Frame RMS values already computed for this signal (50ms frames,
+            25ms hop, e.g. compute_frame_features()['rms']); skips the framing pass
+        select: Use the O(n) selection in percentile_select() instead of
+            np.percentile (same value)
     
     Returns:
         Noise floor energy level
     """
-    frame_length = int(0.05 * frame_rate)  # 50ms frames
-    hop_length = int(0.025 * frame_rate)   # 25ms hop
-    
-    frame_energies = []
-    for i in range(0, len(audio_array) - frame_length, hop_length):
-        frame = audio_array[i:i + frame_length]
-        rms = np.sqrt(np.mean(frame**2)) * 32767
-        frame_energies.append(rms)
+    if rms is None:
+        rms = frame_rms(audio_array, frame_rate)
     
-    if len(frame_energies) == 0:
+    if len(rms) == 0:
         return 0
     
     # Use percentile to estimate noise floor
-    noise_floor = np.percentile(frame_energies, percentile)
-    return noise_floor
+    return percentile_select(rms, percentile) if select else np.percentile(rms, percentile)
+
+
+def percentile_select(values, percentile):
+    """
+    np.percentile() (default linear interpolation) of a 1-D array in O(n).
+    
+    One np.partition() around the upper rank and a max() over the part below
+    it replace np.percentile's general machinery (about 9x faster on the
+    144k frames of a 1-hour call); the interpolation is numpy's own, so the
+    result is bit-identical.
+    """
+    n = len(values)
+    index = (n - 1) * percentile / 100.0
+    lower = int(np.floor(index))
+    upper = min(lower + 1, n - 1) if index > lower else lower
+    fraction = index - lower
+    
+    partitioned = np.partition(values, upper)
+    high = partitioned[upper]
+    low = partitioned[:upper].max() if lower < upper else high
+    diff = high - low
+    # numpy's lerp: interpolate from whichever end is closer
+    return high - diff * (1 - fraction) if fraction >= 0.5 else low + diff * fraction
 
 
 def calculate_spectral_features(frame, frame_rate):
@@ -88,6 +104,305 @@ def calculate_spectral_features(frame, frame_rate):
         return {'centroid': 0, 'bandwidth': 0, 'rolloff': 0}
 
 
+# Frames processed per vectorized block; bounds the memory held by the
+# squared-frame and FFT matrices on long recordings.
+FEATURE_BLOCK_FRAMES = 1024
+
+# Scalar promotion differs between NumPy releases (NEP 50): multiplying a
+# float32 scalar by a Python number yields float64 on NumPy 1.x and float32 on
+# NumPy 2.x. The per-frame code did exactly that, so the batched engine casts
+# to the same dtype to keep thresholds and segments bit-identical.
+_SCALAR_PROMOTED_DTYPE = (np.float32(1.0) * 0.85).dtype
+
+
+def frame_view(audio_array, frame_length, hop_length):
+    """
+    Build a zero-copy (n_frames, frame_length) strided view over a 1-D signal.
+    
+    Frame starts match range(0, len(audio_array) - frame_length, hop_length),
+    the framing used by the VAD since its first version.
+    
+    Args:
+        audio_array: 1-D numpy array
+        frame_length: Samples per frame
+        hop_length: Samples between frame starts
+    
+    Returns:
+        Read-only 2-D numpy view (may have zero rows)
+    """
+    span = len(audio_array) - frame_length
+    n_frames = (span + hop_length - 1) // hop_length if span > 0 and hop_length > 0 else 0
+    if n_frames == 0:
+        return np.empty((0, max(frame_length, 0)), dtype=audio_array.dtype)
+    stride = audio_array.strides[0]
+    return np.lib.stride_tricks.as_strided(
+        audio_array,
+        shape=(n_frames, frame_length),
+        strides=(hop_length * stride, stride),
+        writeable=False
+    )
+
+
+def frame_rms(audio_array, frame_rate, frame_ms=50, hop_ms=25):
+    """
+    Compute per-frame RMS energy (scaled to int16 range) for every frame.
+    
+    Much cheaper than compute_frame_features() since no FFT is involved;
+    used where only energy statistics over the whole call are needed.
+    
+    Returns:
+        1-D array with one RMS value per frame
+    """
+    frame_length = int(frame_ms / 1000 * frame_rate)
+    hop_length = int(hop_ms / 1000 * frame_rate)
+    frames = frame_view(audio_array, frame_length, hop_length)
+    
+    rms = np.zeros(frames.shape[0], dtype=_SCALAR_PROMOTED_DTYPE)
+    for start in range(0, frames.shape[0], FEATURE_BLOCK_FRAMES):
+        block = frames[start:start + FEATURE_BLOCK_FRAMES]
+        rms[start:start + block.shape[0]] = np.sqrt(np.mean(block ** 2, axis=1)).astype(_SCALAR_PROMOTED_DTYPE) * 32767
+    return rms
+
+
+def compute_frame_features(audio_array, frame_rate, frame_ms=50, hop_ms=25, frame_range=None,
+                           spectral_frames=None):
+    """
+    Compute VAD frame features for every frame as whole-array operations.
+    
+    Equivalent to running calculate_spectral_features() plus the RMS and ZCR
+    calculations on each frame, but uses one batched rfft along axis 1 per
+    block of frames instead of a Python loop with one FFT per hop.
+    
+    Several equal-length channels can be analyzed in the same pass: each
+    block then stacks the channels' frames into one FFT batch, so framing,
+    the FFT plan and the per-block work are shared instead of repeated.
+    
+    Args:
+        audio_array: Normalized float32 audio array (mono), or a sequence of
+            equal-length channel arrays
+        frame_rate: Sample rate
+        frame_ms: Frame length in milliseconds (default 50ms)
+        hop_ms: Hop length in milliseconds (default 25ms)
+        frame_range: Optional (start, stop) frame indices to compute only
+            part of the call (default: all frames)
+        spectral_frames: Optional boolean mask over the frames in range (one
+            per channel, None = every frame); ZCR and spectral stats are only
+            computed where it is True and left 0 elsewhere (RMS is always computed)
+    
+    Returns:
+        dict of 1-D arrays (one value per frame in range): rms, zcr, centroid,
+        bandwidth, rolloff; plus frame_length, hop_length and n_frames (the
+        total frame count of the call). For a sequence of channels the arrays
+        are 2-D, one row per channel.
+    """
+    mono = isinstance(audio_array, np.ndarray) and audio_array.ndim == 1
+    channels = [audio_array] if mono else list(audio_array)
+    n_channels = len(channels)
+    frame_length = int(frame_ms / 1000 * frame_rate)
+    hop_length = int(hop_ms / 1000 * frame_rate)
+    all_frames = [frame_view(channel, frame_length, hop_length) for channel in channels]
+    total_frames = all_frames[0].shape[0]
+    if frame_range is not None:
+        frames = [f[frame_range[0]:frame_range[1]] for f in all_frames]
+    else:
+        frames = all_frames
+    n_frames = frames[0].shape[0]
+    masks = [spectral_frames] if mono else list(spectral_frames or [None] * n_channels)
+    
+    shape = (n_channels, n_frames)
+    rms = np.zeros(shape, dtype=_SCALAR_PROMOTED_DTYPE)
+    zcr = np.zeros(shape, dtype=np.float64)
+    centroid = np.zeros(shape, dtype=np.float64)
+    bandwidth = np.zeros(shape, dtype=np.float64)
+    rolloff = np.zeros(shape, dtype=np.float64)
+    
+    if n_frames > 0:
+        fft_freqs = rfftfreq(frame_length, 1.0 / frame_rate)
+        
+        # Same batch size whatever the channel count (bounds memory, keeps the FFT in cache)
+        block_frames = max(FEATURE_BLOCK_FRAMES // n_channels, 1)
+        for start in range(0, n_frames, block_frames):
+            stop = min(start + block_frames, n_frames)
+            size = stop - start
+            
+            parts, rows = [], []
+            for channel, (channel_frames, mask) in enumerate(zip(frames, masks)):
+                view = channel_frames[start:stop]
+                # RMS energy, scaled back to int16 range
+                rms[channel, start:stop] = np.sqrt(np.mean(view ** 2, axis=1)).astype(_SCALAR_PROMOTED_DTYPE) * 32767
+                # Frames that need ZCR and spectral stats
+                if mask is None:
+                    parts.append(view)
+                    rows.append(np.arange(channel * size, (channel + 1) * size))
+                else:
+                    selected = np.flatnonzero(mask[start:stop])
+                    parts.append(view[selected])
+                    rows.append(selected + channel * size)
+            # One batch for every channel; row r is frame start + r % size of channel r // size
+            block = parts[0] if n_channels == 1 else np.concatenate(parts)
+            rows = rows[0] if n_channels == 1 else np.concatenate(rows)
+            if len(rows) == 0:
+                continue
+            row, col = np.divmod(rows, size)
+            col += start
+            
+            # Zero crossing rate
+            zcr[row, col] = np.count_nonzero(np.diff(np.sign(block), axis=1), axis=1) / frame_length
+            
+            # Spectral features from one batched FFT
+            fft_vals = np.abs(rfft(block, axis=1))
+            total = np.sum(fft_vals, axis=1)
+            valid = total != 0
+            if not np.any(valid):
+                continue
+            
+            vals = fft_vals[valid]
+            total = total[valid]
+            
+            block_centroid = np.sum(fft_freqs * vals, axis=1) / total
+            block_bandwidth = np.sqrt(
+                np.sum(((fft_freqs - block_centroid[:, None]) ** 2) * vals, axis=1) / total
+            )
+            
+            cumsum = np.cumsum(vals, axis=1)
+            limit = 0.85 * cumsum[:, -1].astype(_SCALAR_PROMOTED_DTYPE)
+            reached = cumsum >= limit[:, None]
+            block_rolloff = np.where(reached.any(axis=1), fft_freqs[np.argmax(reached, axis=1)], 0)
+            
+            row, col = row[valid], col[valid]
+            centroid[row, col] = block_centroid
+            bandwidth[row, col] = block_bandwidth
+            rolloff[row, col] = block_rolloff
+    
+    if mono:
+        rms, zcr, centroid, bandwidth, rolloff = rms[0], zcr[0], centroid[0], bandwidth[0], rolloff[0]
+    return {
+        'rms': rms,
+        'zcr': zcr,
+        'centroid': centroid,
+        'bandwidth': bandwidth,
+        'rolloff': rolloff,
+        'frame_length': frame_length,
+        'hop_length': hop_length,
+        'n_frames': total_frames
+    }
+
+
+def _normalized_samples(audio_segment, return_peak=False):
+    """
+    Convert a mono AudioSegment to a float32 array normalized to peak 1.0.
+    With return_peak, also return the peak sample value (0 for silence).
+    """
+    audio_array = np.array(audio_segment.get_array_of_samples(), dtype=np.float32)
+    peak = float(np.max(np.abs(audio_array))) if len(audio_array) > 0 else 0.0
+    if peak > 0:
+        audio_array /= peak  # In place: the float conversion is the only copy
+    if return_peak:
+        return audio_array, peak
+    return audio_array
+
+
+def _effective_energy_threshold(audio_array, frame_rate, energy_threshold, use_adaptive, noise_floor=None):
+    """Energy threshold for the VAD energy check, adapted to the call's noise floor."""
+    if not use_adaptive:
+        return energy_threshold
+    if noise_floor is None:
+        noise_floor = estimate_noise_floor(audio_array, frame_rate)
+    # Set adaptive threshold: noise floor + margin
+    adaptive_threshold = noise_floor + (energy_threshold * 0.3)  # 30% above noise floor
+    return max(adaptive_threshold, energy_threshold * 0.7)  # At least 70% of config
+
+
+def vad_frame_threshold(rms, frame_rate, energy_threshold=None):
+    """
+    Adaptive VAD energy threshold from a call's frame RMS values.
+    
+    Same threshold as voice_activity_detection(), from the same frame energies.
+    Frames at or below it are never speech, so their ZCR and spectral stats
+    can be skipped (see compute_frame_features(spectral_frames=...)).
+    """
+    if energy_threshold is None:
+        energy_threshold = app_settings.vad_energy_threshold
+    noise_floor = estimate_noise_floor(None, frame_rate, rms=rms)
+    return _effective_energy_threshold(None, frame_rate, energy_threshold, True, noise_floor=noise_floor)
+
+
+def _zcr_scale(audio_segment):
+    """
+    Factor converting ZCR at the analysis rate to ZCR at the recording's own rate.
+    
+    ZCR is measured per sample, so resampling a call (e.g. 44.1 kHz -> 8 kHz
+    telephony analysis) scales it by source_rate / analysis_rate. Applying this
+    factor keeps the ZCR speech range equivalent to analyzing at the native rate.
+    """
+    source_rate = getattr(audio_segment, 'source_frame_rate', None) or audio_segment.frame_rate
+    return audio_segment.frame_rate / source_rate
+
+
+def _speech_frame_mask(features, effective_threshold, zcr_scale=1.0):
+    """
+    Apply the VAD speech criteria to frame features.
+    
+    Args:
+        features: Frame features from compute_frame_features()
+        effective_threshold: Energy threshold for the energy check
+        zcr_scale: ZCR conversion factor for resampled audio (see _zcr_scale)
+    
+    Returns:
+        Boolean array, True for frames classified as speech
+    """
+    # Enhanced speech detection criteria:
+    # 1. Energy above adaptive threshold
+    # 2. ZCR in typical speech range (0.01 to 0.3)
+    # 3. Spectral centroid in speech range (300-3000 Hz)
+    # 4. Spectral bandwidth indicates complex signal (not pure tone)
+    # 5. Spectral rolloff in reasonable range
+    
+    energy_check = features['rms'] > effective_threshold
+    zcr = features['zcr'] * zcr_scale if zcr_scale != 1.0 else features['zcr']
+    zcr_check = (zcr > 0.01) & (zcr < 0.3)
+    
+    # Spectral checks to reject tonal noise (hum, airflow)
+    centroid_check = (features['centroid'] > 300) & (features['centroid'] < 3500)  # Speech frequency range
+    bandwidth_check = features['bandwidth'] > 200  # Not a pure tone
+    rolloff_check = features['rolloff'] < 4000  # Reasonable upper frequency
+    
+    # Combine criteria: energy + ZCR + at least 2 of 3 spectral checks
+    spectral_score = (centroid_check.astype(np.int8) +
+                      bandwidth_check.astype(np.int8) +
+                      rolloff_check.astype(np.int8))
+    
+    return energy_check & zcr_check & (spectral_score >= 2)
+
+
+def _frame_times_ms(frames, hop_length, frame_rate):
+    """Start times (ms) of frame indices; same arithmetic (and floats) as i * hop / rate * 1000."""
+    return np.asarray(frames, dtype=np.int64) * hop_length / frame_rate * 1000
+
+
+def _speech_segments(speech_frames, hop_length, frame_rate, n_samples, min_speech_duration):
+    """
+    Convert a per-frame speech mask to (start_ms, end_ms) segments of at least
+    min_speech_duration; speech running to the end of the call ends at n_samples.
+    
+    Runs are found with one diff over the padded mask instead of a per-frame loop.
+    """
+    padded = np.concatenate(([False], np.asarray(speech_frames, dtype=bool), [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    starts, ends = edges[0::2], edges[1::2]
+    if len(starts) == 0:
+        return []
+    
+    start_ms = _frame_times_ms(starts, hop_length, frame_rate)
+    end_ms = _frame_times_ms(ends, hop_length, frame_rate)
+    # Speech continuing to the end of the audio ends with the last sample
+    if ends[-1] == len(padded) - 2:
+        end_ms[-1] = n_samples / frame_rate * 1000
+    
+    keep = end_ms - start_ms >= min_speech_duration
+    return list(zip(start_ms[keep].tolist(), end_ms[keep].tolist()))
+
+
 def voice_activity_detection(audio_segment, energy_threshold=None, min_speech_duration=None, use_adaptive=True):
     """
     Enhanced Voice Activity Detection (VAD) with adaptive noise floor and spectral analysis.
@@ -107,100 +422,141 @@ def voice_activity_detection(audio_segment, energy_threshold=None, min_speech_du
     if min_speech_duration is None:
         min_speech_duration = app_settings.vad_min_speech_duration
     try:
-        # Convert to numpy array
-        audio_array = np.array(audio_segment.get_array_of_samples(), dtype=np.float32)
+        # Convert to normalized numpy array
+        audio_array = _normalized_samples(audio_segment)
         
         if len(audio_array) == 0:
             return []
         
-        # Normalize audio
-        if np.max(np.abs(audio_array)) > 0:
-            audio_array = audio_array / np.max(np.abs(audio_array))
+        # Calculate frame-based features (50ms frames with 25ms overlap) in one vectorized pass
+        features = compute_frame_features(audio_array, audio_segment.frame_rate)
         
-        # Estimate adaptive noise floor
+        # Estimate adaptive noise floor from the same frame energies
+        noise_floor = None
         if use_adaptive:
-            noise_floor = estimate_noise_floor(audio_array, audio_segment.frame_rate)
-            # Set adaptive threshold: noise floor + margin
-            adaptive_threshold = noise_floor + (energy_threshold * 0.3)  # 30% above noise floor
-            effective_threshold = max(adaptive_threshold, energy_threshold * 0.7)  # At least 70% of config
-        else:
-            effective_threshold = energy_threshold
+            noise_floor = estimate_noise_floor(audio_array, audio_segment.frame_rate, rms=features['rms'])
+        effective_threshold = _effective_energy_threshold(
+            audio_array, audio_segment.frame_rate, energy_threshold, use_adaptive, noise_floor=noise_floor
+        )
         
-        # Calculate frame-based energy (50ms frames with 25ms overlap)
-        frame_length = int(0.05 * audio_segment.frame_rate)  # 50ms
-        hop_length = int(0.025 * audio_segment.frame_rate)   # 25ms
+        speech_frames = _speech_frame_mask(features, effective_threshold, _zcr_scale(audio_segment))
         
-        speech_frames = []
+        return _speech_segments(speech_frames, features['hop_length'], audio_segment.frame_rate,
+                                len(audio_array), min_speech_duration)
         
-        for i in range(0, len(audio_array) - frame_length, hop_length):
-            frame = audio_array[i:i + frame_length]
-            
-            # Calculate RMS energy for this frame
-            rms_energy = np.sqrt(np.mean(frame**2)) * 32767  # Scale back to int16 range
-            
-            # Calculate zero crossing rate (helps distinguish speech from noise)
-            zcr = np.sum(np.diff(np.sign(frame)) != 0) / len(frame)
-            
-            # Calculate spectral features
-            spectral = calculate_spectral_features(frame, audio_segment.frame_rate)
-            
-            # Enhanced speech detection criteria:
-            # 1. Energy above adaptive threshold
-            # 2. ZCR in typical speech range (0.01 to 0.3)
-            # 3. Spectral centroid in speech range (300-3000 Hz)
-            # 4. Spectral bandwidth indicates complex signal (not pure tone)
-            # 5. Spectral rolloff in reasonable range
-            
-            energy_check = rms_energy > effective_threshold
-            zcr_check = 0.01 < zcr < 0.3
-            
-            # Spectral checks to reject tonal noise (hum, airflow)
-            centroid_check = 300 < spectral['centroid'] < 3500  # Speech frequency range
-            bandwidth_check = spectral['bandwidth'] > 200  # Not a pure tone
-            rolloff_check = spectral['rolloff'] < 4000  # Reasonable upper frequency
-            
-            # Combine criteria: energy + ZCR + at least 2 of 3 spectral checks
-            spectral_score = sum([centroid_check, bandwidth_check, rolloff_check])
-            
-            is_speech = (
-                energy_check and
-                zcr_check and
-                spectral_score >= 2  # At least 2 spectral features must pass
-            )
-            
-            speech_frames.append(is_speech)
+    except Exception as e:
+        # Fallback to simple energy-based detection
+        return simple_energy_vad(audio_segment, energy_threshold)
+
+def _qualified_ms(start_frame, end_frame, hop_length, frame_rate, min_speech_duration):
+    """Time (ms) of the first frame boundary at which a run starting at start_frame lasts min_speech_duration."""
+    start_ms = _frame_times_ms(start_frame, hop_length, frame_rate)
+    frames = np.arange(start_frame + 1, end_frame + 1)
+    reached = np.flatnonzero(_frame_times_ms(frames, hop_length, frame_rate) - start_ms >= min_speech_duration)
+    return float(_frame_times_ms(frames[reached[0]], hop_length, frame_rate))
+
+
+# Frames in the first onset-scan block (~3.2s at a 25ms hop); doubles per block
+ONSET_INITIAL_BLOCK_FRAMES = 128
+
+
+def first_speech_segment(audio_segment, energy_threshold=None, min_speech_duration=None, use_adaptive=True):
+    """
+    Early-exit VAD that finds only the first qualifying speech segment.
+    
+    Releasing and Late Hello depend only on when the first speech segment
+    starts, so this scans the channel in growing blocks of frames and stops
+    in the block where the first run of speech frames reaches
+    min_speech_duration, without waiting for that run to end. Only calls
+    without speech are scanned to the end.
+    
+    Peak normalization and the adaptive noise floor still use the whole call
+    (cheap, no FFT), so the start is identical to that of the first element
+    of voice_activity_detection() with the same arguments. The end is where
+    the segment reached min_speech_duration, not where it actually ends.
+    
+    Args:
+        audio_segment: Audio segment to analyze (mono agent channel)
+        energy_threshold: Minimum energy to consider as speech (None = use config)
+        min_speech_duration: Minimum duration (ms) to consider as valid speech (None = use config)
+        use_adaptive: Use adaptive noise floor estimation (default True)
+    
+    Returns:
+        (start_ms, end_ms) tuple for the first speech segment (end_ms = where it
+        became long enough), or None if no speech
+    """
+    # Use config values if not explicitly provided
+    if energy_threshold is None:
+        energy_threshold = app_settings.vad_energy_threshold
+    if min_speech_duration is None:
+        min_speech_duration = app_settings.vad_min_speech_duration
+    try:
+        frame_rate = audio_segment.frame_rate
+        audio_array = _normalized_samples(audio_segment)
+        
+        if len(audio_array) == 0:
+            return None
+        
+        # Noise floor over the whole call from frame energies only (no FFT)
+        effective_threshold = _effective_energy_threshold(audio_array, frame_rate, energy_threshold, use_adaptive)
         
-        # Convert frame-based detection to time segments
-        speech_segments = []
         in_speech = False
         speech_start = 0
+        start = 0
+        block_frames = ONSET_INITIAL_BLOCK_FRAMES
+        n_frames = None
         
-        for i, is_speech in enumerate(speech_frames):
-            time_ms = i * hop_length / audio_segment.frame_rate * 1000
+        while n_frames is None or start < n_frames:
+            features = compute_frame_features(audio_array, frame_rate, frame_range=(start, start + block_frames))
+            n_frames = features['n_frames']
+            hop_length = features['hop_length']
+            speech_frames = _speech_frame_mask(features, effective_threshold, _zcr_scale(audio_segment))
+            
+            block_end = start + len(speech_frames)
+            
+            # Same segment logic as voice_activity_detection, stopping at the first valid segment
+            if in_speech or speech_frames.any():
+                # Onsets/offsets against the previous frame (carried over from the last block)
+                previous = np.concatenate(([in_speech], speech_frames[:-1]))
+                onsets = np.flatnonzero(speech_frames & ~previous) + start
+                offsets = np.flatnonzero(~speech_frames & previous) + start
+                starts = np.concatenate(([speech_start], onsets)) if in_speech else onsets
+                in_speech = len(starts) > len(offsets)
+                
+                # A run still open at the block end lasts at least until the next
+                # block, unless this is the last block (it then ends at n_samples)
+                ends = offsets
+                if in_speech and block_end < n_frames:
+                    ends = np.append(offsets, block_end)
+                if len(ends) > 0:
+                    start_ms = _frame_times_ms(starts[:len(ends)], hop_length, frame_rate)
+                    end_ms = _frame_times_ms(ends, hop_length, frame_rate)
+                    long_enough = np.flatnonzero(end_ms - start_ms >= min_speech_duration)
+                    if len(long_enough) > 0:
+                        first = long_enough[0]
+                        return (float(start_ms[first]),
+                                _qualified_ms(starts[first], ends[first], hop_length, frame_rate,
+                                              min_speech_duration))
+                
+                if in_speech:
+                    speech_start = starts[-1]
             
-            if is_speech and not in_speech:
-                # Start of speech
-                speech_start = time_ms
-                in_speech = True
-            elif not is_speech and in_speech:
-                # End of speech
-                speech_duration = time_ms - speech_start
-                if speech_duration >= min_speech_duration:
-                    speech_segments.append((speech_start, time_ms))
-                in_speech = False
+            start = block_end
+            block_frames = min(block_frames * 2, FEATURE_BLOCK_FRAMES)
         
         # Handle case where speech continues to end of audio
         if in_speech:
-            final_time = len(audio_array) / audio_segment.frame_rate * 1000
-            speech_duration = final_time - speech_start
-            if speech_duration >= min_speech_duration:
-                speech_segments.append((speech_start, final_time))
+            speech_start_ms = float(_frame_times_ms(speech_start, hop_length, frame_rate))
+            final_time = len(audio_array) / frame_rate * 1000
+            if final_time - speech_start_ms >= min_speech_duration:
+                return (speech_start_ms, min(final_time, speech_start_ms + min_speech_duration))
         
-        return speech_segments
+        return None
         
     except Exception as e:
         # Fallback to simple energy-based detection
-        return simple_energy_vad(audio_segment, energy_threshold)
+        speech_segments = simple_energy_vad(audio_segment, energy_threshold)
+        return speech_segments[0] if speech_segments else None
 
 def simple_energy_vad(audio_segment, energy_threshold=1000):
     """
@@ -210,6 +566,10 @@ def simple_energy_vad(audio_segment, energy_threshold=1000):
         # Use pydub's detect_nonsilent as fallback
         from pydub.silence import detect_nonsilent
         
+        # detect_nonsilent needs a real AudioSegment (not decoder PCM)
+        if hasattr(audio_segment, 'to_audio_segment'):
+            audio_segment = audio_segment.to_audio_segment()
+        
         # Convert energy threshold to dBFS approximation
         dbfs_threshold = -40  # Conservative threshold
         
@@ -230,8 +590,144 @@ def simple_energy_vad(audio_segment, energy_threshold=1000):
     except:
         return []
 
+class SpeechTimeline:
+    """
+    Per-call speech analysis shared by all detectors.
+    
+    Runs channel extraction and Voice Activity Detection exactly once, so
+    releasing, late hello and the debug report all derive from the same
+    speech segments instead of re-running VAD on the same audio.
+    
+    An onset-only timeline holds just the first speech segment (see
+    first_speech_segment()); it is enough for both verdicts but not for
+    speech statistics such as total speech duration.
+    
+    A timeline built with_features also keeps the whole-call frame feature
+    matrix the VAD ran on (features), the per-frame speech mask before the
+    minimum-duration filter (speech_mask) and the channel's peak sample
+    value (peak), so call metrics (see analyzer.call_metrics) reuse the
+    VAD's single feature pass.
+    """
+    
+    def __init__(self, agent_channel, speech_segments, energy_threshold, min_speech_duration,
+                 onset_only=False, features=None, speech_mask=None, peak=0.0):
+        self.agent_channel = agent_channel
+        self.speech_segments = speech_segments
+        self.energy_threshold = energy_threshold
+        self.min_speech_duration = min_speech_duration
+        self.onset_only = onset_only
+        self.duration_ms = len(agent_channel)
+        self.features = features
+        self.speech_mask = speech_mask
+        self.peak = peak
+    
+    @classmethod
+    def from_audio(cls, agent_segment, energy_threshold=None, min_speech_duration=None,
+                   onset_only=False, with_features=False):
+        """
+        Build the timeline from a full (stereo or mono) audio segment.
+        
+        Args:
+            agent_segment: Full audio segment (stereo or mono)
+            energy_threshold: VAD energy threshold (None = use config)
+            min_speech_duration: VAD minimum speech duration in ms (None = use config)
+            onset_only: Stop at the first qualifying speech segment instead
+                of running VAD over the whole call
+            with_features: Compute the whole call's frame features once and
+                keep them for call metrics; VAD then runs on them in full
+                (onset_only is ignored, the segment list is complete)
+        
+        Returns:
+            SpeechTimeline
+        """
+        if energy_threshold is None:
+            energy_threshold = app_settings.vad_energy_threshold
+        if min_speech_duration is None:
+            min_speech_duration = app_settings.vad_min_speech_duration
+        
+        # Extract left channel (agent audio only)
+        agent_channel = extract_left_channel(agent_segment)
+        
+        if with_features:
+            try:
+                audio_array, peak = _normalized_samples(agent_channel, return_peak=True)
+                features = compute_frame_features(audio_array, agent_channel.frame_rate)
+                return cls.from_features(agent_channel, features, peak, len(audio_array),
+                                         energy_threshold, min_speech_duration)
+            except Exception:
+                pass  # Fall back to the plain VAD below
+        
+        if onset_only:
+            # Early-exit scan: only the first speech segment is needed for the verdicts
+            first_segment = first_speech_segment(
+                agent_channel,
+                energy_threshold=energy_threshold,
+                min_speech_duration=min_speech_duration,
+                use_adaptive=True  # Use adaptive noise floor
+            )
+            speech_segments = [first_segment] if first_segment else []
+        else:
+            # Apply Voice Activity Detection once for the whole call
+            speech_segments = voice_activity_detection(
+                agent_channel,
+                energy_threshold=energy_threshold,
+                min_speech_duration=min_speech_duration,
+                use_adaptive=True  # Use adaptive noise floor
+            )
+        
+        return cls(agent_channel, speech_segments, energy_threshold, min_speech_duration,
+                   onset_only=onset_only)
+    
+    @classmethod
+    def from_features(cls, agent_channel, features, peak, n_samples,
+                      energy_threshold=None, min_speech_duration=None):
+        """
+        Run full VAD on an already computed whole-call feature matrix and keep it.
+        
+        Args:
+            agent_channel: Mono agent channel
+            features: compute_frame_features() of the peak-normalized channel
+                (gains 'zcr_scale' and 'frame_rate' entries)
+            peak: Peak sample value the channel was normalized by
+            n_samples: Samples in the channel
+            energy_threshold: VAD energy threshold (None = use config)
+            min_speech_duration: VAD minimum speech duration in ms (None = use config)
+        
+        Returns:
+            SpeechTimeline with features, speech_mask and peak set
+        """
+        if energy_threshold is None:
+            energy_threshold = app_settings.vad_energy_threshold
+        if min_speech_duration is None:
+            min_speech_duration = app_settings.vad_min_speech_duration
+        frame_rate = agent_channel.frame_rate
+        
+        effective_threshold = vad_frame_threshold(features['rms'], frame_rate, energy_threshold)
+        speech_mask = _speech_frame_mask(features, effective_threshold, _zcr_scale(agent_channel))
+        features['zcr_scale'] = _zcr_scale(agent_channel)
+        features['frame_rate'] = frame_rate
+        speech_segments = _speech_segments(speech_mask, features['hop_length'], frame_rate,
+                                           n_samples, min_speech_duration)
+        return cls(agent_channel, speech_segments, energy_threshold, min_speech_duration,
+                   features=features, speech_mask=speech_mask, peak=peak)
+    
+    @property
+    def has_speech(self):
+        return len(self.speech_segments) > 0
+    
+    @property
+    def first_speech_onset_ms(self):
+        """Start time (ms) of the first speech segment, or None if no speech."""
+        return self.speech_segments[0][0] if self.speech_segments else None
+    
+    @property
+    def total_speech_ms(self):
+        return sum([end - start for start, end in self.speech_segments])
+
+
+
 # Releasing Detection - Agent never speaks (100% deterministic)
-def releasing_detection(agent_segment, silence_thresh=None):
+def releasing_detection(agent_segment, silence_thresh=None, timeline=None):
     """
     Returns 'Yes' if agent channel contains no speech events for entire call duration.
     
@@ -245,16 +741,18 @@ def releasing_detection(agent_segment, silence_thresh=None):
     Args:
         agent_segment: Full audio segment (stereo or mono)
         silence_thresh: Optional silence threshold (unused, kept for compatibility)
+        timeline: Optional precomputed SpeechTimeline for this call
     
     Returns:
         'Yes' if releasing, 'No' otherwise
     """
     
-    # Extract left channel (agent audio only)
-    agent_channel = extract_left_channel(agent_segment)
+    # Reuse the per-call timeline when provided, otherwise run VAD now
+    if timeline is None:
+        timeline = SpeechTimeline.from_audio(agent_segment)
     
     # Get call duration in seconds
-    call_duration_s = len(agent_channel) / 1000.0
+    call_duration_s = timeline.duration_ms / 1000.0
     
     # Business Rule: Calls shorter than 4 seconds cannot be classified as releasing
     # Minimum duration required for reliable releasing detection
@@ -264,21 +762,13 @@ def releasing_detection(agent_segment, silence_thresh=None):
         # Too short to determine releasing - classify as "No" (not releasing)
         return "No"
     
-    # Apply Voice Activity Detection (uses config settings)
-    speech_segments = voice_activity_detection(
-        agent_channel,
-        energy_threshold=app_settings.vad_energy_threshold,
-        min_speech_duration=app_settings.vad_min_speech_duration,
-        use_adaptive=True  # Use adaptive noise floor
-    )
-    
     # Releasing = NO speech events detected in entire call (and call is long enough)
-    is_releasing = len(speech_segments) == 0
+    is_releasing = not timeline.has_speech
     
     return "Yes" if is_releasing else "No"
 
 # Late Hello Detection - Agent first speaks after 5.0 seconds (100% deterministic)
-def late_hello_detection(agent_segment, customer_segment=None, debug=False):
+def late_hello_detection(agent_segment, customer_segment=None, debug=False, timeline=None):
     """
     Returns 'Yes' if first speech onset in agent channel occurs after 5.0 seconds from call start.
     
@@ -292,23 +782,19 @@ def late_hello_detection(agent_segment, customer_segment=None, debug=False):
     
     Args:
         agent_segment: Audio segment containing agent audio
-        customer_segment: Not used (kept for compatibility)
+        customer_segment: Not used (customer-side metrics come from the dual-channel
+            'conversation' detector)
         debug: If True, print detailed debug information
+        timeline: Optional precomputed SpeechTimeline for this call
     
     Returns:
         "Yes" if late hello detected, "No" otherwise
     """
     
-    # Extract left channel (agent audio only)
-    agent_channel = extract_left_channel(agent_segment)
-    
-    # Apply Voice Activity Detection to find all speech segments (uses config settings)
-    speech_segments = voice_activity_detection(
-        agent_channel,
-        energy_threshold=app_settings.vad_energy_threshold,
-        min_speech_duration=app_settings.vad_min_speech_duration,
-        use_adaptive=True  # Use adaptive noise floor
-    )
+    # Reuse the per-call timeline when provided, otherwise run VAD now
+    if timeline is None:
+        timeline = SpeechTimeline.from_audio(agent_segment)
+    speech_segments = timeline.speech_segments
     
     # Edge case: No speech at all → falls under Releasing, not Late Hello
     if len(speech_segments) == 0:
@@ -339,37 +825,34 @@ def late_hello_detection(agent_segment, customer_segment=None, debug=False):
 
 
 # Debug function to analyze audio characteristics with new VAD logic
-def debug_audio_analysis(agent_segment, file_name="Unknown"):
+def debug_audio_analysis(agent_segment, file_name="Unknown", timeline=None):
     """
     Analyze audio segment and return detailed information for debugging.
-    Uses the same VAD logic as the detection functions.
+    Uses the same VAD logic as the detection functions; pass the call's
+    SpeechTimeline to reuse its speech segments instead of re-running VAD.
     """
     try:
-        # Extract left channel (agent audio)
-        agent_channel = extract_left_channel(agent_segment)
+        # Reuse the per-call timeline when provided, otherwise run VAD now
+        # (an onset-only timeline lacks the full segment list needed here)
+        if timeline is None or timeline.onset_only:
+            timeline = SpeechTimeline.from_audio(agent_segment)
+        agent_channel = timeline.agent_channel
+        speech_segments = timeline.speech_segments
         
         # Basic info
-        duration_ms = len(agent_channel)
+        duration_ms = timeline.duration_ms
         duration_s = duration_ms / 1000.0
         channels = agent_segment.channels
         
         # dBFS analysis
         dbfs = agent_channel.dBFS
         
-        # Apply VAD to find speech segments (uses config settings)
-        speech_segments = voice_activity_detection(
-            agent_channel,
-            energy_threshold=app_settings.vad_energy_threshold,
-            min_speech_duration=app_settings.vad_min_speech_duration,
-            use_adaptive=True  # Use adaptive noise floor
-        )
-        
         # Calculate speech statistics
-        total_speech_duration = sum([end - start for start, end in speech_segments])
+        total_speech_duration = timeline.total_speech_ms
         speech_percentage = (total_speech_duration / duration_ms) if duration_ms > 0 else 0
         
         # First speech onset time
-        first_speech_onset = speech_segments[0][0] if speech_segments else None
+        first_speech_onset = timeline.first_speech_onset_ms
         first_speech_onset_s = first_speech_onset / 1000.0 if first_speech_onset is not None else None
         
         # Energy analysis
@@ -381,8 +864,8 @@ def debug_audio_analysis(agent_segment, file_name="Unknown"):
             rms_energy = peak_energy = 0
         
         # Detection results
-        releasing_result = releasing_detection(agent_segment)
-        late_hello_result = late_hello_detection(agent_segment)
+        releasing_result = releasing_detection(agent_segment, timeline=timeline)
+        late_hello_result = late_hello_detection(agent_segment, timeline=timeline)
         
         return {
             "file_name": file_name,
@@ -5,50 +5,308 @@ Provides clean interface for batch processing with proper channel separation.
 
 import pandas as pd
 from pathlib import Path
-from typing import Optional, Callable, List
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from typing import Optional, Callable, Iterator, List, Tuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
 import os
+import queue
+import threading
 
-from core.audio_processor import AudioProcessor, convert_to_dataframe_format
+from config import app_settings
+from core.audio_processor import AudioProcessor, convert_to_dataframe_format, is_flagged, ERROR_PROCESSING
+from core.result_cache import ResultCache
+from core.file_scanner import ScannedFile, scan_audio_files
+
+# Supported executor backends for batch processing
+EXECUTOR_BACKENDS = ('thread', 'process', 'serial')
+
+# Files kept in flight per worker; bounds queued work while keeping every worker busy
+IN_FLIGHT_PER_WORKER = 2
+
+# Downloaded files waiting for analysis before the downloader blocks (pipelined audits)
+PIPELINE_QUEUE_SIZE = 64
+
+# Seconds between checks for newly arrived files while analyses are running
+PIPELINE_POLL_SECONDS = 0.1
+
+# Scanned files checked against the result cache per incremental lookup while a folder streams in
+SCAN_BATCH_SIZE = 256
+
+# Per-process state for the 'process' backend
+_worker_processor = None
+
+
+def _create_audio_processor() -> AudioProcessor:
+    """Create an AudioProcessor using the result cache if enabled in settings."""
+    result_cache = ResultCache() if app_settings.result_cache_enabled else None
+    return AudioProcessor(result_cache=result_cache)
+
+
+def _init_worker(settings_snapshot: dict, ffmpeg_converter: str):
+    """
+    Warm up a worker process: import the numeric stack once, apply the
+    parent's settings and create the process-local AudioProcessor.
+    """
+    global _worker_processor
+    import numpy as np
+    from scipy.fft import rfft
+    from pydub import AudioSegment
+    
+    # Plan a small FFT so the first real file does not pay for it
+    rfft(np.zeros(400, dtype=np.float32))
+    
+    AudioSegment.converter = ffmpeg_converter
+    app_settings.apply_snapshot(settings_snapshot)
+    _worker_processor = _create_audio_processor()
+
+
+def _process_file_task(file_path: str, settings_snapshot: dict, file_stat=None) -> dict:
+    """
+    Pickle-safe task for the 'process' backend: a path plus the settings
+    snapshot taken when the batch started (and the scanned stat data, if any).
+    """
+    global _worker_processor
+    if app_settings.snapshot() != settings_snapshot:
+        app_settings.apply_snapshot(settings_snapshot)
+        _worker_processor = None
+    if _worker_processor is None:
+        _worker_processor = _create_audio_processor()
+    return _worker_processor.process_single_file(Path(file_path), file_stat=file_stat)
+
+
+def _unpack_work_item(item) -> Tuple[Path, Optional[ScannedFile]]:
+    """Split a queued file (a path or a ScannedFile) into its path and stat data."""
+    if isinstance(item, ScannedFile):
+        return item.path, item
+    return Path(item), None
 
 
 class BatchProcessor:
     """
     Optimized batch processor using unified audio processing logic.
+    
+    Executor backends:
+    - 'thread': ThreadPoolExecutor (default, lowest start-up cost)
+    - 'process': ProcessPoolExecutor, one warm worker per core (CPU-bound VAD scales with cores)
+    - 'serial': Process files one at a time in the calling thread
     """
     
-    def __init__(self, max_workers: Optional[int] = None):
+    def __init__(self, max_workers: Optional[int] = None, executor: Optional[str] = None):
         self.audio_processor = AudioProcessor()
-        self.max_workers = max_workers or min(os.cpu_count() * 2, 16)  # Reasonable limit
+        self.max_workers = max_workers
+        self.executor = executor  # None = use app_settings.batch_executor
+        self._result_cache = None
+        # Result cache counters for the most recent run
+        self.cache_stats = {'hits': 0, 'misses': 0, 'unchanged': 0}
     
-    def find_audio_files(self, folder_path: str) -> List[Path]:
+    def _sync_result_cache(self):
+        """Attach or detach the persistent result cache per app_settings."""
+        if not app_settings.result_cache_enabled:
+            self.audio_processor.result_cache = None
+            return
+        if self._result_cache is None:
+            self._result_cache = ResultCache()
+        self.audio_processor.result_cache = self._result_cache
+    
+    def _resolve_executor(self, executor: Optional[str]) -> str:
+        backend = executor or self.executor or app_settings.batch_executor
+        if backend not in EXECUTOR_BACKENDS:
+            raise ValueError(f"Unknown executor backend '{backend}'. Options: {', '.join(EXECUTOR_BACKENDS)}")
+        return backend
+    
+    def _worker_count(self, backend: str) -> int:
+        if self.max_workers:
+            return self.max_workers
+        if backend == 'process':
+            return os.cpu_count() or 1
+        return min((os.cpu_count() or 1) * 2, 16)  # Reasonable limit
+    
+    def _create_executor(self, backend: str):
+        """Create the pool for a run (None for the serial backend)."""
+        if backend == 'serial':
+            return None
+        if backend == 'process':
+            from pydub import AudioSegment
+            return ProcessPoolExecutor(
+                max_workers=self._worker_count(backend),
+                initializer=_init_worker,
+                initargs=(app_settings.snapshot(), AudioSegment.converter)
+            )
+        return ThreadPoolExecutor(max_workers=self._worker_count(backend))
+    
+    def _submit(self, pool, backend: str, file_path: Path, file_stat, settings_snapshot: dict):
+        if backend == 'process':
+            return pool.submit(_process_file_task, str(file_path), settings_snapshot, file_stat)
+        return pool.submit(self.audio_processor.process_single_file, file_path, file_stat=file_stat)
+    
+    def find_audio_files(self, folder_path: str) -> List[ScannedFile]:
         """
         Find all audio files in folder and subdirectories.
         
+        The tree is walked once (see core.file_scanner); each file's size and
+        mtime are captured during the walk so they are not stat'ed again.
+        
         Args:
             folder_path: Path to search
             
         Returns:
-            List of audio file paths
+            List of ScannedFile (path, st_size, st_mtime_ns); empty if the folder does not exist
         """
-        folder = Path(folder_path)
-        if not folder.exists():
-            return []
+        return list(scan_audio_files(folder_path))
+    
+    def reuse_unchanged(self, audio_files: List) -> Tuple[List[dict], List]:
+        """
+        Split files into stored results for unchanged files and files to analyze.
+        
+        Only applies with incremental_audits and the result cache on;
+        otherwise every file is returned for analysis.
+        
+        Args:
+            audio_files: Audio file paths or ScannedFile entries
+            
+        Returns:
+            (results for unchanged files, files still to analyze)
+        """
+        self._sync_result_cache()
+        if not app_settings.incremental_audits or not audio_files:
+            return [], list(audio_files)
+        items = [_unpack_work_item(item) for item in audio_files]
+        stats = {file_path: file_stat for file_path, file_stat in items if file_stat is not None}
+        unchanged = self.audio_processor.lookup_unchanged([file_path for file_path, _ in items], stats)
+        remaining = [item for item, (file_path, _) in zip(audio_files, items) if file_path not in unchanged]
+        return list(unchanged.values()), remaining
+    
+    def iter_process_files(self, audio_files: List, executor: Optional[str] = None) -> Iterator[dict]:
+        """
+        Process files with a continuous work queue, yielding results as they complete.
+        
+        One pool is created per run. A bounded window of files is kept in
+        flight and refilled as each file finishes, so a long recording only
+        occupies its own worker instead of stalling a whole batch.
+        
+        Incremental audits (incremental_audits setting, with the result cache
+        on): files unchanged since their last analysis (same path, size and
+        mtime) are answered from the cache's file index first, and only new
+        or changed files are sent to the workers.
+        
+        Args:
+            audio_files: Audio file paths (or ScannedFile entries) to process
+            executor: Executor backend ('thread', 'process', 'serial'); None = default
+            
+        Yields:
+            Processing result per file, in completion order
+        """
+        reused, remaining = self.reuse_unchanged(audio_files)
+        
+        file_queue = queue.Queue()
+        for item in reused + remaining:
+            file_queue.put(item)
+        file_queue.put(None)
+        return self.iter_process_queue(file_queue, executor=executor)
+    
+    def iter_process_queue(self, file_queue: queue.Queue, executor: Optional[str] = None) -> Iterator[dict]:
+        """
+        Process files as they arrive on a queue, yielding results as they complete.
+        
+        Files are submitted as soon as they are queued (e.g. by a downloader
+        or a folder scan) until a None sentinel is received.
+        
+        Args:
+            file_queue: Queue of audio file paths or ScannedFile entries,
+                terminated by None. Result dicts already known (e.g. for
+                unchanged files) may be queued too and are yielded as-is.
+            executor: Executor backend ('thread', 'process', 'serial'); None = default
+            
+        Yields:
+            Processing result per file, in completion order
+        """
+        self._sync_result_cache()
+        self.cache_stats = {'hits': 0, 'misses': 0, 'unchanged': 0}
+        for result in self._iter_results(file_queue, executor):
+            if result.get('unchanged'):
+                self.cache_stats['unchanged'] += 1
+            if 'cache_hit' in result:
+                self.cache_stats['hits' if result['cache_hit'] else 'misses'] += 1
+            yield result
+    
+    def _iter_results(self, file_queue: queue.Queue, executor: Optional[str]) -> Iterator[dict]:
+        backend = self._resolve_executor(executor)
+        settings_snapshot = app_settings.snapshot()
+        
+        if backend == 'serial':
+            # Serial backend: process in the calling thread
+            for item in iter(file_queue.get, None):
+                if isinstance(item, dict):
+                    yield item
+                    continue
+                file_path, file_stat = _unpack_work_item(item)
+                try:
+                    yield self.audio_processor.process_single_file(file_path, file_stat=file_stat)
+                except Exception as e:
+                    yield self._error_result(file_path, e)
+            return
+        
+        pool = self._create_executor(backend)
+        window = self._worker_count(backend) * IN_FLIGHT_PER_WORKER
+        in_flight = {}
+        ready = []  # Queued results that need no processing
+        finished = False
         
-        # Search for supported audio formats
-        audio_files = []
-        for pattern in ['*.mp3', '*.wav', '*.m4a', '*.mp4']:
-            audio_files.extend(folder.rglob(pattern))
+        def refill(block_when_idle):
+            nonlocal finished
+            while not finished and len(in_flight) < window:
+                try:
+                    # Only wait for new files when nothing is being processed or ready
+                    item = file_queue.get(block=block_when_idle and not in_flight and not ready)
+                except queue.Empty:
+                    return
+                if item is None:
+                    finished = True
+                    return
+                if isinstance(item, dict):
+                    ready.append(item)
+                    continue
+                file_path, file_stat = _unpack_work_item(item)
+                in_flight[self._submit(pool, backend, file_path, file_stat, settings_snapshot)] = file_path
         
-        return audio_files
+        try:
+            while True:
+                refill(block_when_idle=True)
+                while ready:
+                    yield ready.pop(0)
+                if not in_flight:
+                    if finished:
+                        break
+                    continue
+                done, _ = wait(
+                    in_flight,
+                    timeout=None if finished else PIPELINE_POLL_SECONDS,
+                    return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    file_path = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # Handle individual file processing errors
+                        result = self._error_result(file_path, e)
+                    refill(block_when_idle=False)
+                    yield result
+        finally:
+            # Drop queued work if the consumer stops early
+            for future in in_flight:
+                future.cancel()
+            pool.shutdown(wait=True)
     
-    def process_folder_parallel(self, folder_path: str, progress_callback: Optional[Callable] = None) -> List[dict]:
+    def process_folder_parallel(self, folder_path: str, progress_callback: Optional[Callable] = None,
+                                executor: Optional[str] = None) -> List[dict]:
         """
         Process all audio files in folder using parallel processing.
         
         Args:
             folder_path: Path to folder containing audio files
-            progress_callback: Optional progress callback (done, total)
+            progress_callback: Optional progress callback (done, total), called per file
+            executor: Executor backend ('thread', 'process', 'serial'); None = default
             
         Returns:
             List of processing results
@@ -61,46 +319,42 @@ class BatchProcessor:
         results = []
         total_files = len(audio_files)
         
-        # Process files in parallel batches
-        batch_size = 20  # Process 20 files at a time
-        
-        for i in range(0, total_files, batch_size):
-            batch_files = audio_files[i:i + batch_size]
-            
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Submit batch for processing
-                futures = [
-                    executor.submit(self.audio_processor.process_single_file, file_path)
-                    for file_path in batch_files
-                ]
-                
-                # Collect results as they complete
-                for future in as_completed(futures):
-                    try:
-                        result = future.result()
-                        results.append(result)
-                    except Exception as e:
-                        # Handle individual file processing errors
-                        results.append({
-                            'agent_name': 'Unknown',
-                            'phone_number': '',
-                            'file_path': 'Unknown',
-                            'error': f"Processing error: {str(e)}",
-                            'classification_success': False
-                        })
+        for result in self.iter_process_files(audio_files, executor=executor):
+            results.append(result)
             
             # Update progress
             if progress_callback:
-                done = min(i + batch_size, total_files)
-                progress_callback(done, total_files)
+                progress_callback(len(results), total_files)
         
         return results
+    
+    @staticmethod
+    def _error_result(file_path: Path, error: Exception) -> dict:
+        return {
+            'agent_name': 'Unknown',
+            'phone_number': '',
+            'file_path': str(file_path),
+            'error': f"Processing error: {str(error)}",
+            'error_code': ERROR_PROCESSING,
+            'classification_success': False
+        }
 
 
 # Global batch processor instance
 _batch_processor = BatchProcessor()
 
 
+def get_cache_stats() -> dict:
+    """
+    Get result cache counters for the most recent batch run.
+    
+    Returns:
+        Dict with 'hits' (results reused), 'misses' (files analyzed and cached)
+        and 'unchanged' (hits found by path/size/mtime without reading the file)
+    """
+    return dict(_batch_processor.cache_stats)
+
+
 def batch_analyze_folder(folder_path: str) -> pd.DataFrame:
     """
     Analyze all audio files in a folder and return results as pandas DataFrame.
@@ -117,17 +371,162 @@ def batch_analyze_folder(folder_path: str) -> pd.DataFrame:
     return pd.DataFrame(flagged_calls)
 
 
-def batch_analyze_folder_fast(folder_path: str, progress_callback: Optional[Callable] = None) -> pd.DataFrame:
+def batch_analyze_folder_fast(folder_path: str, progress_callback: Optional[Callable] = None,
+                              executor: Optional[str] = None) -> pd.DataFrame:
     """
     Fast batch analysis with progress tracking and proper channel separation.
     
     Args:
         folder_path: Path to folder containing audio files
         progress_callback: Optional callback function for progress updates (done, total)
+        executor: Executor backend ('thread', 'process', 'serial'); None = app_settings.batch_executor
         
     Returns:
         pandas DataFrame with analysis results for flagged calls only
     """
-    results = _batch_processor.process_folder_parallel(folder_path, progress_callback)
+    results = _batch_processor.process_folder_parallel(folder_path, progress_callback, executor=executor)
     flagged_calls = convert_to_dataframe_format(results)
     return pd.DataFrame(flagged_calls)
+
+
+def _iter_pipeline(produce: Callable, state: dict, executor: Optional[str], name: str) -> Iterator[dict]:
+    """
+    Run `produce(enqueue)` in a background thread and analyze what it queues.
+    
+    enqueue(item, count=True) puts a file (or a known result dict) on a
+    bounded queue, blocking while it is full (backpressure) unless the
+    consumer has stopped.
+    
+    Args:
+        produce: Callable taking enqueue
+        state: Dict updated in place with 'queued' (items counted so far),
+            'running' (producer still active) and 'error' (its exception, if any)
+        executor: Executor backend; None = app_settings.batch_executor
+        name: Producer thread name
+        
+    Yields:
+        Processing result per file, in completion order
+    """
+    file_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    state.update(queued=0, running=True, error=None)
+    stop = threading.Event()
+    
+    def enqueue(item, count=True):
+        if count:
+            state['queued'] += 1
+        while not stop.is_set():
+            try:
+                file_queue.put(item, timeout=PIPELINE_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+    
+    def run():
+        try:
+            produce(enqueue)
+        except Exception as e:
+            state['error'] = e
+        finally:
+            state['running'] = False
+            enqueue(None, count=False)
+    
+    producer = threading.Thread(target=run, name=name, daemon=True)
+    producer.start()
+    
+    try:
+        yield from _batch_processor.iter_process_queue(file_queue, executor=executor)
+    finally:
+        stop.set()
+
+
+def iter_analyze_folder(folder_path: str, executor: Optional[str] = None) -> Iterator[dict]:
+    """
+    Stream per-file analysis records as each file completes.
+    
+    Unlike batch_analyze_folder, every call is yielded (not only flagged ones),
+    so callers can render, export or aggregate incrementally without waiting
+    for the whole folder. Use to_dataframe_row() to build display rows.
+    
+    The folder is scanned in a background thread and files go to the
+    workers as they are found, so analysis starts before a large archive
+    has been fully listed. With incremental audits, unchanged files are
+    looked up in batches of SCAN_BATCH_SIZE as the scan proceeds.
+    
+    Args:
+        folder_path: Path to folder containing audio files
+        executor: Executor backend ('thread', 'process', 'serial'); None = app_settings.batch_executor
+        
+    Yields:
+        Processing result dict with additional keys:
+        - 'flagged': True if Releasing or Late Hello was detected
+        - 'done' / 'total': Files completed so far / files found so far
+        - 'scanning': True while the folder is still being scanned
+        - 'elapsed': Seconds since the run started
+    """
+    start_time = time.time()
+    
+    def scan(enqueue):
+        batch = []
+        
+        def flush():
+            reused, remaining = _batch_processor.reuse_unchanged(batch)
+            for item in reused + remaining:
+                enqueue(item)
+            batch.clear()
+        
+        for scanned in scan_audio_files(folder_path):
+            batch.append(scanned)
+            if len(batch) >= SCAN_BATCH_SIZE:
+                flush()
+        flush()
+    
+    state = {}
+    for done, result in enumerate(_iter_pipeline(scan, state, executor, "folder-scanner"), 1):
+        record = dict(result)
+        record['flagged'] = is_flagged(result)
+        record['done'] = done
+        record['total'] = state['queued']
+        record['scanning'] = state['running']
+        record['elapsed'] = time.time() - start_time
+        yield record
+
+
+def iter_analyze_downloads(download: Callable, executor: Optional[str] = None) -> Iterator[dict]:
+    """
+    Analyze recordings while they are still downloading (producer/consumer pipeline).
+    
+    `download` runs in a background thread and is called with an
+    on_file_saved(file_path) callback; every saved file is pushed through a
+    bounded queue straight into the analysis workers, so total time is
+    roughly max(download, analysis) instead of their sum.
+    
+    Args:
+        download: Callable taking on_file_saved, e.g.
+            lambda on_file_saved: download_all_call_recordings(..., on_file_saved=on_file_saved)
+        executor: Executor backend ('thread', 'process', 'serial'); None = app_settings.batch_executor
+        
+    Yields:
+        Processing record as in iter_analyze_folder, except:
+        - 'total': Files downloaded so far
+        - 'downloading': True while the download is still running
+        
+    Raises:
+        The download's exception (after analyzing every file it saved)
+    """
+    start_time = time.time()
+    state = {}
+    
+    def produce(enqueue):
+        download(lambda file_path: enqueue(Path(file_path)))
+    
+    for done, result in enumerate(_iter_pipeline(produce, state, executor, "download-producer"), 1):
+        record = dict(result)
+        record['flagged'] = is_flagged(result)
+        record['done'] = done
+        record['total'] = state['queued']
+        record['downloading'] = state['running']
+        record['elapsed'] = time.time() - start_time
+        yield record
+    
+    if state['error'] is not None:
+        raise state['error']
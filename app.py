@@ -6,8 +6,12 @@ from datetime import date, datetime
 import pandas as pd
 import streamlit as st
 
-from analyzer.simple_main import batch_analyze_folder, batch_analyze_folder_fast
-from config import READYMODE_URL, USER_CREDENTIALS
+from analyzer.simple_main import (
+    batch_analyze_folder_fast, iter_analyze_folder, iter_analyze_downloads, get_cache_stats
+)
+from core.audio_processor import to_dataframe_row
+from core.file_scanner import RecordingsIndex
+from config import READYMODE_URL, USER_CREDENTIALS, app_settings
 import os
 
 # Try to import ReadyMode automation, disable if not available (e.g., on Streamlit Cloud)
@@ -31,7 +35,7 @@ try:
         READYMODE_AVAILABLE = False
         st.info("🌐 **Running on Streamlit Cloud** - For security reasons, automated call downloading is disabled. Please use the **Upload & Analyze** tab to process your MP3 files directly.")
     else:
-        from automation.download_readymode_calls import download_all_call_recordings
+        from automation.download_readymode_calls import download_all_call_recordings, get_session_stats
         READYMODE_AVAILABLE = True
 except (ImportError, Exception) as e:
     READYMODE_AVAILABLE = False
@@ -640,6 +644,74 @@ def main():
                 status_text.text(f"Processing: {int(min(downloaded, total))}/{int(total)}")
         return status_text, progress_bar, update_progress
 
+    def _show_cache_stats():
+        # Result cache counters for the run that just finished
+        stats = get_cache_stats()
+        if stats['unchanged']:
+            st.caption(f"Incremental audit: {stats['hits']} files reused ({stats['unchanged']} unchanged, "
+                       f"not re-read), {stats['misses']} new or changed files analyzed")
+        elif stats['hits'] or stats['misses']:
+            st.caption(f"Result cache: {stats['hits']} reused, {stats['misses']} analyzed")
+
+    def _show_session_stats():
+        # Warm dialer sessions reused across audits in this server process
+        stats = get_session_stats()
+        if stats['reuses']:
+            st.caption(f"Dialer session reused {stats['reuses']} time(s), "
+                       f"~{stats['time_saved_s']:.0f}s of browser start-up and login saved")
+
+    def _run_pipelined_audit(download, max_samples):
+        # Analyze each recording as soon as it lands; verdicts stream into a live table
+        status_text = st.empty()
+        progress_bar = st.progress(0)
+        live_table = st.empty()
+        flagged_rows = []
+        analyzed = 0
+        try:
+            for record in iter_analyze_downloads(download):
+                analyzed = record['done']
+                progress_bar.progress(min(analyzed / max_samples, 1.0) if max_samples else 0)
+                stage = "Downloading and analyzing" if record['downloading'] else "Analyzing"
+                status_text.text(f"{stage}: {analyzed} analyzed, {record['total']}/{max_samples} downloaded")
+                if record['flagged']:
+                    flagged_rows.append(to_dataframe_row(record))
+                    live_table.dataframe(pd.DataFrame(flagged_rows), use_container_width=True)
+        except Exception as e:
+            st.error(f"Error during download: {str(e)}")
+        finally:
+            progress_bar.empty()
+            status_text.empty()
+            live_table.empty()
+
+        if not analyzed:
+            st.error("No recordings were downloaded for this audit.")
+            st.info("Please check the filters and that the recordings exist in ReadyMode.")
+            return None
+        _show_cache_stats()
+        return pd.DataFrame(flagged_rows)
+
+    def _show_audit_results(df, file_stem):
+        if not df.empty:
+            st.success(f"Found {len(df)} flagged calls!")
+            st.dataframe(df, use_container_width=True)
+            col1, col2 = st.columns(2)
+            with col1:
+                st.download_button(
+                    label="Download CSV",
+                    data=df.to_csv(index=False).encode("utf-8"),
+                    file_name=f"{file_stem}.csv",
+                    mime="text/csv",
+                )
+            with col2:
+                st.download_button(
+                    label="Download Excel",
+                    data=_to_excel(df),
+                    file_name=f"{file_stem}.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                )
+        else:
+            st.info(" No Releasing or Late Hello detected.")
+
     tab_upload, tab_agent, tab_campaign = st.tabs(["Upload & Analyze", "Agent Audit", "Campaign Audit"])
 
     # --- Upload & Analyze Tab ---
@@ -697,7 +769,21 @@ def main():
                     (temp_path / f.name).write_bytes(f.getbuffer())
 
                 with st.spinner(f"Analyzing {len(uploaded_files)} files..."):
-                    df = batch_analyze_folder(str(temp_path))
+                    # Stream results so flagged calls appear as soon as they are found
+                    status_text, progress_bar, update_progress = _create_progress_tracker()
+                    live_table = st.empty()
+                    flagged_rows = []
+                    for record in iter_analyze_folder(str(temp_path)):
+                        update_progress(record['done'], record['total'])
+                        if record['flagged']:
+                            flagged_rows.append(to_dataframe_row(record))
+                            live_table.dataframe(pd.DataFrame(flagged_rows), use_container_width=True)
+                    progress_bar.empty()
+                    status_text.empty()
+                    live_table.empty()
+                    _show_cache_stats()
+                    
+                    df = pd.DataFrame(flagged_rows)
                     st.session_state["upload_results"] = df
 
         if "upload_results" in st.session_state:
@@ -807,6 +893,27 @@ def main():
                     
                     The core audio analysis functionality is fully available via file upload!
                     """)
+                elif app_settings.pipeline_downloads:
+                    max_samples = int(num_recordings) if num_recordings else 50
+                    with st.spinner("Downloading and analyzing agent recordings..."):
+                        df = _run_pipelined_audit(
+                            lambda on_file_saved: download_all_call_recordings(
+                                ready_url,
+                                agent=agent_name,
+                                start_date=start_date,
+                                end_date=end_date,
+                                max_samples=max_samples,
+                                disposition=selected_dispositions,
+                                min_duration=min_duration,
+                                max_duration=max_duration,
+                                username=st.session_state.get('username', 'Auditor1'),
+                                on_file_saved=on_file_saved,
+                            ),
+                            max_samples
+                        )
+                    if df is not None:
+                        _show_audit_results(df, "agent_audit")
+                        _show_session_stats()
                 else:
                     status_text, progress_bar, update_progress = _create_progress_tracker()
                     with st.spinner("Downloading and analyzing agent recordings..."):
@@ -874,18 +981,16 @@ def main():
                             st.warning(" Searching recursively for any matching files...")
                             recordings_base = Path("Recordings")
                             if recordings_base.exists():
-                                # Look for any MP3 files in any subdirectory
-                                all_mp3s = list(recordings_base.rglob("*.mp3"))
-                                if all_mp3s:
-                                    # Filter by agent name if possible
-                                    agent_files = [f for f in all_mp3s if agent_name.lower() in f.name.lower()]
-                                    if agent_files:
-                                        # Use the parent directory of the first matching file
-                                        target_folder = agent_files[0].parent
-                                        files = list(target_folder.glob("*.mp3"))
+                                # Cached directory index: only folders changed since the last search are listed
+                                matching_folders = RecordingsIndex(recordings_base).refresh().find_folders(agent_name, prefer=today)
+                                for folder in matching_folders:
+                                    files = list(folder.glob("*.mp3"))
+                                    if files:
+                                        target_folder = folder
                                         st.info(f" Found {len(files)} files by recursive search in: {target_folder}")
-                                    else:
-                                        st.warning(f"No files matching agent '{agent_name}' found.")
+                                        break
+                                else:
+                                    st.warning(f"No files matching agent '{agent_name}' found.")
                         
                         if not files:
                             st.error(f"No files found for agent '{agent_name}' on {today}")
@@ -912,27 +1017,10 @@ def main():
                             
                             processing_progress.empty()
                             processing_status.empty()
+                            _show_cache_stats()
                             
-                            if not df.empty:
-                                st.success(f"Found {len(df)} flagged calls!")
-                                st.dataframe(df, use_container_width=True)
-                                col1, col2 = st.columns(2)
-                                with col1:
-                                    st.download_button(
-                                        label="Download CSV",
-                                        data=df.to_csv(index=False).encode("utf-8"),
-                                        file_name="agent_audit.csv",
-                                        mime="text/csv",
-                                    )
-                                with col2:
-                                    st.download_button(
-                                        label="Download Excel",
-                                        data=_to_excel(df),
-                                        file_name="agent_audit.xlsx",
-                                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                                    )
-                            else:
-                                st.info(" No Releasing or Late Hello detected.")
+                            _show_audit_results(df, "agent_audit")
+                            _show_session_stats()
 
     # --- Campaign Audit Tab ---
     with tab_campaign:
@@ -1019,6 +1107,28 @@ def main():
                     
                     The core audio analysis functionality is fully available via file upload!
                     """)
+                elif app_settings.pipeline_downloads:
+                    max_samples = int(num_recordings) if num_recordings else 50
+                    with st.spinner("Downloading and analyzing campaign recordings..."):
+                        df = _run_pipelined_audit(
+                            lambda on_file_saved: download_all_call_recordings(
+                                ready_url,
+                                campaign_name=campaign_name,
+                                agent=agent_name if agent_name else None,
+                                start_date=start_date,
+                                end_date=end_date,
+                                max_samples=max_samples,
+                                disposition=selected_dispositions,
+                                min_duration=min_duration,
+                                max_duration=max_duration,
+                                username=st.session_state.get('username', 'Auditor1'),
+                                on_file_saved=on_file_saved,
+                            ),
+                            max_samples
+                        )
+                    if df is not None:
+                        _show_audit_results(df, "campaign_audit")
+                        _show_session_stats()
                 else:
                     status_text, progress_bar, update_progress = _create_progress_tracker()
                     with st.spinner("Downloading and analyzing campaign recordings..."):
@@ -1087,18 +1197,16 @@ def main():
                             st.warning(" Searching recursively for any matching files...")
                             recordings_base = Path("Recordings")
                             if recordings_base.exists():
-                                # Look for any MP3 files in any subdirectory
-                                all_mp3s = list(recordings_base.rglob("*.mp3"))
-                                if all_mp3s:
-                                    # Filter by campaign name if possible
-                                    campaign_files = [f for f in all_mp3s if campaign_name.lower() in f.parent.name.lower()]
-                                    if campaign_files:
-                                        # Use the parent directory of the first matching file
-                                        target_folder = campaign_files[0].parent
-                                        files = list(target_folder.glob("*.mp3"))
+                                # Cached directory index: only folders changed since the last search are listed
+                                matching_folders = RecordingsIndex(recordings_base).refresh().find_folders(campaign_name, prefer=today)
+                                for folder in matching_folders:
+                                    files = list(folder.glob("*.mp3"))
+                                    if files:
+                                        target_folder = folder
                                         st.info(f" Found {len(files)} files by recursive search in: {target_folder}")
-                                    else:
-                                        st.warning(f"No files matching campaign '{campaign_name}' found.")
+                                        break
+                                else:
+                                    st.warning(f"No files matching campaign '{campaign_name}' found.")
                         
                         if not files:
                             st.error(f"No files found for campaign '{campaign_name}' on {today}")
@@ -1125,27 +1233,10 @@ def main():
                             
                             processing_progress.empty()
                             processing_status.empty()
+                            _show_cache_stats()
                             
-                            if not df.empty:
-                                st.success(f"Found {len(df)} flagged calls!")
-                                st.dataframe(df, use_container_width=True)
-                                col1, col2 = st.columns(2)
-                                with col1:
-                                    st.download_button(
-                                        label="Download CSV",
-                                        data=df.to_csv(index=False).encode("utf-8"),
-                                        file_name="campaign_audit.csv",
-                                        mime="text/csv",
-                                    )
-                                with col2:
-                                    st.download_button(
-                                        label="Download Excel",
-                                        data=_to_excel(df),
-                                        file_name="campaign_audit.xlsx",
-                                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                                    )
-                            else:
-                                st.info(" No Releasing or Late Hello detected.")
+                            _show_audit_results(df, "campaign_audit")
+                            _show_session_stats()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,376 @@
+"""
+Concurrent Call Recording Downloader
+Fetches the recordings scraped from a call-log page through a bounded worker
+pool that shares one connection-pooled requests session (carrying the
+Selenium login cookies), limited per dialer across all running audits.
+"""
+
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import DOWNLOAD_CONCURRENCY
+from core.audio_probe import probe_bytes, probe_file
+from core.result_cache import new_content_hash, remember_content_hash
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# Seconds to wait for the dialer to respond to a recording request
+DOWNLOAD_TIMEOUT = 60
+
+# Bytes per streamed write; recordings never sit fully in memory
+DOWNLOAD_CHUNK_BYTES = 1 << 16
+
+PHONE_PATTERN = re.compile(r"\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4}")
+
+# One semaphore per dialer so concurrent audits share its download limit
+_dialer_semaphores = {}
+_dialer_semaphores_lock = threading.Lock()
+
+
+def _dialer_key(dialer_url):
+    return dialer_url.rstrip("/") + "/"
+
+
+def get_dialer_concurrency(dialer_url):
+    """Get the max simultaneous downloads allowed for a dialer."""
+    return DOWNLOAD_CONCURRENCY.get(_dialer_key(dialer_url), DOWNLOAD_CONCURRENCY["default"])
+
+
+def _dialer_semaphore(dialer_url):
+    key = _dialer_key(dialer_url)
+    with _dialer_semaphores_lock:
+        if key not in _dialer_semaphores:
+            _dialer_semaphores[key] = threading.BoundedSemaphore(get_dialer_concurrency(dialer_url))
+        return _dialer_semaphores[key]
+
+
+def format_agent_name_for_filename(agent_name):
+    """
+    Format agent name for use in filenames (remove spaces for filesystem compatibility)
+    but keep the original format for display purposes.
+    """
+    # Remove spaces for filename to avoid filesystem issues
+    return agent_name.strip().replace(" ", "")
+
+
+def parse_duration_seconds(text):
+    """
+    Parse a listed call duration ('83', '83s', '1:23', '0:01:23') into seconds.
+
+    Returns:
+        Duration in seconds, or None if the text is not a duration
+    """
+    text = (text or "").strip().lower().rstrip("s").strip()
+    if not text:
+        return None
+    try:
+        seconds = 0.0
+        for part in text.split(":"):
+            seconds = seconds * 60 + float(part)
+        return seconds
+    except ValueError:
+        return None
+
+
+def duration_filter_value(min_duration, max_duration):
+    """
+    Map a duration range to a ReadyMode duration_filter dropdown value.
+
+    Returns:
+        Dropdown value, or None if the range has no dropdown equivalent
+        (the listed call durations are used to filter instead)
+    """
+    if min_duration is not None and max_duration is not None:
+        return {(30, 60): "30-60", (60, 600): "60-600", (0, 30): "0-30"}.get((min_duration, max_duration))
+    if max_duration is not None:
+        return "0-30" if max_duration == 30 else "less"
+    if min_duration is not None:
+        return "greater"
+    return None
+
+
+def call_row_from_fields(fields, href):
+    """
+    Build a call row from a call-log block's repvar columns.
+
+    Args:
+        fields: Dict of repvar name -> cell text (e.g. 'File', 'User', 'Duration')
+        href: Absolute recording URL
+
+    Returns:
+        Dict with 'agent', 'file_text', 'href', 'duration' (seconds or None)
+        and 'disposition' (text or None)
+    """
+    duration = disposition = None
+    for name, value in fields.items():
+        key = name.lower()
+        if duration is None and ("duration" in key or "length" in key):
+            duration = parse_duration_seconds(value)
+        elif disposition is None and "dispo" in key:
+            disposition = value or None
+    return {
+        'agent': fields.get("User", "").strip(),  # Keep original agent name with spaces
+        'file_text': fields.get("File", ""),
+        'href': href,
+        'duration': duration,
+        'disposition': disposition,
+    }
+
+
+def build_call_filename(agent_name, file_text, index):
+    """Build '<Agent>_(<phone>).mp3' from a call-log row (index numbers unknown phones)."""
+    phone_match = PHONE_PATTERN.search(file_text)
+    phone_number = phone_match.group(0) if phone_match else f"unknown_{index}"
+    # Use formatted name (no spaces) for filename only
+    return f"{format_agent_name_for_filename(agent_name)}_({phone_number}).mp3"
+
+
+def get_download_dir(agent, campaign_name, start_date, end_date, username):
+    """
+    Create and return the folder for an audit's recordings:
+    Recordings/{Agent|Campaign}/{username}/{agent|campaign}-{today}
+    """
+    subfolder = "Campaign" if campaign_name and start_date and end_date else "Agent"
+    # Determine save path for Campaign or Agent
+    today = datetime.now().strftime('%Y-%m-%d')
+
+    if subfolder == "Campaign" and campaign_name:
+        folder = f"{campaign_name}-{today}"
+    elif subfolder == "Agent" and agent:
+        folder = f"{agent}-{today}"
+    else:
+        folder = today
+    download_dir = os.path.join(os.getcwd(), "Recordings", subfolder, username, folder)
+    os.makedirs(download_dir, exist_ok=True)
+    return download_dir
+
+
+def create_download_session(cookies, pool_size, headers=None):
+    """
+    Create one requests session with a connection pool sized for the workers.
+
+    Args:
+        cookies: Dict of cookie name -> value (e.g. from driver.get_cookies())
+        pool_size: Max pooled connections (match the download concurrency)
+        headers: Default request headers
+
+    Returns:
+        requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(headers or DEFAULT_HEADERS)
+    for name, value in cookies.items():
+        session.cookies.set(name, value)
+    return session
+
+
+class CallDownloader:
+    """
+    Downloads scraped calls concurrently with exact sample accounting.
+
+    No more than (max_samples - downloaded) downloads are ever in flight and
+    each submitted link counts as one attempt, so the run stops at exactly
+    max_samples saved files or max_attempts tries, as the serial loop did.
+    """
+
+    def __init__(self, dialer_url, download_dir, cookies, max_samples, max_attempts,
+                 min_duration=None, max_duration=None, update_callback=None, dedupe=False,
+                 on_file_saved=None, session=None):
+        self.download_dir = download_dir
+        self.max_samples = max_samples
+        self.max_attempts = max_attempts
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        self.update_callback = update_callback
+        self.dedupe = dedupe  # Skip links already attempted on earlier pages
+        self.on_file_saved = on_file_saved  # Called with each kept file's path (e.g. to start its analysis)
+
+        self.concurrency = get_dialer_concurrency(dialer_url)
+        # Pooled session carrying the login cookies (or an already logged-in session)
+        self.session = session or create_download_session(cookies, self.concurrency)
+        self._dialer_limit = _dialer_semaphore(dialer_url)
+
+        self.downloaded = 0
+        self.attempted = 0
+        self.skipped_by_listing = 0  # Rows rejected on their listed duration (never fetched)
+        self.seen_links = set()
+        self.claimed_filenames = set()  # Target names saved or in flight (repeat calls to one number)
+        # Saved file path -> content hash computed while streaming
+        self.content_hashes = {}
+
+    @property
+    def filters_duration(self):
+        return self.min_duration is not None or self.max_duration is not None
+
+    def duration_in_range(self, duration):
+        """True if a duration (seconds) passes the min/max duration filter."""
+        return ((self.min_duration is None or duration >= self.min_duration) and
+                (self.max_duration is None or duration <= self.max_duration))
+
+    @property
+    def done(self):
+        """True once the sample target or the attempt budget is reached."""
+        return self.downloaded >= self.max_samples or self.attempted >= self.max_attempts
+
+    def download_calls(self, calls):
+        """
+        Download one page of scraped calls through the worker pool.
+
+        Args:
+            calls: List of call row dicts (see call_row_from_fields)
+
+        Returns:
+            Number of files saved from this page
+        """
+        saved_before = self.downloaded
+        pending = iter(calls)
+        in_flight = {}
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            def refill():
+                while (len(in_flight) < self.concurrency and
+                       self.downloaded + len(in_flight) < self.max_samples and
+                       self.attempted < self.max_attempts):
+                    call = next(pending, None)
+                    if call is None:
+                        return
+                    href = call['href']
+                    if self.dedupe:
+                        if href in self.seen_links:
+                            continue
+                        self.seen_links.add(href)
+
+                    # Listed duration out of range: skip without fetching (no attempt used)
+                    listed = call.get('duration')
+                    if self.filters_duration and listed is not None and not self.duration_in_range(listed):
+                        self.skipped_by_listing += 1
+                        continue
+
+                    self.attempted += 1
+                    filename = self._claim_filename(
+                        build_call_filename(call['agent'], call['file_text'], self.attempted))
+                    print(f"⬇️ Attempting download {self.attempted}: {filename}")
+                    in_flight[pool.submit(self._fetch, href, filename, listed)] = filename
+
+            refill()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    filename = in_flight.pop(future)
+                    if not future.result():
+                        self.claimed_filenames.discard(filename)
+                    else:
+                        self.downloaded += 1
+                        print(f"✅ Saved ({self.downloaded}/{self.max_samples})")
+                        if self.update_callback:
+                            self.update_callback(self.downloaded, self.max_samples)
+                        if self.on_file_saved:
+                            self.on_file_saved(os.path.join(self.download_dir, filename))
+                refill()
+
+        return self.downloaded - saved_before
+
+    def _claim_filename(self, filename):
+        """
+        Reserve a target name for one download. A number called more than once
+        gets ' (2)', ' (3)', ... so concurrent fetches never replace each other's
+        file (AudioProcessor.names_from_path drops the suffix from the phone).
+        """
+        stem, ext = os.path.splitext(filename)
+        candidate, n = filename, 1
+        while candidate in self.claimed_filenames:
+            n += 1
+            candidate = f"{stem} ({n}){ext}"
+        self.claimed_filenames.add(candidate)
+        return candidate
+
+    def _fetch(self, href, filename, listed_duration=None):
+        """
+        Stream one recording to a temp file, apply the duration filter and
+        atomically rename it into the download folder. Returns True if kept.
+
+        Calls with a listed duration were already filtered before fetching.
+        Otherwise the duration is probed from the MP3/WAV headers in the first
+        chunk, so out-of-range recordings are dropped after one chunk. If the
+        first chunk is not enough (e.g. a large ID3 tag) the saved file's
+        headers are probed; only files no probe understands are decoded.
+        """
+        check_duration = self.filters_duration and listed_duration is None
+        check_saved_file = False
+        file_path = os.path.join(self.download_dir, filename)
+        temp_path = None
+        try:
+            with self._dialer_limit:
+                with self.session.get(href, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+                    print(f"📥 Status: {response.status_code} ({filename})")
+                    if response.status_code != 200:
+                        print(f"❌ Failed to download {filename}: HTTP {response.status_code}")
+                        return False
+
+                    # Chunked write to a hidden temp file, hashing as we go
+                    digest = new_content_hash()
+                    fd, temp_path = tempfile.mkstemp(dir=self.download_dir, prefix=".", suffix=".part")
+                    with os.fdopen(fd, "wb") as f:
+                        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES):
+                            if check_duration:
+                                # Header-only probe on the first chunk
+                                check_duration = False
+                                content_length = response.headers.get("Content-Length")
+                                if response.headers.get("Content-Encoding"):
+                                    content_length = None  # Compressed size, not the file size
+                                info = probe_bytes(chunk, int(content_length) if content_length else None)
+                                if info is None:
+                                    check_saved_file = True
+                                elif not self.duration_in_range(info.duration):
+                                    print(f"⏩ Skipped {filename} (duration {info.duration:.1f}s not in range {self.min_duration}-{self.max_duration})")
+                                    return False
+                            f.write(chunk)
+                            digest.update(chunk)
+                    check_saved_file = check_saved_file or check_duration  # Empty body: let the file check reject it
+
+            # No duration in the first chunk: probe the whole file, decoding only as a last resort
+            if check_saved_file:
+                try:
+                    info = probe_file(temp_path)
+                    if info is not None:
+                        dur = info.duration
+                    else:
+                        from pydub import AudioSegment
+                        dur = AudioSegment.from_file(temp_path, format="mp3").duration_seconds
+                    print(f"📏 File duration: {dur:.1f} seconds")
+
+                    if not self.duration_in_range(dur):
+                        print(f"⏩ Skipped {filename} (duration {dur:.1f}s not in range {self.min_duration}-{self.max_duration})")
+                        return False
+                except Exception as e:
+                    print(f"[!] Error checking duration for {filename}: {e}")
+                    return False
+
+            # Atomic rename: the folder only ever holds complete recordings
+            os.replace(temp_path, file_path)
+            temp_path = None
+            self.content_hashes[file_path] = digest.hexdigest()
+            remember_content_hash(file_path, self.content_hashes[file_path])
+            return True
+
+        except Exception as e:
+            print(f"[!] Error downloading {filename}: {e}")
+            return False
+
+        finally:
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def close(self):
+        """Release pooled connections."""
+        self.session.close()
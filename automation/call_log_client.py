@@ -0,0 +1,426 @@
+"""
+HTTP Call-Log Client
+Selenium-free alternative backend: logs in with a form post, submits the
+call-log filters (date range, restrict_uid, restrict_campaign, disposition,
+duration_filter) as plain requests, parses result rows with a single-pass
+HTML parser and fetches result pages in parallel.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+from automation.call_downloader import (
+    CallDownloader, call_row_from_fields, create_download_session, duration_filter_value,
+    get_download_dir, get_dialer_concurrency, DOWNLOAD_TIMEOUT
+)
+from config import READYMODE_USER, READYMODE_PASSWORD
+
+# Link on the dialer home page that opens the call log report
+CALL_LOG_LINK = "+CCS Reports/call_log"
+
+# Query/form field that selects a result page (the Selenium flow clicks
+# '#ccs_cl_pagination li.page' instead)
+PAGE_FIELD = "page"
+
+# Result pages fetched ahead in parallel while earlier pages download
+PAGE_PREFETCH = 4
+
+# Tags without a closing tag (not counted in the nesting depth)
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+# Call-log form fields
+START_DATE_FIELD = "report[time_from_d]"
+END_DATE_FIELD = "report[time_to_d]"
+AGENT_FIELD = "restrict_uid"
+CAMPAIGN_FIELD = "restrict_campaign"
+DURATION_FIELD = "duration_filter"
+
+
+class CallLogPageParser(HTMLParser):
+    """
+    Single-pass parser for dialer pages.
+
+    Collects forms (action, method, input values), selects (options),
+    links, pagination pages and call rows. A call row is the innermost
+    <div> holding both span[repvar='File'] and span[repvar='User'] plus a
+    recording link, matching the Selenium scraper.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.forms = []
+        self.selects = {}  # name/id -> {'multiple': bool, 'options': [(value, text, selected)]}
+        self.links = []
+        self.pages = []  # [(page_number, selected)]
+        self.rows = []  # [(fields, href)]
+
+        self._divs = []  # Open divs: {'fields': {}, 'links': []}
+        self._emitted_links = set()
+        self._span = None  # [repvar, depth, text parts]
+        self._select = None
+        self._option = None  # [value, text parts, selected]
+        self._pagination_depth = None
+        self._page_item = None  # [text parts, selected, data-page]
+        self._depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag not in VOID_TAGS:
+            self._depth += 1
+        if attrs.get("id") == "ccs_cl_pagination":
+            self._pagination_depth = self._depth
+
+        if tag == "div":
+            self._divs.append({'fields': {}, 'links': []})
+        elif tag == "span":
+            if self._span is not None:
+                self._span[1] += 1
+            elif attrs.get("repvar"):
+                self._span = [attrs["repvar"], 0, []]
+        elif tag == "a" and attrs.get("href"):
+            href = attrs["href"]
+            self.links.append(href)
+            if ".mp3" in href:
+                for div in self._divs:
+                    div['links'].append(href)
+        elif tag == "form":
+            self.forms.append({
+                'action': attrs.get("action", ""),
+                'method': (attrs.get("method") or "get").lower(),
+                'inputs': {},
+                'buttons': [],
+            })
+        elif tag == "input" and self.forms:
+            input_type = (attrs.get("type") or "text").lower()
+            if input_type == "submit":
+                self.forms[-1]['buttons'].append(attrs.get("value", ""))
+            elif attrs.get("name") and (input_type not in ("checkbox", "radio") or "checked" in attrs):
+                self.forms[-1]['inputs'].setdefault(attrs["name"], attrs.get("value", ""))
+        elif tag == "select":
+            key = attrs.get("name") or attrs.get("id")
+            self._select = {'multiple': "multiple" in attrs, 'options': [], 'name': attrs.get("name")}
+            if key:
+                self.selects[key] = self._select
+            if attrs.get("id") and attrs.get("name"):
+                self.selects.setdefault(attrs["id"], self._select)
+        elif tag == "option" and self._select is not None:
+            self._option = [attrs.get("value"), [], "selected" in attrs]
+        elif tag == "li" and self._pagination_depth is not None:
+            classes = (attrs.get("class") or "").split()
+            if "page" in classes:
+                self._page_item = [[], "selected" in classes, attrs.get("data-page")]
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+        if tag == "div" and self._divs:
+            div = self._divs.pop()
+            fields = div['fields']
+            if "File" in fields and "User" in fields:
+                href = next((h for h in div['links'] if h not in self._emitted_links), None)
+                if href is not None:
+                    self._emitted_links.add(href)
+                    self.rows.append((fields, href))
+        elif tag == "span" and self._span is not None:
+            if self._span[1]:
+                self._span[1] -= 1
+            else:
+                repvar, _, parts = self._span
+                text = " ".join("".join(parts).split())
+                for div in self._divs:
+                    div['fields'].setdefault(repvar, text)
+                self._span = None
+        elif tag == "option" and self._option is not None:
+            value, parts, selected = self._option
+            text = " ".join("".join(parts).split())
+            self._select['options'].append((text if value is None else value, text, selected))
+            self._option = None
+        elif tag == "select":
+            self._select = None
+        elif tag == "li" and self._page_item is not None:
+            parts, selected, data_page = self._page_item
+            number = data_page or "".join(parts).strip()
+            if number.isdigit():
+                self.pages.append((int(number), selected))
+            self._page_item = None
+
+        if self._pagination_depth is not None and self._depth == self._pagination_depth:
+            self._pagination_depth = None
+        self._depth -= 1
+
+    def handle_data(self, data):
+        if self._span is not None:
+            self._span[2].append(data)
+        if self._option is not None:
+            self._option[1].append(data)
+        if self._page_item is not None:
+            self._page_item[0].append(data)
+
+
+def parse_page(html):
+    """Parse a dialer page with CallLogPageParser."""
+    parser = CallLogPageParser()
+    parser.feed(html)
+    parser.close()
+    return parser
+
+
+def match_option(options, wanted):
+    """
+    Find a select option by visible text with the same fallbacks as the
+    Selenium agent selection: exact text, case-insensitive substring,
+    option value, then match ignoring spaces.
+
+    Returns:
+        Option value, or None if nothing matches
+    """
+    wanted = wanted.strip()
+    lowered = wanted.lower()
+    no_space = lowered.replace(" ", "")
+    for value, text, _ in options:
+        if text == wanted:
+            return value
+    for value, text, _ in options:
+        if lowered in text.lower():
+            return value
+    for value, text, _ in options:
+        if value == wanted:
+            return value
+    for value, text, _ in options:
+        option_no_space = text.replace(" ", "").lower()
+        if no_space == option_no_space or no_space in option_no_space:
+            return value
+    return None
+
+
+class CallLogClient:
+    """
+    Pure-HTTP ReadyMode call-log client.
+
+    Usage:
+        client = CallLogClient(dialer_url)
+        client.login(user, password)
+        for row in client.iter_calls(start_date=..., agent="John Smith"):
+            ...
+    """
+
+    def __init__(self, dialer_url, session=None, page_prefetch=PAGE_PREFETCH):
+        self.dialer_url = dialer_url.rstrip("/") + "/"
+        self.session = session or create_download_session({}, get_dialer_concurrency(dialer_url))
+        self.page_prefetch = page_prefetch
+        self.call_log_url = None
+        self.page_latencies_ms = []
+        self._home = None
+        self._home_url = self.dialer_url
+        self._form = None
+        self._selects = {}
+
+    def _get(self, url, **kwargs):
+        response = self.session.get(url, timeout=DOWNLOAD_TIMEOUT, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def _submit(self, form, base_url, fields):
+        url = urljoin(base_url, form['action'] or base_url)
+        if form['method'] == "post":
+            response = self.session.post(url, data=fields, timeout=DOWNLOAD_TIMEOUT)
+        else:
+            response = self.session.get(url, params=fields, timeout=DOWNLOAD_TIMEOUT)
+        response.raise_for_status()
+        return response
+
+    def login(self, username=READYMODE_USER, password=READYMODE_PASSWORD):
+        """
+        Log in with the dialer's login form (account, password, admin flag).
+
+        Returns:
+            True if the dialer no longer shows the login form
+        """
+        response = self._get(self.dialer_url)
+        page = parse_page(response.text)
+        for _ in range(2):  # Login form, then the optional 'Continue' step
+            form = next((f for f in page.forms
+                         if "login_account" in f['inputs'] or "Continue" in f['buttons']), None)
+            if form is None:
+                break
+            fields = dict(form['inputs'])
+            if "login_account" in fields:
+                fields.update({"login_account": username, "login_password": password, "login_as_admin": "1"})
+            response = self._submit(form, response.url, fields)
+            page = parse_page(response.text)
+
+        logged_in = not any("login_account" in f['inputs'] for f in page.forms)
+        if logged_in:
+            self._home, self._home_url = page, response.url
+        return logged_in
+
+    def open_call_log(self):
+        """Load the call-log report page and its filter form."""
+        home = self._home or parse_page(self._get(self.dialer_url).text)
+        link = next((href for href in home.links if CALL_LOG_LINK in href), None)
+        if link is None:
+            raise RuntimeError("Call Logs link not found (not logged in?)")
+        self.call_log_url = urljoin(self._home_url, link)
+        page = parse_page(self._get(self.call_log_url).text)
+        self._form = next((f for f in page.forms if START_DATE_FIELD in f['inputs']), None) or \
+            {'action': "", 'method': "get", 'inputs': {}}
+        self._selects = page.selects
+        return page
+
+    def build_filters(self, start_date=None, end_date=None, agent=None, campaign_name=None,
+                      disposition=None, min_duration=None, max_duration=None):
+        """
+        Build the call-log form fields for the requested filters.
+
+        Returns:
+            Dict of form field -> value (list values for multi-selects)
+        """
+        if self._form is None:
+            self.open_call_log()
+        fields = dict(self._form['inputs'])
+
+        if start_date and end_date:
+            fields[START_DATE_FIELD] = start_date.strftime("%m/%d/%Y")
+            fields[END_DATE_FIELD] = end_date.strftime("%m/%d/%Y")
+
+        if campaign_name:
+            value = match_option(self._selects.get(CAMPAIGN_FIELD, {}).get('options', []), campaign_name)
+            if value is None:
+                print(f"[!] Campaign '{campaign_name}' not found")
+            else:
+                fields[CAMPAIGN_FIELD] = value
+                print(f"✅ Campaign: {campaign_name}")
+
+        if agent and agent.strip().lower() != "any":
+            value = match_option(self._selects.get(AGENT_FIELD, {}).get('options', []), agent)
+            if value is None:
+                print(f"⚠️ Agent '{agent}' not found - downloading from ALL agents")
+            else:
+                fields[AGENT_FIELD] = value
+                print(f"✅ Agent filter: {agent}")
+
+        if disposition:
+            # The disposition filter is the multi-select offering the requested dispositions
+            for name, select in self._selects.items():
+                texts = {text: value for value, text, _ in select['options']}
+                if select['multiple'] and select.get('name') and all(d in texts for d in disposition):
+                    fields[select['name']] = [texts[d] for d in disposition]
+                    print(f"✅ Disposition: {disposition}")
+                    break
+            else:
+                print(f"[!] Failed to apply disposition filter: {disposition}")
+
+        value = duration_filter_value(min_duration, max_duration)
+        if value is not None:
+            fields[DURATION_FIELD] = value
+        return fields
+
+    def fetch_page(self, fields, page_number=1):
+        """
+        Fetch and parse one result page.
+
+        Returns:
+            (call rows, highest page number listed in the pagination)
+        """
+        start = time.perf_counter()
+        page_fields = dict(fields)
+        if page_number > 1:
+            page_fields[PAGE_FIELD] = page_number
+        response = self._submit(self._form, self.call_log_url, page_fields)
+        page = parse_page(response.text)
+        calls = [call_row_from_fields(row_fields, urljoin(response.url, href)) for row_fields, href in page.rows]
+        self.page_latencies_ms.append((time.perf_counter() - start) * 1000)
+        last_page = max((number for number, _ in page.pages), default=page_number)
+        return calls, last_page
+
+    def iter_pages(self, fields):
+        """
+        Yield each result page's call rows in order. Page 1 is fetched first;
+        later pages are fetched in parallel, up to page_prefetch ahead.
+        """
+        calls, last_page = self.fetch_page(fields, 1)
+        yield calls
+        if last_page <= 1:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.page_prefetch) as pool:
+            pending = {}
+            next_page = 2
+            try:
+                for page_number in range(2, last_page + 1):
+                    while next_page <= last_page and len(pending) < self.page_prefetch:
+                        pending[next_page] = pool.submit(self.fetch_page, fields, next_page)
+                        next_page += 1
+                    calls, _ = pending.pop(page_number).result()
+                    yield calls
+            finally:
+                # Consumer stopped early: skip pages not started yet
+                for future in pending.values():
+                    future.cancel()
+
+    def iter_calls(self, **filters):
+        """Yield every call row matching the filters (see build_filters), in page order."""
+        fields = self.build_filters(**filters)
+        for calls in self.iter_pages(fields):
+            yield from calls
+
+    def cookies(self):
+        """Session cookies as a dict (for CallDownloader)."""
+        return self.session.cookies.get_dict()
+
+
+def download_call_recordings_http(dialer_url, agent, update_callback=None,
+                                  start_date=None, end_date=None,
+                                  max_samples=50, campaign_name=None,
+                                  disposition=None,
+                                  min_duration=None, max_duration=None,
+                                  username=None, on_file_saved=None,
+                                  login_user=READYMODE_USER, login_password=READYMODE_PASSWORD):
+    """
+    HTTP backend for download_all_call_recordings (same arguments and folders).
+
+    Returns:
+        Number of recordings saved
+    """
+    download_dir = get_download_dir(agent, campaign_name, start_date, end_date, username or login_user)
+    client = CallLogClient(dialer_url)
+    if not client.login(login_user, login_password):
+        raise RuntimeError(f"Login to {dialer_url} failed")
+    print("✅ Logged in (HTTP)")
+
+    all_users = bool(agent) and agent.strip().lower() == "all users"
+    downloader = CallDownloader(
+        dialer_url, download_dir, client.cookies(),
+        session=client.session,  # Share the logged-in connection pool
+        max_samples=max_samples,
+        max_attempts=max_samples * (3 if all_users else 2),
+        min_duration=min_duration, max_duration=max_duration,
+        update_callback=update_callback,
+        dedupe=True,
+        on_file_saved=on_file_saved
+    )
+
+    fields = client.build_filters(
+        start_date=start_date, end_date=end_date, agent=agent, campaign_name=campaign_name,
+        disposition=disposition, min_duration=min_duration, max_duration=max_duration
+    )
+    pages = client.iter_pages(fields)
+    try:
+        for page_number, calls in enumerate(pages, 1):
+            print(f"\n📄 Page {page_number}: {len(calls)} calls "
+                  f"(Downloaded: {downloader.downloaded}/{max_samples}, Attempted: {downloader.attempted})")
+            downloader.download_calls(calls)
+            if downloader.done:
+                break
+    finally:
+        pages.close()
+        downloader.close()
+
+    if client.page_latencies_ms:
+        print(f"⏱️ Call-log pages: {len(client.page_latencies_ms)}, "
+              f"avg {sum(client.page_latencies_ms) / len(client.page_latencies_ms):.0f} ms per page")
+    print(f"📊 Download complete: {downloader.downloaded}/{max_samples} files downloaded, "
+          f"{downloader.attempted} total attempts, {downloader.skipped_by_listing} skipped on listed duration")
+    return downloader.downloaded
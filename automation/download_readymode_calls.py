@@ -1,6 +1,6 @@
 import time
-import requests
-import re
+import json
+import atexit
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
@@ -9,11 +9,17 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from datetime import datetime, timedelta
+from automation.call_downloader import (
+    CallDownloader, call_row_from_fields, duration_filter_value, format_agent_name_for_filename,
+    get_download_dir
+)
+from automation.session_manager import SessionManager
+from config import app_settings, READYMODE_USER, READYMODE_PASSWORD
 
 # Get username from environment or use default
 import os
-USERNAME = os.getenv("READYMODE_USER", "Auditor1")
-PASSWORD = os.getenv("READYMODE_PASSWORD", "Auditor1@3510")
+USERNAME = READYMODE_USER
+PASSWORD = READYMODE_PASSWORD
 
 def get_driver():
     chrome_options = Options()
@@ -59,15 +65,99 @@ def login_to_readymode(driver, wait, dialer_url):
 
     wait.until(lambda d: "login" not in d.current_url)
 
-# Example function to save a downloaded file for a user
-
-def format_agent_name_for_filename(agent_name):
+def is_session_active(driver, dialer_url):
+    """Check that a warm browser is still logged in to the dialer."""
+    try:
+        driver.get(dialer_url)
+        driver.implicitly_wait(0)  # Don't wait 10s for a login form that should be absent
+        try:
+            return "login" not in driver.current_url and not driver.find_elements(By.NAME, "login_account")
+        finally:
+            driver.implicitly_wait(10)
+    except Exception:
+        return False
+
+# Warm, logged-in browsers reused across audits, per (dialer URL, login user)
+_session_manager = SessionManager(
+    create_driver=get_driver,
+    login=lambda driver, dialer_url: login_to_readymode(driver, WebDriverWait(driver, 60), dialer_url),
+    is_logged_in=is_session_active,
+    idle_timeout=app_settings.dialer_session_idle_timeout
+)
+atexit.register(_session_manager.close_all)
+
+def get_session_stats():
+    """Get warm-session reuse counters and the estimated time saved (seconds)."""
+    return _session_manager.stats()
+
+# Collects every call-log row in one round-trip: for each recording link, the
+# closest enclosing block holding the File/User fields, plus all of its
+# span[repvar] columns (duration, disposition, ...)
+CALL_ROWS_SCRIPT = """
+const rows = [];
+const blocks = new Set();
+for (const link of document.querySelectorAll("a[href*='.mp3']")) {
+    let block = link.closest("div");
+    while (block && !(block.querySelector("span[repvar='File']") && block.querySelector("span[repvar='User']"))) {
+        block = block.parentElement ? block.parentElement.closest("div") : null;
+    }
+    if (!block || blocks.has(block)) continue;
+    blocks.add(block);
+    const fields = {};
+    for (const span of block.querySelectorAll("span[repvar]")) {
+        const name = span.getAttribute("repvar");
+        if (!(name in fields)) fields[name] = (span.innerText || span.textContent || "").trim();
+    }
+    rows.push({href: link.getAttribute("href") && link.href, fields: fields});
+}
+return JSON.stringify(rows);
+"""
+
+
+def scrape_call_blocks(driver, dialer_url, latencies_ms=None):
     """
-    Format agent name for use in filenames (remove spaces for filesystem compatibility)
-    but keep the original format for display purposes.
+    Scrape every call row on the current call-log page with a single
+    execute_script round-trip (instead of three find_element calls per row).
+
+    Args:
+        driver: Selenium driver on a call-log page
+        dialer_url: Base URL for relative recording links
+        latencies_ms: Optional list the page's scrape time (ms) is appended to
+
+    Returns:
+        List of call row dicts (see call_row_from_fields)
     """
-    # Remove spaces for filename to avoid filesystem issues
-    return agent_name.strip().replace(" ", "")
+    start = time.perf_counter()
+    try:
+        raw_rows = json.loads(driver.execute_script(CALL_ROWS_SCRIPT) or "[]")
+    except Exception as e:
+        print(f"[!] Failed to scrape call rows: {e}")
+        raw_rows = []
+
+    calls = []
+    for raw in raw_rows:
+        href = raw.get("href")
+        if not href:
+            continue
+        if not href.startswith("http"):
+            href = dialer_url.rstrip("/") + "/" + href.lstrip("/")
+        calls.append(call_row_from_fields(raw.get("fields", {}), href))
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if latencies_ms is not None:
+        latencies_ms.append(elapsed_ms)
+    print(f"⏱️ Scraped {len(calls)} rows in {elapsed_ms:.0f} ms")
+    return calls
+
+
+def report_scrape_latency(latencies_ms):
+    """Print per-page call-log scrape latency for one download run."""
+    if latencies_ms:
+        print(f"⏱️ Call-log scraping: {len(latencies_ms)} page(s), "
+              f"avg {sum(latencies_ms) / len(latencies_ms):.0f} ms, "
+              f"max {max(latencies_ms):.0f} ms per page")
+
+# Example function to save a downloaded file for a user
 
 def save_downloaded_file(username, filename, file_bytes, record_type='Agent'):
     today = datetime.now().strftime('%Y-%m-%d')
@@ -83,30 +173,35 @@ def download_all_call_recordings(dialer_url, agent, update_callback=None,
                                   max_samples=50, campaign_name=None,
                                   disposition=None,
                                   min_duration=None, max_duration=None,
-                                  username=None, keep_browser_open=False):
-    subfolder = "Campaign" if campaign_name and start_date and end_date else "Agent"
-    # Determine save path for Campaign or Agent
-    from datetime import datetime
-    today = datetime.now().strftime('%Y-%m-%d')
-    
+                                  username=None, keep_browser_open=False,
+                                  on_file_saved=None):
+    if app_settings.call_log_backend == 'http':
+        from automation.call_log_client import download_call_recordings_http
+        return download_call_recordings_http(
+            dialer_url, agent, update_callback=update_callback,
+            start_date=start_date, end_date=end_date,
+            max_samples=max_samples, campaign_name=campaign_name,
+            disposition=disposition,
+            min_duration=min_duration, max_duration=max_duration,
+            username=username, on_file_saved=on_file_saved
+        )
+
     # Use provided username or fall back to default
-    download_username = username if username else USERNAME
-    
-    if subfolder == "Campaign" and campaign_name:
-        campaign_folder = f"{campaign_name}-{today}"
-        DOWNLOAD_DIR = os.path.join(os.getcwd(), "Recordings", subfolder, download_username, campaign_folder)
-    elif subfolder == "Agent" and agent:
-        agent_folder = f"{agent}-{today}"
-        DOWNLOAD_DIR = os.path.join(os.getcwd(), "Recordings", subfolder, download_username, agent_folder)
-    else:
-        DOWNLOAD_DIR = os.path.join(os.getcwd(), "Recordings", subfolder, download_username, today)
-    os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+    DOWNLOAD_DIR = get_download_dir(agent, campaign_name, start_date, end_date, username or USERNAME)
 
-    driver = get_driver()
+    # Reuse a warm logged-in browser when enabled; otherwise start and log in fresh
+    reuse_session = keep_browser_open or app_settings.reuse_dialer_sessions
+    if reuse_session:
+        driver = _session_manager.acquire(dialer_url, USERNAME)
+    else:
+        driver = get_driver()
     wait = WebDriverWait(driver, 60)
+    scrape_latencies_ms = []  # Per audit: concurrent audits each report their own pages
+    audit_completed = False
 
     try:
-        login_to_readymode(driver, wait, dialer_url)
+        if not reuse_session:
+            login_to_readymode(driver, wait, dialer_url)
 
         call_logs_link = wait.until(EC.element_to_be_clickable(
             (By.XPATH, "//a[contains(@href, '+CCS Reports/call_log')]")))
@@ -304,39 +399,15 @@ def download_all_call_recordings(dialer_url, agent, update_callback=None,
             except Exception as e:
                 print(f"[!] Failed to apply disposition filter: {e}")
 
-        # Duration Filter (NEW)
-        if min_duration is not None or max_duration is not None:
+        # Duration Filter: narrow the listing when the range has a dropdown value; the
+        # downloader filters exactly on each row's listed duration either way
+        dropdown_value = duration_filter_value(min_duration, max_duration)
+        if dropdown_value is not None:
             try:
                 print(f"🔧 Setting duration filter: {min_duration}-{max_duration}")
                 duration_dropdown = wait.until(EC.presence_of_element_located((By.ID, "duration_filter")))
-
-                # Map min/max to dropdown value with better logic
-                if min_duration is not None and max_duration is not None:
-                    if min_duration == 30 and max_duration == 60:
-                        Select(duration_dropdown).select_by_value("30-60")
-                        print("✅ Set duration filter: 30-60 seconds")
-                    elif min_duration == 60 and max_duration == 600:
-                        Select(duration_dropdown).select_by_value("60-600")
-                        print("✅ Set duration filter: 60-600 seconds")
-                    else:
-                        # For custom ranges, try to find closest match or use "custom"
-                        print(f"⚠️ Custom duration range {min_duration}-{max_duration}, trying to set in UI")
-                        # Try 30-60 first as default
-                        try:
-                            Select(duration_dropdown).select_by_value("30-60")
-                            print("✅ Used 30-60 as closest match for custom range")
-                        except:
-                            print("⚠️ Could not set duration filter in UI, will filter after download")
-                elif max_duration is not None:
-                    if max_duration == 30:
-                        Select(duration_dropdown).select_by_value("0-30")
-                        print("✅ Set duration filter: 0-30 seconds")
-                    else:
-                        Select(duration_dropdown).select_by_value("less")
-                        print(f"✅ Set duration filter: Less than {max_duration} seconds")
-                elif min_duration is not None:
-                    Select(duration_dropdown).select_by_value("greater")
-                    print(f"✅ Set duration filter: Greater than {min_duration} seconds")
+                Select(duration_dropdown).select_by_value(dropdown_value)
+                print(f"✅ Set duration filter: {dropdown_value}")
 
                 # Wait for filter to apply
                 time.sleep(2)
@@ -344,235 +415,138 @@ def download_all_call_recordings(dialer_url, agent, update_callback=None,
                 print("✅ Duration filter applied successfully")
             except Exception as e:
                 print(f"[!] Failed to set duration filter in UI: {e}")
-                print("⚠️ Will rely on post-download duration filtering")
+                print("⚠️ Will rely on listed call durations")
+        elif min_duration is not None or max_duration is not None:
+            print(f"⚠️ No dropdown value for {min_duration}-{max_duration}s, filtering on listed call durations")
 
-        # Begin downloading
-        session = requests.Session()
+        # Begin downloading: one pooled session with the login cookies, shared by the download workers
         cookies = {c['name']: c['value'] for c in driver.get_cookies()}
-        headers = {"User-Agent": "Mozilla/5.0"}
 
         if agent and agent.strip().lower() == "all users":
-            downloaded = 0
-            attempted = 0
+            downloader = CallDownloader(
+                dialer_url, DOWNLOAD_DIR, cookies,
+                max_samples=max_samples,
+                max_attempts=max_samples * 3,  # Allow up to 3x attempts to account for filtered files
+                min_duration=min_duration, max_duration=max_duration,
+                update_callback=update_callback,
+                dedupe=True,
+                on_file_saved=on_file_saved
+            )
             page_number = 1
-            seen_links = set()
-            max_attempts = max_samples * 3  # Allow up to 3x attempts to account for filtered files
             start_time = datetime.now()
             max_duration_minutes = 30  # Maximum 30 minutes for download
 
-            while downloaded < max_samples and attempted < max_attempts:
-                # Check timeout
-                if datetime.now() - start_time > timedelta(minutes=max_duration_minutes):
-                    print(f"⏰ Timeout reached after {max_duration_minutes} minutes")
-                    break
+            try:
+                while not downloader.done:
+                    # Check timeout
+                    if datetime.now() - start_time > timedelta(minutes=max_duration_minutes):
+                        print(f"⏰ Timeout reached after {max_duration_minutes} minutes")
+                        break
 
-                print(f"\n📄 Page {page_number} (Downloaded: {downloaded}/{max_samples}, Attempted: {attempted})")
-                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='.mp3']")))
+                    print(f"\n📄 Page {page_number} (Downloaded: {downloader.downloaded}/{max_samples}, Attempted: {downloader.attempted})")
+                    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='.mp3']")))
 
-                blocks = driver.find_elements(By.XPATH, "//div[.//a[contains(@href, '.mp3')]]")
-                calls = []
-                for block in blocks:
-                    try:
-                        file_text = block.find_element(By.CSS_SELECTOR, "span[repvar='File']").text
-                        # Keep original agent name with spaces (don't remove spaces here)
-                        agent_text = block.find_element(By.CSS_SELECTOR, "span[repvar='User']").text.strip()
-                        href = block.find_element(By.CSS_SELECTOR, "a[href*='.mp3']").get_attribute("href")
-                        if not href.startswith("http"):
-                            href = dialer_url.rstrip("/") + "/" + href.lstrip("/")
-                        calls.append((agent_text, file_text, href))
-                    except:
-                        continue
+                    calls = scrape_call_blocks(driver, dialer_url, scrape_latencies_ms)
+                    print(f"🔍 Found {len(calls)} calls on page")
 
-                print(f"🔍 Found {len(calls)} calls on page")
+                    downloader.download_calls(calls)
 
-                for agent_name, file_text, href in calls:
-                    if downloaded >= max_samples or attempted >= max_attempts:
+                    if downloader.downloaded >= max_samples:
+                        print(f"✅ Reached target of {max_samples} files")
                         break
-                    if href in seen_links:
-                        continue
-                    seen_links.add(href)
-                    attempted += 1
-
-                    phone_match = re.search(r"\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4}", file_text)
-                    phone_number = phone_match.group(0) if phone_match else f"unknown_{attempted}"
-                    # Use formatted name (no spaces) for filename only
-                    filename = f"{format_agent_name_for_filename(agent_name)}_({phone_number}).mp3"
-                    filepath = os.path.join(DOWNLOAD_DIR, filename)
-
-                    print(f"⬇️ Attempting download {attempted}: {filename}")
-                    try:
-                        response = session.get(href, cookies=cookies, headers=headers)
-                        print(f"📥 Status: {response.status_code}")
-                        if response.status_code == 200:
-                            # Save file directly to the correct DOWNLOAD_DIR
-                            file_path = os.path.join(DOWNLOAD_DIR, filename)
-                            with open(file_path, "wb") as f:
-                                f.write(response.content)
-
-                            # Duration filter after download
-                            if min_duration is not None or max_duration is not None:
-                                try:
-                                    from pydub import AudioSegment
-                                    audio = AudioSegment.from_file(file_path)
-                                    dur = audio.duration_seconds
-                                    print(f"📏 File duration: {dur:.1f} seconds")
-
-                                    if (min_duration is not None and dur < min_duration) or (max_duration is not None and dur > max_duration):
-                                        os.remove(file_path)
-                                        print(f"⏩ Skipped {filename} (duration {dur:.1f}s not in range {min_duration}-{max_duration})")
-                                        continue
-                                    else:
-                                        print(f"✅ Duration OK: {dur:.1f}s matches filter {min_duration}-{max_duration}")
-                                except Exception as e:
-                                    print(f"[!] Error checking duration for {filename}: {e}")
-                                    os.remove(file_path)
-                                    continue
-
-                            downloaded += 1
-                            print(f"✅ Successfully saved ({downloaded}/{max_samples})")
-                            if update_callback:
-                                update_callback(downloaded, max_samples)
-                        else:
-                            print(f"❌ Failed to download {filename}: HTTP {response.status_code}")
-                    except Exception as e:
-                        print(f"[!] Error downloading {filename}: {e}")
-
-                if downloaded >= max_samples:
-                    print(f"✅ Reached target of {max_samples} files")
-                    break
 
-                try:
-                    pagination = driver.find_element(By.ID, "ccs_cl_pagination")
-                    current = pagination.find_element(By.CSS_SELECTOR, "li.page.selected")
-                    next_page = current.find_element(By.XPATH, "following-sibling::li[@class='page']")
-                    driver.execute_script("arguments[0].click();", next_page)
-                    print(f"➡️ Next page ({page_number + 1})")
-                    page_number += 1
-                    time.sleep(2)
-                except:
-                    print("❌ No more pages or pagination not found.")
-                    break
+                    try:
+                        pagination = driver.find_element(By.ID, "ccs_cl_pagination")
+                        current = pagination.find_element(By.CSS_SELECTOR, "li.page.selected")
+                        next_page = current.find_element(By.XPATH, "following-sibling::li[@class='page']")
+                        driver.execute_script("arguments[0].click();", next_page)
+                        print(f"➡️ Next page ({page_number + 1})")
+                        page_number += 1
+                        time.sleep(2)
+                    except:
+                        print("❌ No more pages or pagination not found.")
+                        break
+            finally:
+                downloader.close()
 
         else:
             # Single agent download logic
-            downloaded = 0
-            attempted = 0
-            max_attempts = max_samples * 2  # Allow up to 2x attempts for single agent
+            downloader = CallDownloader(
+                dialer_url, DOWNLOAD_DIR, cookies,
+                max_samples=max_samples,
+                max_attempts=max_samples * 2,  # Allow up to 2x attempts for single agent
+                min_duration=min_duration, max_duration=max_duration,
+                update_callback=update_callback,
+                on_file_saved=on_file_saved
+            )
             start_time = datetime.now()
             max_duration_minutes = 15  # Maximum 15 minutes for single agent
 
-            while downloaded < max_samples and attempted < max_attempts:
-                # Check timeout
-                if datetime.now() - start_time > timedelta(minutes=max_duration_minutes):
-                    print(f"⏰ Timeout reached after {max_duration_minutes} minutes")
-                    break
+            try:
+                while not downloader.done:
+                    # Check timeout
+                    if datetime.now() - start_time > timedelta(minutes=max_duration_minutes):
+                        print(f"⏰ Timeout reached after {max_duration_minutes} minutes")
+                        break
 
-                print(f"\n🔍 Looking for calls... (Downloaded: {downloaded}/{max_samples})")
-                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='.mp3']")))
+                    print(f"\n🔍 Looking for calls... (Downloaded: {downloader.downloaded}/{max_samples})")
+                    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='.mp3']")))
 
-                blocks = driver.find_elements(By.XPATH, "//div[.//a[contains(@href, '.mp3')]]")
-                calls = []
-                for block in blocks:
-                    try:
-                        file_text = block.find_element(By.CSS_SELECTOR, "span[repvar='File']").text
-                        # Keep original agent name with spaces (don't remove spaces here)
-                        agent_text = block.find_element(By.CSS_SELECTOR, "span[repvar='User']").text.strip()
-                        href = block.find_element(By.CSS_SELECTOR, "a[href*='.mp3']").get_attribute("href")
-                        if not href.startswith("http"):
-                            href = dialer_url.rstrip("/") + "/" + href.lstrip("/")
-                        calls.append((agent_text, file_text, href))
-                    except:
-                        continue
+                    calls = scrape_call_blocks(driver, dialer_url, scrape_latencies_ms)
+                    print(f"🔍 Found {len(calls)} calls")
 
-                print(f"🔍 Found {len(calls)} calls")
+                    downloader.download_calls(calls)
 
-                for agent_name, file_text, href in calls:
-                    if downloaded >= max_samples or attempted >= max_attempts:
+                    if downloader.downloaded >= max_samples:
                         break
 
-                    attempted += 1
-                    print(f"⬇️ Attempting download {attempted}: {agent_name}")
-
-                    phone_match = re.search(r"\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4}", file_text)
-                    phone_number = phone_match.group(0) if phone_match else f"unknown_{attempted}"
-                    # Use formatted name (no spaces) for filename only
-                    filename = f"{format_agent_name_for_filename(agent_name)}_({phone_number}).mp3"
-                    filepath = os.path.join(DOWNLOAD_DIR, filename)
-
-                    try:
-                        response = session.get(href, cookies=cookies, headers=headers)
-                        print(f"📥 Status: {response.status_code}")
-                        if response.status_code == 200:
-                            file_path = os.path.join(DOWNLOAD_DIR, filename)
-                            with open(file_path, "wb") as f:
-                                f.write(response.content)
-
-                            # Duration filter after download
-                            if min_duration is not None or max_duration is not None:
-                                try:
-                                    from pydub import AudioSegment
-                                    audio = AudioSegment.from_file(file_path)
-                                    dur = audio.duration_seconds
-                                    print(f"📏 File duration: {dur:.1f} seconds")
-
-                                    if (min_duration is not None and dur < min_duration) or (max_duration is not None and dur > max_duration):
-                                        os.remove(file_path)
-                                        print(f"⏩ Skipped {filename} (duration {dur:.1f}s not in range)")
-                                        continue
-                                except Exception as e:
-                                    print(f"[!] Error checking duration for {filename}: {e}")
-                                    os.remove(file_path)
-                                    continue
-
-                            downloaded += 1
-                            print(f"✅ Saved ({downloaded}/{max_samples})")
-                            if update_callback:
-                                update_callback(downloaded, max_samples)
-                        else:
-                            print(f"❌ Failed to download: HTTP {response.status_code}")
-                    except Exception as e:
-                        print(f"[!] Error downloading: {e}")
-
-                if downloaded >= max_samples:
-                    break
-
-                # Try to load more results - multiple strategies for single agent
-                more_results = False
-                try:
-                    # Strategy 1: Look for specific pagination
-                    pagination = driver.find_element(By.ID, "ccs_cl_pagination")
-                    current = pagination.find_element(By.CSS_SELECTOR, "li.page.selected")
-                    next_page = current.find_element(By.XPATH, "following-sibling::li[@class='page']")
-                    if next_page:
-                        driver.execute_script("arguments[0].click();", next_page)
-                        print(f"➡️ Next page")
-                        more_results = True
-                        time.sleep(2)
-                except:
+                    # Try to load more results - multiple strategies for single agent
+                    more_results = False
                     try:
-                        # Strategy 2: Look for "Load More" or "Show More" buttons
-                        buttons = driver.find_elements(By.CSS_SELECTOR, "button, a, span")
-                        for btn in buttons:
-                            if ("load more" in btn.text.lower() or
-                                "show more" in btn.text.lower() or
-                                "next" in btn.text.lower()):
-                                driver.execute_script("arguments[0].click();", btn)
-                                print("🔄 Loading more results...")
-                                more_results = True
-                                time.sleep(3)
-                                break
+                        # Strategy 1: Look for specific pagination
+                        pagination = driver.find_element(By.ID, "ccs_cl_pagination")
+                        current = pagination.find_element(By.CSS_SELECTOR, "li.page.selected")
+                        next_page = current.find_element(By.XPATH, "following-sibling::li[@class='page']")
+                        if next_page:
+                            driver.execute_script("arguments[0].click();", next_page)
+                            print(f"➡️ Next page")
+                            more_results = True
+                            time.sleep(2)
                     except:
-                        pass
+                        try:
+                            # Strategy 2: Look for "Load More" or "Show More" buttons
+                            buttons = driver.find_elements(By.CSS_SELECTOR, "button, a, span")
+                            for btn in buttons:
+                                if ("load more" in btn.text.lower() or
+                                    "show more" in btn.text.lower() or
+                                    "next" in btn.text.lower()):
+                                    driver.execute_script("arguments[0].click();", btn)
+                                    print("🔄 Loading more results...")
+                                    more_results = True
+                                    time.sleep(3)
+                                    break
+                        except:
+                            pass
 
-                if not more_results:
-                    print("❌ No more results found for single agent.")
-                    break
+                    if not more_results:
+                        print("❌ No more results found for single agent.")
+                        break
+            finally:
+                downloader.close()
 
-            print(f"📊 Single agent download complete: {downloaded}/{max_samples} files downloaded, {attempted} total attempts")
+            print(f"📊 Single agent download complete: {downloader.downloaded}/{max_samples} files downloaded, {downloader.attempted} total attempts, {downloader.skipped_by_listing} skipped on listed duration")
+
+        audit_completed = True
 
     finally:
-        driver.quit()
-        print("✅ Done. Browser closed.")
+        report_scrape_latency(scrape_latencies_ms)
+        if reuse_session:
+            # A browser left in an unknown state by an error is closed, not reused
+            _session_manager.release(dialer_url, USERNAME, driver, healthy=audit_completed)
+            print("✅ Done. Browser kept open for the next audit." if audit_completed else "✅ Done. Browser closed.")
+        else:
+            driver.quit()
+            print("✅ Done. Browser closed.")
 
 
 
@@ -0,0 +1,283 @@
+"""
+Local ReadyMode Stand-in
+Small HTTP server that mimics the parts of a ReadyMode dialer the downloaders
+use: the login form, the home page 'Call Logs' link, the call-log report
+(filters, span[repvar] rows, #ccs_cl_pagination) and MP3 recordings. Used to
+test and benchmark the download backends offline.
+
+Usage:
+    python -m automation.mock_readymode [port] [num_calls] [latency_ms]
+"""
+
+import html
+import random
+import secrets
+import struct
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, unquote
+
+CALL_LOG_PATH = "/+CCS Reports/call_log"
+
+DISPOSITIONS = ["Voicemail", "Callback", "Wrong Number", "Dead Call", "Decision Maker - Lead"]
+CAMPAIGNS = ["Sellers Q1", "Sellers Q2"]
+AGENTS = ["John Smith", "Abdelrahman Ahmed", "Mary Jones", "Omar Hassan"]
+
+DURATION_FILTERS = {
+    "0-30": (0, 30),
+    "30-60": (30, 60),
+    "60-600": (60, 600),
+    "less": (0, 30),
+    "greater": (60, None),
+}
+
+
+def silent_mp3(seconds, bitrate_kbps=32, sample_rate=44100, stereo=True):
+    """
+    Build a valid constant-bitrate MPEG-1 Layer III stream of silence.
+
+    Returns:
+        MP3 bytes (zero-filled frames decode as digital silence)
+    """
+    bitrate_index = {32: 1, 64: 5, 128: 9}[bitrate_kbps]
+    rate_index = {44100: 0, 48000: 1, 32000: 2}[sample_rate]
+    channel_mode = 0 if stereo else 3
+    header = struct.pack(">I", (0x7FF << 21) | (3 << 19) | (1 << 17) | (1 << 16) |
+                         (bitrate_index << 12) | (rate_index << 10) | (channel_mode << 6))
+    frame_length = 144 * bitrate_kbps * 1000 // sample_rate
+    frame = header + bytes(frame_length - 4)
+    frames = max(int(seconds * sample_rate / 1152), 1)
+    return frame * frames
+
+
+def make_calls(num_calls, seed=0, day=None):
+    """Generate a reproducible list of fake calls."""
+    rng = random.Random(seed)
+    day = day or date.today()
+    calls = []
+    for i in range(num_calls):
+        agent_index = rng.randrange(len(AGENTS))
+        calls.append({
+            'id': i + 1,
+            'agent': AGENTS[agent_index],
+            'uid': str(100 + agent_index),
+            'campaign': rng.choice(CAMPAIGNS),
+            'phone': f"(555) {rng.randrange(200, 999)}-{rng.randrange(0, 9999):04d}",
+            'duration': rng.choice([8, 15, 25, 35, 45, 55, 75, 120, 300]),
+            'disposition': rng.choice(DISPOSITIONS),
+            'date': day - timedelta(days=rng.randrange(0, 3)),
+        })
+    return calls
+
+
+class MockReadyModeServer:
+    """
+    Threaded mock dialer.
+
+    Usage:
+        with MockReadyModeServer(num_calls=200, latency=0.05) as server:
+            client = CallLogClient(server.url)
+    """
+
+    def __init__(self, num_calls=120, page_size=25, latency=0.0, username="Auditor1",
+                 password="Auditor1@3510", port=0, seed=0):
+        self.calls = make_calls(num_calls, seed=seed)
+        self.page_size = page_size
+        self.latency = latency  # Seconds added to every request
+        self.username = username
+        self.password = password
+        self.sessions = set()
+        self.request_count = 0
+        self.broken_recordings = set()  # Call ids whose connection drops halfway through the recording
+        self._recordings = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def recording(self, call):
+        """MP3 bytes for a call (cached)."""
+        with self._lock:
+            if call['id'] not in self._recordings:
+                self._recordings[call['id']] = silent_mp3(call['duration'])
+            return self._recordings[call['id']]
+
+    def filter_calls(self, query):
+        """Apply call-log filters from the submitted form fields."""
+        calls = self.calls
+        first = lambda name: (query.get(name) or [""])[0]
+
+        start, end = first("report[time_from_d]"), first("report[time_to_d]")
+        if start and end:
+            to_date = lambda text: date(int(text[6:10]), int(text[0:2]), int(text[3:5]))
+            start, end = to_date(start), to_date(end)
+            calls = [c for c in calls if start <= c['date'] <= end]
+        if first("restrict_uid"):
+            calls = [c for c in calls if c['uid'] == first("restrict_uid")]
+        if first("restrict_campaign"):
+            calls = [c for c in calls if c['campaign'] == first("restrict_campaign")]
+        dispositions = query.get("report[dispositions][]")
+        if dispositions:
+            calls = [c for c in calls if c['disposition'] in dispositions]
+        if first("duration_filter") in DURATION_FILTERS:
+            low, high = DURATION_FILTERS[first("duration_filter")]
+            calls = [c for c in calls if c['duration'] >= low and (high is None or c['duration'] <= high)]
+        return calls
+
+    def render_login(self):
+        return """<html><body>
+<form method="post" action="/login">
+  <input type="text" name="login_account">
+  <input type="password" name="login_password">
+  <input type="checkbox" id="login_as_admin" name="login_as_admin" value="1">
+  <input type="submit" value="Sign in">
+</form></body></html>"""
+
+    def render_home(self):
+        return f"""<html><body><div class="menu">
+<a href="{CALL_LOG_PATH}">Call Logs</a></div></body></html>"""
+
+    def render_call_log(self, query):
+        calls = self.filter_calls(query)
+        pages = max((len(calls) + self.page_size - 1) // self.page_size, 1)
+        page = min(max(int((query.get("page") or ["1"])[0]), 1), pages)
+        shown = calls[(page - 1) * self.page_size:page * self.page_size]
+
+        options = lambda values: "".join(
+            f'<option value="{html.escape(v)}">{html.escape(t)}</option>' for v, t in values)
+        agents = [("", "All users")] + [(str(100 + i), name) for i, name in enumerate(AGENTS)]
+        rows = "".join(f"""
+<div class="call_row">
+  <div><span repvar="User">{html.escape(c['agent'])}</span></div>
+  <span repvar="File">Call {html.escape(c['phone'])} {c['date'].strftime('%m/%d/%Y')}</span>
+  <span repvar="Duration">{c['duration'] // 60}:{c['duration'] % 60:02d}</span>
+  <span repvar="Disposition">{html.escape(c['disposition'])}</span>
+  <a href="/recordings/{c['id']}.mp3">Recording</a>
+</div>""" for c in shown)
+        pagination = "".join(
+            f'<li class="page{" selected" if n == page else ""}" data-page="{n}">{n}</li>'
+            for n in range(1, pages + 1))
+        return f"""<html><body>
+<form method="get" action="{CALL_LOG_PATH}">
+  <input type="text" name="report[time_from_d]" value="">
+  <input type="text" name="report[time_to_d]" value="">
+  <select id="restrict_uid" name="restrict_uid">{options(agents)}</select>
+  <select id="restrict_campaign" name="restrict_campaign">{options([("", "All")] + [(c, c) for c in CAMPAIGNS])}</select>
+  <select name="report[dispositions][]" multiple>{options([(d, d) for d in DISPOSITIONS])}</select>
+  <select id="duration_filter" name="duration_filter">{options([("", "All")] + [(k, k) for k in DURATION_FILTERS])}</select>
+</form>
+<div id="call_log_results">{rows}
+</div>
+<ul id="ccs_cl_pagination">{pagination}</ul>
+</body></html>"""
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _logged_in(self):
+                cookie = self.headers.get("Cookie", "")
+                return any(part.strip().split("=", 1)[-1] in server.sessions
+                           for part in cookie.split(";") if part.strip().startswith("PHPSESSID="))
+
+            def _send(self, status, body=b"", content_type="text/html; charset=utf-8", headers=None):
+                if isinstance(body, str):
+                    body = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_truncated(self, body, content_type):
+                """Announce the full body, send half of it and drop the connection."""
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body[:len(body) // 2])
+                self.close_connection = True
+
+            def _delay(self):
+                with server._lock:
+                    server.request_count += 1
+                if server.latency:
+                    time.sleep(server.latency)
+
+            def do_POST(self):
+                self._delay()
+                length = int(self.headers.get("Content-Length", 0))
+                form = parse_qs(self.rfile.read(length).decode("utf-8"))
+                if urlsplit(self.path).path != "/login":
+                    return self._send(404, "Not found")
+                if (form.get("login_account", [""])[0] == server.username and
+                        form.get("login_password", [""])[0] == server.password):
+                    token = secrets.token_hex(8)
+                    server.sessions.add(token)
+                    return self._send(302, headers={"Location": "/", "Set-Cookie": f"PHPSESSID={token}; Path=/"})
+                return self._send(200, server.render_login())
+
+            def do_GET(self):
+                self._delay()
+                parts = urlsplit(self.path)
+                path = unquote(parts.path)
+                if not self._logged_in():
+                    if path.startswith("/recordings/"):
+                        return self._send(403, "Forbidden")
+                    return self._send(200, server.render_login())
+                if path == "/":
+                    return self._send(200, server.render_home())
+                if path == CALL_LOG_PATH:
+                    return self._send(200, server.render_call_log(parse_qs(parts.query)))
+                if path.startswith("/recordings/") and path.endswith(".mp3"):
+                    call_id = path.rsplit("/", 1)[-1][:-4]
+                    call = next((c for c in server.calls if str(c['id']) == call_id), None)
+                    if call is not None and call['id'] in server.broken_recordings:
+                        return self._send_truncated(server.recording(call), content_type="audio/mpeg")
+                    if call is not None:
+                        return self._send(200, server.recording(call), content_type="audio/mpeg")
+                return self._send(404, "Not found")
+
+        return Handler
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    num_calls = int(sys.argv[2]) if len(sys.argv) > 2 else 120
+    latency_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 0
+    mock = MockReadyModeServer(num_calls=num_calls, latency=latency_ms / 1000, port=port)
+    print(f"Mock ReadyMode dialer at {mock.url} ({num_calls} calls, {latency_ms:.0f} ms latency)")
+    print(f"Login: {mock.username} / {mock.password}")
+    mock.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        mock.stop()
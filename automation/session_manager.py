@@ -0,0 +1,188 @@
+"""
+Dialer Session Manager
+Keeps logged-in browser sessions warm per (dialer URL, login user) and hands
+them to successive audits, so each audit skips the browser cold start and
+login. A session is re-logged in only when its check fails. A background
+reaper closes browsers left idle past the timeout, even if no audit follows.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class SessionManager:
+    """
+    Pool of warm, authenticated WebDriver sessions.
+
+    The browser-specific steps are injected, so the manager itself has no
+    Selenium dependency:
+    - create_driver(): start a new browser
+    - login(driver, dialer_url): log in (raises on failure)
+    - is_logged_in(driver, dialer_url): True if the session is still valid
+    """
+
+    def __init__(self, create_driver, login, is_logged_in, idle_timeout=1800, max_idle_per_key=2,
+                 reap_interval=60):
+        self.create_driver = create_driver
+        self.login = login
+        self.is_logged_in = is_logged_in
+        self.idle_timeout = idle_timeout  # Seconds before an unused session is closed
+        self.max_idle_per_key = max_idle_per_key
+        self.reap_interval = reap_interval  # Seconds between idle checks while sessions are pooled
+
+        self._idle = {}  # (dialer_url, user) -> [(driver, last_used), ...]
+        self._lock = threading.Lock()
+        self._reaper = None  # Runs only while there are idle sessions
+
+        # Reuse statistics
+        self.cold_starts = 0
+        self.reuses = 0
+        self.relogins = 0
+        self._cold_start_seconds = 0.0
+        self._reuse_check_seconds = 0.0
+
+    @contextmanager
+    def session(self, dialer_url, user):
+        """
+        Borrow a logged-in driver for one audit.
+
+        Usage:
+            with manager.session(dialer_url, user) as driver:
+                ...
+
+        The driver goes back to the pool afterwards; it is closed instead if
+        the audit raised, since the browser may be in an unknown state.
+        """
+        driver = self.acquire(dialer_url, user)
+        healthy = False
+        try:
+            yield driver
+            healthy = True
+        finally:
+            self.release(dialer_url, user, driver, healthy=healthy)
+
+    def acquire(self, dialer_url, user):
+        """
+        Get a logged-in driver: a warm one that passes the session check
+        (re-logging in if needed) or a new browser.
+        """
+        key = (dialer_url, user)
+        self._expire_idle()
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                if not idle:
+                    break
+                driver, _ = idle.pop()
+
+            start = time.time()
+            if self.is_logged_in(driver, dialer_url):
+                self._record_reuse(time.time() - start)
+                print(f"♻️ Reusing warm dialer session (saved ~{self.average_cold_start:.1f}s)")
+                return driver
+            try:
+                print("🔑 Session expired, logging in again...")
+                self.login(driver, dialer_url)
+                self.relogins += 1
+                self._record_reuse(time.time() - start)
+                return driver
+            except Exception as e:
+                print(f"[!] Re-login failed ({e}), starting a new browser")
+                self._quit(driver)
+
+        # No usable warm session: cold start
+        start = time.time()
+        driver = self.create_driver()
+        try:
+            self.login(driver, dialer_url)
+        except BaseException:
+            self._quit(driver)
+            raise
+        self.cold_starts += 1
+        self._cold_start_seconds += time.time() - start
+        return driver
+
+    def _record_reuse(self, seconds):
+        self.reuses += 1
+        self._reuse_check_seconds += seconds
+
+    def release(self, dialer_url, user, driver, healthy=True):
+        """
+        Return a driver to the pool (closed instead if not healthy or the pool is full).
+        """
+        if not healthy:
+            self._quit(driver)
+            return
+        key = (dialer_url, user)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_key:
+                idle.append((driver, time.time()))
+                self._start_reaper()
+                return
+        self._quit(driver)
+
+    def _start_reaper(self):
+        # Called with the lock held
+        if self._reaper is None:
+            self._reaper = threading.Thread(target=self._reap, name="dialer-session-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap(self):
+        """Close expired idle sessions until the pool is empty."""
+        while True:
+            time.sleep(min(self.reap_interval, self.idle_timeout))
+            self._expire_idle()
+            with self._lock:
+                if not any(self._idle.values()):
+                    self._reaper = None
+                    return
+
+    def _expire_idle(self):
+        now = time.time()
+        expired = []
+        with self._lock:
+            for key, idle in self._idle.items():
+                expired.extend(d for d, last_used in idle if now - last_used > self.idle_timeout)
+                idle[:] = [(d, t) for d, t in idle if now - t <= self.idle_timeout]
+        for driver in expired:
+            self._quit(driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @property
+    def average_cold_start(self):
+        """Average seconds for a browser start + login."""
+        return self._cold_start_seconds / self.cold_starts if self.cold_starts else 0.0
+
+    @property
+    def time_saved(self):
+        """Estimated seconds saved by reusing sessions instead of cold starts."""
+        return max(self.reuses * self.average_cold_start - self._reuse_check_seconds, 0.0)
+
+    def stats(self):
+        """Get reuse counters and the estimated time saved."""
+        with self._lock:
+            idle = sum(len(v) for v in self._idle.values())
+        return {
+            'cold_starts': self.cold_starts,
+            'reuses': self.reuses,
+            'relogins': self.relogins,
+            'idle_sessions': idle,
+            'avg_cold_start_s': self.average_cold_start,
+            'time_saved_s': self.time_saved,
+        }
+
+    def close_all(self):
+        """Close every idle session."""
+        with self._lock:
+            drivers = [d for idle in self._idle.values() for d, _ in idle]
+            self._idle.clear()
+        for driver in drivers:
+            self._quit(driver)
@@ -7,6 +7,7 @@ load_dotenv()
 # ────────────── Base directories ──────────────
 BASE_DIR        = Path(__file__).parent
 RECORDINGS_DIR  = BASE_DIR / "Recordings"
+CACHE_DIR       = BASE_DIR / "Cache"
 
 # Ensure directories exist
 RECORDINGS_DIR.mkdir(parents=True, exist_ok=True)
@@ -26,6 +27,17 @@ READY_MODE_URLS = {
 # ────────────── Download directory alias ──────────────
 READYMODE_URL = READY_MODE_URLS["default"]
 
+# ────────────── ReadyMode dialer login ──────────────
+READYMODE_USER     = os.getenv("READYMODE_USER", "Auditor1")
+READYMODE_PASSWORD = os.getenv("READYMODE_PASSWORD", "Auditor1@3510")
+
+# ────────────── Recording download concurrency ──────────────
+# Max simultaneous recording downloads per dialer URL (shared by all audits)
+DOWNLOAD_CONCURRENCY = {
+    "default": 4,
+    # "https://resva.readymode.com/": 6,
+}
+
 # ────────────── Speech Recognition Configuration ──────────────
 # Accent adaptation settings
 ACCENT = os.getenv("ACCENT", "egyptian")  # Options: "standard", "egyptian"
@@ -106,6 +118,61 @@ class AppSettings:
         self.vad_energy_threshold = 600  # RMS energy threshold (default: 600, was 800)
         self.vad_min_speech_duration = 120  # Minimum speech duration in ms (default: 120, optimized to reduce noise)
         
+        # Early-exit VAD: stop scanning at the first qualifying speech segment.
+        # Releasing and Late Hello only depend on the first speech onset, so
+        # verdicts are identical; the debug report always runs full VAD.
+        self.vad_onset_only = True
+        
+        # Call quality metrics (sound level, tonality, network issue, cutting,
+        # silence red flag) from the thresholds above. They share the VAD's
+        # frame features, so VAD runs over the whole call: enabling them turns
+        # off the vad_onset_only early exit and costs a full-call VAD pass per file
+        self.call_metrics_enabled = False
+        
+        # Dual-channel analysis of stereo recordings: the customer (right) channel
+        # goes through the agent's frame pass for customer first speech, talk-over,
+        # dead air and who hung up. It needs full VAD on both channels, so stereo
+        # calls give up the vad_onset_only early exit and cost ~1.2x a full agent pass
+        self.dual_channel_enabled = False
+        
+        # Audio decoder backend
+        # 'ffmpeg' = decode the agent channel straight into NumPy (falls back to pydub on failure)
+        # 'pydub'  = decode via AudioSegment and split channels
+        self.audio_decoder = 'ffmpeg'
+        
+        # Analysis sample rate (Hz) applied while decoding; None = native rate.
+        # Telephony rate (8000) cuts samples, frame sizes and FFT lengths ~5x versus
+        # 44.1 kHz, but the VAD's absolute "rolloff < 4000 Hz" check then always
+        # passes (Nyquist is 4 kHz), so broadband noise can no longer veto frames.
+        # Keep native until test_sample_rate_validation.py passes on a real archive.
+        self.analysis_sample_rate = None
+        
+        # Batch executor backend: 'thread', 'process' or 'serial'
+        # 'process' runs one analysis per core, avoiding the GIL for CPU-bound VAD
+        self.batch_executor = 'thread'
+        
+        # Persistent result cache (Cache/results.sqlite3), keyed by file content
+        # hash + a fingerprint of these settings; re-audits skip decode and VAD
+        self.result_cache_enabled = True
+        self.result_cache_max_entries = 50000  # LRU bound on cached files
+        # Folder re-audits reuse stored verdicts for files whose path, size and
+        # mtime are unchanged (no read, no worker); only new/changed files are analyzed
+        self.incremental_audits = True
+        
+        # Agent/Campaign audits: analyze each recording as soon as it is downloaded
+        # (False = download everything first, then analyze the folder)
+        self.pipeline_downloads = True
+        
+        # Keep logged-in dialer browsers open between audits (re-login only when
+        # the session check fails); idle browsers close after the timeout (seconds,
+        # checked every minute in the background)
+        self.reuse_dialer_sessions = True
+        self.dialer_session_idle_timeout = 1800
+        
+        # Call-log backend for Agent/Campaign downloads: 'selenium' (Chrome) or
+        # 'http' (form posts + parallel page fetches, no browser)
+        self.call_log_backend = 'selenium'
+        
         # Sensitivity presets for easy adjustment
         # 'high' = detects faint/unclear speech (more false positives)
         # 'medium' = balanced detection (recommended)
@@ -124,6 +191,23 @@ class AppSettings:
                 setattr(self, key, value)
                 print(f"Updated setting: {key} = {value}")
     
+    def snapshot(self):
+        """
+        Get a picklable copy of all settings.
+        Used to hand the current settings to worker processes.
+        """
+        return dict(self.__dict__)
+    
+    def apply_snapshot(self, snapshot):
+        """
+        Restore settings from a snapshot() dict (silently, unlike update_from_ui).
+        
+        Args:
+            snapshot: Dict returned by snapshot()
+        """
+        for key, value in snapshot.items():
+            setattr(self, key, value)
+    
     def get_sound_thresholds(self):
         """Get sound level thresholds as tuple."""
         return self.sound_perfect, self.sound_good, self.sound_low
@@ -3,6 +3,11 @@ Core VOS Tool Components
 Unified, optimized modules for audio processing and call classification.
 """
 
-from .audio_processor import AudioProcessor, convert_to_dataframe_format, RESULT_KEYS
+from .audio_processor import (
+    AudioProcessor, convert_to_dataframe_format, to_dataframe_row, is_flagged, RESULT_KEYS
+)
+from .audio_decoder import PCMAudio, decode_agent_channel
+from .audio_probe import AudioInfo, probe_file
+from .result_cache import ResultCache
 
-__all__ = ['AudioProcessor', 'convert_to_dataframe_format', 'RESULT_KEYS']
+__all__ = ['AudioProcessor', 'convert_to_dataframe_format', 'to_dataframe_row', 'is_flagged', 'RESULT_KEYS', 'PCMAudio', 'decode_agent_channel', 'AudioInfo', 'probe_file', 'ResultCache']
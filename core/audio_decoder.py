@@ -0,0 +1,255 @@
+"""
+Direct FFmpeg Decoder
+Streams raw PCM from an ffmpeg subprocess pipe straight into a NumPy buffer.
+Only the left (agent) channel is decoded unless the customer channel is
+wanted too, so no AudioSegment, channel split or array-of-samples copies
+are needed before the detectors run.
+"""
+
+import math
+import re
+import struct
+import subprocess
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+from pydub import AudioSegment
+
+
+# Bytes read from the pipe per readinto() call
+READ_CHUNK_BYTES = 1 << 16
+
+# ffmpeg log bytes kept for parsing (the stream summary comes first); the
+# rest is still drained so a chatty decode cannot block on a full pipe
+MAX_LOG_BYTES = 1 << 16
+
+# Assumed MP3 bitrate (bytes/second) when sizing the initial sample buffer;
+# the buffer doubles if the real decode turns out longer
+NOMINAL_BYTES_PER_SECOND = 8000
+
+
+class PCMAudio:
+    """
+    16-bit PCM samples held in a NumPy array.
+
+    Implements the subset of the pydub AudioSegment interface used by the
+    detectors (channels, frame_rate, sample_width, len() in milliseconds,
+    get_array_of_samples(), dBFS), so it can be passed anywhere an agent
+    channel AudioSegment is accepted. Usually mono; stereo samples are
+    interleaved like AudioSegment's and select_channel() views one channel.
+    source_frame_rate records the file's original rate when it was
+    resampled for analysis.
+    """
+
+    sample_width = 2
+
+    def __init__(self, samples: np.ndarray, frame_rate: int, source_frame_rate: Optional[int] = None,
+                 channels: int = 1):
+        self.samples = samples
+        self.frame_rate = frame_rate
+        self.channels = channels
+        # Sample rate of the recording before any analysis-rate resampling
+        self.source_frame_rate = source_frame_rate or frame_rate
+
+    def __len__(self) -> int:
+        # Same rounding as AudioSegment.__len__
+        return round(1000 * (len(self.samples) / self.channels / self.frame_rate))
+
+    @property
+    def duration_seconds(self) -> float:
+        return len(self.samples) / self.channels / self.frame_rate if self.frame_rate else 0.0
+
+    @property
+    def dBFS(self) -> float:
+        if len(self.samples) == 0:
+            return -float("inf")
+        rms = int(np.sqrt(np.mean(self.samples.astype(np.float64) ** 2)))
+        if rms == 0:
+            return -float("inf")
+        return 20 * math.log10(rms / 32768.0)
+
+    def get_array_of_samples(self) -> np.ndarray:
+        return self.samples
+
+    def to_audio_segment(self) -> AudioSegment:
+        """Copy into a pydub AudioSegment (for pydub-only fallbacks)."""
+        return AudioSegment(
+            self.samples.astype("<i2").tobytes(),
+            frame_rate=self.frame_rate,
+            sample_width=self.sample_width,
+            channels=self.channels
+        )
+
+
+def select_channel(audio, channel: int = 0):
+    """
+    Select one channel of a decoded recording without copying its samples.
+
+    16-bit stereo AudioSegments and PCMAudio are wrapped as a strided NumPy
+    view (samples[channel::channels]) over the interleaved buffer, so no
+    de-interleaved copy of either channel is made. Mono audio is returned
+    unchanged; other sample widths fall back to pydub's split_to_mono().
+
+    Args:
+        audio: AudioSegment or PCMAudio
+        channel: Channel index (0 = left/agent, 1 = right/customer)
+
+    Returns:
+        Mono PCMAudio view (or the mono input / split AudioSegment)
+    """
+    if audio.channels == 1:
+        return audio
+    if isinstance(audio, PCMAudio):
+        return PCMAudio(audio.samples[channel::audio.channels], audio.frame_rate,
+                        source_frame_rate=audio.source_frame_rate)
+    if audio.sample_width != 2:
+        return audio.split_to_mono()[channel]
+    interleaved = np.frombuffer(audio.raw_data, dtype="<i2")
+    return PCMAudio(interleaved[channel::audio.channels], audio.frame_rate)
+
+
+def _read_exact(stream, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+def _read_wav_header(stream) -> Optional[Tuple[int, int, int]]:
+    """
+    Parse a streamed WAV header up to the start of the data chunk.
+
+    Returns:
+        (channels, frame_rate, bits_per_sample) or None if the header is invalid
+    """
+    riff = _read_exact(stream, 12)
+    if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+        return None
+
+    fmt = None
+    while True:
+        chunk_header = _read_exact(stream, 8)
+        if len(chunk_header) < 8:
+            return None
+        chunk_id, chunk_size = chunk_header[:4], struct.unpack("<I", chunk_header[4:])[0]
+        if chunk_id == b"data":
+            break
+        body = _read_exact(stream, chunk_size + (chunk_size & 1))
+        if chunk_id == b"fmt " and len(body) >= 16:
+            _, channels, frame_rate, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+            fmt = (channels, frame_rate, bits)
+    return fmt
+
+
+def _drain_log(stream, kept: list):
+    """Read a pipe to EOF, keeping its first MAX_LOG_BYTES (runs on a reader thread)."""
+    size = 0
+    for chunk in iter(lambda: stream.read(READ_CHUNK_BYTES), b""):
+        if size < MAX_LOG_BYTES:
+            kept.append(chunk[:MAX_LOG_BYTES - size])
+            size += len(kept[-1])
+
+
+def _parse_input_sample_rate(ffmpeg_log: str) -> Optional[int]:
+    """Read the input audio stream's sample rate from ffmpeg's stream summary."""
+    input_section = ffmpeg_log.split("Output #0", 1)[0]
+    match = re.search(r"Stream #0:\d+.*?: Audio: .*?, (\d+) Hz", input_section)
+    return int(match.group(1)) if match else None
+
+
+def decode_agent_channel(file_path: Path, sample_rate: Optional[int] = None,
+                         ffmpeg_path: Optional[str] = None, with_customer: bool = False) -> Optional[PCMAudio]:
+    """
+    Decode the agent (left) channel of a recording directly into NumPy.
+
+    Specification:
+    - Stereo: Left channel = Agent (selected inside ffmpeg with the pan filter),
+      Right channel = Customer
+    - Mono: Entire audio = Agent
+
+    Args:
+        file_path: Path to audio file (any format ffmpeg can read)
+        sample_rate: Resample to this rate inside ffmpeg (None = keep the file's rate)
+        ffmpeg_path: ffmpeg executable (default: the converter pydub is configured with)
+        with_customer: Keep the customer channel too: stereo recordings decode
+            into one interleaved 2-channel PCMAudio (mono ones stay mono)
+
+    Returns:
+        PCMAudio with int16 samples, or None if decoding fails
+    """
+    file_path = Path(file_path)
+    ffmpeg_path = ffmpeg_path or AudioSegment.converter
+    # "info" level (without progress stats) prints the input stream summary,
+    # which carries the source sample rate when resampling
+    command = [
+        ffmpeg_path, "-nostdin", "-hide_banner", "-nostats",
+        "-v", "info" if sample_rate else "error",
+        "-i", str(file_path),
+        "-vn", "-map_metadata", "-1",
+    ]
+    if not with_customer:
+        command += ["-af", "pan=mono|c0=c0"]
+    if sample_rate:
+        command += ["-ar", str(int(sample_rate))]
+    command += ["-acodec", "pcm_s16le", "-f", "wav", "-"]
+
+    try:
+        process = subprocess.Popen(command, stdin=subprocess.DEVNULL,
+                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except OSError:
+        return None
+
+    # Drain stderr alongside stdout: ffmpeg blocks once a full pipe of log
+    # output (e.g. errors on a corrupt MP3) goes unread
+    log_chunks = []
+    log_reader = threading.Thread(target=_drain_log, args=(process.stderr, log_chunks), daemon=True)
+    log_reader.start()
+
+    try:
+        header = _read_wav_header(process.stdout)
+        if header is None or header[0] not in ((1, 2) if with_customer else (1,)) or header[2] != 16:
+            return None  # Recordings with more channels go through the pydub path
+        channels, frame_rate = header[0], header[1]
+
+        # Preallocate for the expected duration and read PCM straight into it
+        try:
+            file_size = file_path.stat().st_size
+        except OSError:
+            file_size = 0
+        capacity = (int(file_size / NOMINAL_BYTES_PER_SECOND * frame_rate) + frame_rate) * channels
+        buffer = np.empty(capacity, dtype="<i2")
+        view = memoryview(buffer).cast("B")
+        filled = 0
+
+        while True:
+            if filled == len(view):
+                # Longer than expected: double the buffer
+                buffer = np.concatenate([buffer, np.empty(len(buffer), dtype="<i2")])
+                view = memoryview(buffer).cast("B")
+            read = process.stdout.readinto(view[filled:filled + READ_CHUNK_BYTES])
+            if not read:
+                break
+            filled += read
+
+        process.wait()
+        log_reader.join()
+        ffmpeg_log = b"".join(log_chunks).decode("utf-8", errors="replace")
+        if process.returncode != 0 or filled < 2:
+            return None
+
+        source_frame_rate = _parse_input_sample_rate(ffmpeg_log) if sample_rate else None
+        n_samples = filled // 2 // channels * channels
+        return PCMAudio(buffer[:n_samples], frame_rate, source_frame_rate=source_frame_rate, channels=channels)
+
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        log_reader.join()
+        process.stdout.close()
+        process.stderr.close()
@@ -0,0 +1,284 @@
+"""
+Header-Only Audio Probe
+Identifies a file's container from its magic bytes (ID3/MPEG sync, RIFF,
+ftyp) and reads duration, channels and sample rate from MP3 frame headers
+(with Xing/Info/VBRI frame counts for VBR files) and WAV headers without
+decoding any audio, so metadata-only checks never start ffmpeg.
+"""
+
+import struct
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+
+
+# Bitrates (kbps) by (MPEG-1?, layer) and the header's bitrate index
+_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+# Sample rates by the header's version bits (0 = MPEG-2.5, 2 = MPEG-2, 3 = MPEG-1)
+_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    0: (11025, 12000, 8000),
+}
+
+# How far past the ID3 tag to search for the first frame sync in a bare stream
+# (files with an ID3 tag are known MP3s: their whole probe window is searched)
+MAX_SYNC_SEARCH_BYTES = 1 << 14
+
+# Consecutive frames that must follow a sync before it is trusted
+SYNC_CONFIRM_FRAMES = 2
+
+# Bytes read from the start of a file (or past its ID3 tag) when probing
+PROBE_BYTES = 1 << 16
+
+
+class AudioInfo(NamedTuple):
+    """Metadata read from a file header."""
+    format: str
+    duration: float  # Seconds
+    channels: int
+    sample_rate: int
+
+
+class _FrameHeader(NamedTuple):
+    mpeg1: bool
+    layer: int
+    bitrate: int  # kbps
+    sample_rate: int
+    channels: int
+    samples_per_frame: int
+    length: int  # Bytes, including the 4-byte header
+
+
+def _parse_frame_header(data: bytes, offset: int) -> Optional[_FrameHeader]:
+    """Parse the 4-byte MPEG audio frame header at offset (None if not a valid header)."""
+    if offset + 4 > len(data) or data[offset] != 0xFF or data[offset + 1] & 0xE0 != 0xE0:
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    version = (b1 >> 3) & 3
+    layer = 4 - ((b1 >> 1) & 3)
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 3
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    bitrate = _BITRATES[(mpeg1, layer)][bitrate_index]
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 1
+    if layer == 1:
+        samples_per_frame = 384
+        length = (12 * bitrate * 1000 // sample_rate + padding) * 4
+    else:
+        samples_per_frame = 1152 if (layer == 2 or mpeg1) else 576
+        length = samples_per_frame // 8 * bitrate * 1000 // sample_rate + padding
+    channels = 1 if b3 >> 6 == 3 else 2
+    return _FrameHeader(mpeg1, layer, bitrate, sample_rate, channels, samples_per_frame, length)
+
+
+def _id3v2_size(data: bytes) -> int:
+    """Bytes taken by a leading ID3v2 tag (0 if there is none)."""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _vbr_frame_count(data: bytes, offset: int, header: _FrameHeader) -> Optional[int]:
+    """Frame count from a Xing/Info or VBRI header in the first frame, if present."""
+    # Xing/Info follows the side information
+    if header.mpeg1:
+        side_info = 17 if header.channels == 1 else 32
+    else:
+        side_info = 9 if header.channels == 1 else 17
+    xing = offset + 4 + side_info
+    if data[xing:xing + 4] in (b"Xing", b"Info") and len(data) >= xing + 12:
+        flags = struct.unpack(">I", data[xing + 4:xing + 8])[0]
+        if flags & 1:
+            return struct.unpack(">I", data[xing + 8:xing + 12])[0]
+
+    # VBRI (Fraunhofer) sits at a fixed 32 bytes after the header
+    vbri = offset + 36
+    if data[vbri:vbri + 4] == b"VBRI" and len(data) >= vbri + 18:
+        return struct.unpack(">I", data[vbri + 14:vbri + 18])[0]
+    return None
+
+
+def _find_first_frame(head: bytes, search_bytes: int = MAX_SYNC_SEARCH_BYTES) -> Optional[Tuple[int, _FrameHeader]]:
+    """Locate the first MPEG audio frame within search_bytes after any ID3v2 tag."""
+    start = _id3v2_size(head)
+    search_end = min(len(head) - 4, start + search_bytes)
+    for offset in range(start, search_end + 1):
+        header = _parse_frame_header(head, offset)
+        if header is None:
+            continue
+        # Guard against a false sync: the next frames must follow (the data may
+        # end exactly after a frame, but not inside one)
+        following, chained = offset + header.length, 0
+        while chained < SYNC_CONFIRM_FRAMES and following + 4 <= len(head):
+            next_header = _parse_frame_header(head, following)
+            if next_header is None:
+                break
+            following += next_header.length
+            chained += 1
+        else:
+            if chained or following == len(head):
+                return offset, header
+    return None
+
+
+def probe_mp3(head: bytes, total_size: Optional[int] = None,
+              search_bytes: int = MAX_SYNC_SEARCH_BYTES) -> Optional[AudioInfo]:
+    """
+    Read an MP3's duration from its first bytes.
+
+    Uses the Xing/Info/VBRI frame count when the file has one; otherwise the
+    first frame's bitrate is applied to the file size (exact for the
+    constant-bitrate recordings dialers produce).
+
+    Args:
+        head: The first bytes of the file (64 KiB is plenty unless the ID3 tag is large)
+        total_size: Full file size in bytes (e.g. Content-Length); needed without a VBR header
+        search_bytes: How far past the ID3 tag (padding) the first frame may start
+
+    Returns:
+        AudioInfo, or None if no valid frame is found in head or the
+        duration cannot be determined
+    """
+    found = _find_first_frame(head, search_bytes)
+    if found is None:
+        return None
+    offset, header = found
+    frames = _vbr_frame_count(head, offset, header)
+    if frames:
+        duration = frames * header.samples_per_frame / header.sample_rate
+    elif total_size:
+        duration = (total_size - offset) * 8 / (header.bitrate * 1000)
+    else:
+        return None
+    return AudioInfo("mp3", duration, header.channels, header.sample_rate)
+
+
+def probe_wav(head: bytes, total_size: Optional[int] = None) -> Optional[AudioInfo]:
+    """
+    Read a WAV file's duration from its RIFF header.
+
+    Args:
+        head: The first bytes of the file (must reach the data chunk header)
+        total_size: Full file size, used when the data chunk size is unset (streamed WAVs)
+
+    Returns:
+        AudioInfo, or None if the header is invalid or incomplete
+    """
+    if len(head) < 12 or head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+        return None
+
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(head):
+        chunk_id = head[offset:offset + 4]
+        chunk_size = struct.unpack("<I", head[offset + 4:offset + 8])[0]
+        body = offset + 8
+        if chunk_id == b"fmt " and body + 16 <= len(head):
+            _, channels, sample_rate, byte_rate, _, _ = struct.unpack("<HHIIHH", head[body:body + 16])
+            fmt = (channels, sample_rate, byte_rate)
+        elif chunk_id == b"data":
+            if fmt is None or not fmt[1] or not fmt[2]:
+                return None
+            channels, sample_rate, byte_rate = fmt
+            if chunk_size in (0, 0xFFFFFFFF) and total_size:
+                chunk_size = total_size - body
+            elif total_size:
+                chunk_size = min(chunk_size, total_size - body)  # Truncated file
+            return AudioInfo("wav", chunk_size / byte_rate, channels, sample_rate)
+        offset = body + chunk_size + (chunk_size & 1)
+    return None
+
+
+def sniff_format(head: bytes) -> Optional[str]:
+    """
+    Identify an audio container from its first bytes.
+
+    Returns:
+        'mp3', 'wav' or 'mp4' (MP4/M4A), or None if the bytes match none of them
+    """
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head[4:8] == b"ftyp":
+        return "mp4"
+    if head[:3] == b"ID3":
+        return "mp3"
+    # Bare MPEG stream, possibly after a few bytes of padding
+    if _find_first_frame(head) is not None:
+        return "mp3"
+    return None
+
+
+def probe_bytes(head: bytes, total_size: Optional[int] = None) -> Optional[AudioInfo]:
+    """
+    Probe WAV or MP3 metadata from the first bytes of a file.
+
+    Returns:
+        AudioInfo, or None if the headers give no duration
+    """
+    audio_format = sniff_format(head)
+    if audio_format == "wav":
+        return probe_wav(head, total_size)
+    if audio_format == "mp3":
+        return probe_mp3(head, total_size)
+    return None
+
+
+def inspect_file(file_path: Path) -> Tuple[Optional[str], Optional[AudioInfo]]:
+    """
+    Sniff a file's format and probe its headers (reads at most two small
+    blocks; nothing is decoded). Frames may follow an ID3 tag after up to
+    PROBE_BYTES of padding.
+
+    Returns:
+        (format from sniff_format() or None, AudioInfo or None). A WAV/MP3
+        format with no AudioInfo means the headers are corrupt, truncated or
+        beyond what the probe reads (the decoder has the final say).
+    """
+    try:
+        with open(file_path, "rb") as f:
+            total_size = f.seek(0, 2)
+            f.seek(0)
+            head = f.read(PROBE_BYTES)
+            audio_format = sniff_format(head)
+            if audio_format not in ("mp3", "wav"):
+                return audio_format, None
+            if audio_format == "wav":
+                return audio_format, probe_wav(head, total_size)
+
+            tag_size = _id3v2_size(head)
+            search_bytes = PROBE_BYTES if tag_size else MAX_SYNC_SEARCH_BYTES
+            info = probe_mp3(head, total_size, search_bytes) if tag_size + 4 <= len(head) else None
+            if info is None and tag_size and total_size > len(head):
+                # The ID3 tag (e.g. cover art) or its padding runs to the end of the
+                # block, so the first frames are cut off: read the frames after it
+                f.seek(tag_size)
+                info = probe_mp3(f.read(PROBE_BYTES), total_size - tag_size, search_bytes)
+            return audio_format, info
+    except OSError:
+        return None, None
+
+
+def probe_file(file_path: Path) -> Optional[AudioInfo]:
+    """
+    Probe a WAV or MP3 file's duration, channels and sample rate from its headers.
+
+    Returns:
+        AudioInfo, or None if the file is unreadable or not a recognised WAV/MP3
+    """
+    return inspect_file(file_path)[1]
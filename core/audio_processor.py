@@ -10,7 +10,16 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import numpy as np
 from pydub import AudioSegment
-from analyzer.intro_detection import releasing_detection, late_hello_detection, debug_audio_analysis
+from config import app_settings
+from core.audio_decoder import PCMAudio, decode_agent_channel, select_channel
+from core.audio_probe import inspect_file
+from core.result_cache import ResultCache
+from analyzer.intro_detection import (
+    SpeechTimeline, debug_audio_analysis
+)
+from analyzer.detector_registry import AnalysisContext
+from analyzer.call_metrics import METRIC_FIELDS
+from analyzer.conversation_metrics import CONVERSATION_FIELDS
 
 
 def format_agent_name_with_spaces(agent_name: str) -> str:
@@ -37,69 +46,124 @@ def format_agent_name_with_spaces(agent_name: str) -> str:
     return spaced_name
 
 
+# Reason codes for files that could not be analyzed (result 'error_code')
+ERROR_FILE_MISSING = 'file_missing'
+ERROR_FILE_TOO_SMALL = 'file_too_small'
+ERROR_UNSUPPORTED_EXTENSION = 'unsupported_extension'
+ERROR_UNRECOGNIZED_FORMAT = 'unrecognized_format'  # Magic bytes match no audio container and decode failed
+ERROR_CORRUPT_HEADER = 'corrupt_header'  # WAV/MP3 signature, headers unreadable and decode failed
+ERROR_AUDIO_TOO_SHORT = 'audio_too_short'
+ERROR_DECODE_FAILED = 'decode_failed'
+ERROR_CLASSIFICATION_FAILED = 'classification_failed'
+ERROR_PROCESSING = 'processing_error'  # Unexpected exception while processing
+
+# ' (2)'-style copy number after the phone (repeat calls to one number, browser re-downloads)
+DUPLICATE_SUFFIX = re.compile(r" \(\d+\)$")
+
+
 class AudioProcessor:
     """
     Unified audio processor for VOS Tool.
     Handles file loading, channel separation, and call classification.
     """
     
-    def __init__(self):
+    def __init__(self, result_cache: Optional[ResultCache] = None):
         self.supported_formats = ['.mp3', '.wav', '.m4a', '.mp4']
+        # Optional persistent cache consulted before decoding
+        self.result_cache = result_cache
         
-    def is_valid_audio_file(self, file_path: Path) -> bool:
+    def validate_audio_file(self, file_path: Path, file_stat=None) -> Optional[str]:
         """
         Validate audio file before processing.
         
         Args:
             file_path: Path to audio file
+            file_stat: Stat data captured when the file was found (e.g. a
+                ScannedFile); skips the exists/is_file/stat syscalls
             
         Returns:
-            True if file is valid for processing
+            None if the file is valid for processing, else an ERROR_* reason code
         """
         try:
-            # Check if file exists and is readable
-            if not file_path.exists() or not file_path.is_file():
-                return False
+            if file_stat is None:
+                # Check if file exists and is readable
+                if not file_path.exists() or not file_path.is_file():
+                    return ERROR_FILE_MISSING
+                file_stat = file_path.stat()
             
             # Check file size (should be > 1KB for valid audio)
-            file_size = file_path.stat().st_size
+            file_size = file_stat.st_size
             if file_size < 1024:
-                return False
+                return ERROR_FILE_TOO_SMALL
             
             # Check file extension
             if file_path.suffix.lower() not in self.supported_formats:
-                return False
+                return ERROR_UNSUPPORTED_EXTENSION
             
-            return True
+            return None
             
         except Exception:
-            return False
+            return ERROR_FILE_MISSING
     
-    def load_audio_file(self, file_path: Path) -> Optional[AudioSegment]:
+    def is_valid_audio_file(self, file_path: Path) -> bool:
         """
-        Load audio file with format fallback support.
+        Validate audio file before processing.
         
         Args:
             file_path: Path to audio file
             
         Returns:
-            AudioSegment or None if loading fails
+            True if file is valid for processing
         """
-        try:
-            # Try loading as MP3 first (most common)
-            return AudioSegment.from_mp3(file_path)
+        return self.validate_audio_file(file_path) is None
+    
+    def load_audio_file(self, file_path: Path, audio_format: Optional[str] = None) -> Optional[AudioSegment]:
+        """
+        Load audio file, picking the decoder from its content.
+        
+        The format is sniffed from the file's magic bytes (ID3/MPEG sync,
+        RIFF, ftyp), so ffmpeg runs once with the right demuxer whatever
+        the extension says. Content the sniffer does not know (ADTS/AAC,
+        OGG, MP3 behind a long run of junk) is left to ffmpeg's own probe.
+        
+        Args:
+            file_path: Path to audio file
+            audio_format: Format already sniffed by the caller ('mp3', 'wav', 'mp4')
             
+        Returns:
+            AudioSegment or None if decoding fails
+        """
+        if audio_format is None:
+            audio_format, _ = inspect_file(file_path)
+        try:
+            return AudioSegment.from_file(str(file_path), format=audio_format)
         except Exception:
-            # Fallback: try different formats
-            for format_name in ['wav', 'mp4', 'm4a']:
-                try:
-                    return AudioSegment.from_file(str(file_path), format=format_name)
-                except:
-                    continue
+            return None
+    
+    def decode_agent_audio(self, file_path: Path) -> Optional[PCMAudio]:
+        """
+        Decode the agent channel straight from ffmpeg into NumPy.
+        
+        Skips the AudioSegment decode, channel split and sample-array copies
+        of the pydub path, and resamples to AppSettings.analysis_sample_rate
+        while decoding. With dual_channel_enabled the customer channel is
+        kept too (one interleaved stereo buffer). Returns None if ffmpeg is
+        unavailable or fails, in which case callers fall back to
+        load_audio_file() (native rate).
+        
+        Args:
+            file_path: Path to audio file
             
+        Returns:
+            PCMAudio (agent channel, or stereo call) or None if decoding fails
+        """
+        try:
+            return decode_agent_channel(file_path, sample_rate=app_settings.analysis_sample_rate,
+                                        with_customer=app_settings.dual_channel_enabled)
+        except Exception:
             return None
     
-    def extract_agent_audio(self, audio: AudioSegment) -> AudioSegment:
+    def extract_agent_audio(self, audio: AudioSegment):
         """
         Extract agent audio channel from recording.
         
@@ -107,40 +171,56 @@ class AudioProcessor:
         - Stereo: Left channel = Agent, Right channel = Customer
         - Mono: Entire audio = Agent
         
+        The left channel is a strided view over the decoded buffer (see
+        select_channel()); the result is mono, so later per-detector channel
+        extraction is a no-op.
+        
         Args:
             audio: Full audio segment
             
         Returns:
             Agent audio channel only
         """
-        if audio.channels == 2:
-            # Split stereo and return left channel (agent)
-            return audio.split_to_mono()[0]
-        else:
-            # Mono audio - assume it's agent channel
-            return audio
+        return select_channel(audio, 0)
     
-    def classify_call(self, agent_audio: AudioSegment, file_name: str = "Unknown") -> Dict:
+    def classify_call(self, agent_audio: AudioSegment, file_name: str = "Unknown",
+                      timeline: Optional[SpeechTimeline] = None) -> Dict:
         """
         Classify call using deterministic rules.
         
+        The enabled detectors (see analyzer.detector_registry) run on one
+        AnalysisContext: Voice Activity Detection and every other shared
+        feature is computed once per call, and only for the detectors that
+        need it.
+        
         Args:
-            agent_audio: Agent audio channel only
+            agent_audio: Agent audio channel, or the stereo call (the
+                customer channel feeds the dual-channel detectors)
             file_name: File name for debugging
+            timeline: Optional precomputed SpeechTimeline for this call
             
         Returns:
-            Classification results with standardized keys
+            Classification results with standardized keys, plus the
+            'speech_timeline' used (None if classification failed),
+            'call_metrics' (other detectors' result fields; None when none
+            ran) and 'feature_timings' (seconds per feature and detector)
         """
         try:
-            # Apply detection functions
-            releasing_result = releasing_detection(agent_audio)
-            late_hello_result = late_hello_detection(agent_audio)
+            context = AnalysisContext(agent_audio, timeline=timeline)
+            results, _ = context.run()
             
+            call_metrics = {
+                field: value for field, value in results.items()
+                if field not in ('releasing_detection', 'late_hello_detection')
+            }
             return {
-                "releasing_detection": releasing_result,
-                "late_hello_detection": late_hello_result,
+                "releasing_detection": results['releasing_detection'],
+                "late_hello_detection": results['late_hello_detection'],
                 "classification_success": True,
-                "error": None
+                "error": None,
+                "speech_timeline": context['speech_timeline'],
+                "call_metrics": call_metrics or None,
+                "feature_timings": context.timings
             }
             
         except Exception as e:
@@ -148,24 +228,24 @@ class AudioProcessor:
                 "releasing_detection": "Error",
                 "late_hello_detection": "Error", 
                 "classification_success": False,
-                "error": str(e)
+                "error": str(e),
+                "speech_timeline": None,
+                "call_metrics": None,
+                "feature_timings": {}
             }
     
-    def process_single_file(self, file_path: Path, include_debug: bool = False) -> Dict:
+    def names_from_path(self, file_path: Path) -> Tuple[str, str]:
         """
-        Process a single audio file end-to-end.
+        Extract agent name and phone number from an '<Agent>_<phone>' file name
+        (a trailing ' (2)' copy number is not part of the phone).
         
         Args:
             file_path: Path to audio file
-            include_debug: Whether to include detailed debug information
             
         Returns:
-            Complete processing results
+            (agent name with spaces, phone number)
         """
-        start_time = time.time()
-        
-        # Extract metadata from filename
-        stem = file_path.stem
+        stem = DUPLICATE_SUFFIX.sub("", file_path.stem)
         if "_" in stem:
             parts = stem.split("_", 1)
             if len(parts) == 2:
@@ -179,49 +259,130 @@ class AudioProcessor:
         agent_name_raw = agent_name_raw.replace("-", "").replace(".", "")
         
         # Format agent name with proper spacing (converts 'JohnSmith' to 'John Smith')
-        agent_name = format_agent_name_with_spaces(agent_name_raw)
+        return format_agent_name_with_spaces(agent_name_raw), phone_number
+    
+    def lookup_unchanged(self, file_paths: List[Path], stats: Optional[Dict] = None) -> Dict[Path, Dict]:
+        """
+        Get stored results for files unchanged since they were last analyzed.
         
-        # Validate file
-        if not self.is_valid_audio_file(file_path):
-            return {
-                'agent_name': agent_name,
-                'phone_number': phone_number,
-                'file_path': str(file_path),
-                'error': f"Invalid audio file: {file_path}",
-                'processing_time': time.time() - start_time,
-                'classification_success': False
-            }
+        Uses the cache's file index (path, size, mtime), so the files are not
+        read or hashed. Used by incremental folder audits.
         
-        # Load audio
-        audio = self.load_audio_file(file_path)
-        if audio is None:
+        Args:
+            file_paths: Paths to audio files
+            stats: Optional path -> stat data already captured by a scan
+            
+        Returns:
+            Dict of path -> result dict (with 'cache_hit' and 'unchanged' set)
+            for reusable files; empty if there is no cache
+        """
+        if self.result_cache is None:
+            return {}
+        start_time = time.time()
+        results = {}
+        for file_path, cached in self.result_cache.get_unchanged(file_paths, stats).items():
+            agent_name, phone_number = self.names_from_path(file_path)
+            results[file_path] = self._cached_result(agent_name, phone_number, file_path, cached, start_time)
+            results[file_path]['unchanged'] = True
+        return results
+    
+    @staticmethod
+    def _cached_result(agent_name: str, phone_number: str, file_path: Path,
+                       cached: Dict, start_time: float) -> Dict:
+        return {
+            'agent_name': agent_name,
+            'phone_number': phone_number,
+            'file_path': str(file_path),
+            **cached,
+            'cached_processing_time': cached.get('processing_time'),
+            'processing_time': time.time() - start_time,
+            'cache_hit': True
+        }
+    
+    def process_single_file(self, file_path: Path, include_debug: bool = False, file_stat=None) -> Dict:
+        """
+        Process a single audio file end-to-end.
+        
+        Args:
+            file_path: Path to audio file
+            include_debug: Whether to include detailed debug information
+            file_stat: Stat data captured when the file was found (optional)
+            
+        Returns:
+            Complete processing results
+        """
+        start_time = time.time()
+        agent_name, phone_number = self.names_from_path(file_path)
+        
+        def failure(error: str, error_code: str) -> Dict:
             return {
                 'agent_name': agent_name,
                 'phone_number': phone_number,
                 'file_path': str(file_path),
-                'error': f"Failed to load audio: {file_path}",
+                'error': error,
+                'error_code': error_code,
                 'processing_time': time.time() - start_time,
                 'classification_success': False
             }
         
-        # Extract agent channel
-        agent_audio = self.extract_agent_audio(audio)
+        # Validate file
+        error_code = self.validate_audio_file(file_path, file_stat)
+        if error_code is not None:
+            return failure(f"Invalid audio file: {file_path}", error_code)
+        
+        # Reuse the cached result for identical content and settings
+        content_hash = None
+        if self.result_cache is not None and not include_debug:
+            try:
+                content_hash = self.result_cache.content_hash(file_path, file_stat)
+                cached = self.result_cache.get(content_hash)
+            except OSError:
+                cached = None
+            if cached is not None:
+                return self._cached_result(agent_name, phone_number, file_path, cached, start_time)
+        
+        # Sniff the container and read its headers; reject too-short files before any decode
+        audio_format, info = inspect_file(file_path)
+        # Unrecognized content and headers the probe cannot read are only
+        # rejected if the decoder fails on them too
+        unreadable_header = info is None and audio_format in ('mp3', 'wav')
+        if info is not None and info.duration < 1.0:
+            return failure(f"Audio too short: {round(info.duration * 1000)}ms", ERROR_AUDIO_TOO_SHORT)
         
-        # Validate audio length
+        # Decode agent channel directly, falling back to pydub
+        agent_audio = None
+        if app_settings.audio_decoder == 'ffmpeg':
+            agent_audio = self.decode_agent_audio(file_path)
+        
+        if agent_audio is None:
+            # Load audio
+            audio = self.load_audio_file(file_path, audio_format)
+            if audio is None:
+                if audio_format is None:
+                    return failure(f"Unrecognized audio format: {file_path}", ERROR_UNRECOGNIZED_FORMAT)
+                if unreadable_header:
+                    return failure(f"Corrupt {audio_format.upper()} header: {file_path}", ERROR_CORRUPT_HEADER)
+                return failure(f"Failed to load audio: {file_path}", ERROR_DECODE_FAILED)
+            
+            # Extract agent channel (dual-channel analysis keeps the customer side too)
+            agent_audio = audio if app_settings.dual_channel_enabled else self.extract_agent_audio(audio)
+        
+        # Validate audio length (formats the header probe does not cover)
         if len(agent_audio) < 1000:  # Less than 1 second
-            return {
-                'agent_name': agent_name,
-                'phone_number': phone_number,
-                'file_path': str(file_path),
-                'error': f"Audio too short: {len(agent_audio)}ms",
-                'processing_time': time.time() - start_time,
-                'classification_success': False
-            }
+            return failure(f"Audio too short: {len(agent_audio)}ms", ERROR_AUDIO_TOO_SHORT)
+        
+        # Debug report needs every speech segment, so run full VAD up front
+        timeline = None
+        if include_debug:
+            timeline = SpeechTimeline.from_audio(
+                agent_audio, with_features=app_settings.call_metrics_enabled or app_settings.dual_channel_enabled
+            )
         
         # Classify call
-        classification = self.classify_call(agent_audio, file_name=file_path.name)
+        classification = self.classify_call(agent_audio, file_name=file_path.name, timeline=timeline)
         
         # Build result
+        timeline = classification['speech_timeline']
         result = {
             'agent_name': agent_name,
             'phone_number': phone_number,
@@ -229,17 +390,29 @@ class AudioProcessor:
             'processing_time': time.time() - start_time,
             'classification_success': classification['classification_success'],
             'releasing_detection': classification['releasing_detection'],
-            'late_hello_detection': classification['late_hello_detection']
+            'late_hello_detection': classification['late_hello_detection'],
+            'speech_segments': [
+                [float(start), float(end)] for start, end in timeline.speech_segments
+            ] if timeline is not None else []
         }
+        result.update(classification['call_metrics'] or {})
         
         if classification['error']:
             result['error'] = classification['error']
+            result['error_code'] = ERROR_CLASSIFICATION_FAILED
+        
+        if content_hash is not None:
+            result['cache_hit'] = False
+            self.result_cache.put(content_hash, result)
         
         # Add debug information if requested
         if include_debug:
             try:
-                debug_info = debug_audio_analysis(agent_audio, file_path.name)
+                debug_info = debug_audio_analysis(
+                    agent_audio, file_path.name, timeline=classification['speech_timeline']
+                )
                 result['debug_info'] = debug_info
+                result['feature_timings'] = classification['feature_timings']
             except Exception as e:
                 result['debug_error'] = str(e)
         
@@ -269,10 +442,82 @@ RESULT_KEYS = {
     "AGENT_NAME": "Agent Name",
     "PHONE_NUMBER": "Phone Number", 
     "RELEASING": "Releasing Detection - Agent never speaks?",
-    "LATE_HELLO": "Late Hello Detection - Agent speaks after X seconds?"
+    "LATE_HELLO": "Late Hello Detection - Agent speaks after X seconds?",
+    "SOUND_LEVEL": "Sound Level",
+    "TONALITY": "Tonality",
+    "NETWORK_ISSUE": "Network Issue",
+    "CUTTING": "Cutting",
+    "SILENCE_RED_FLAG": "Silence Red Flag - Dead air on agent line?",
+    "CUSTOMER_ONSET": "Customer First Speech (s)",
+    "TALK_OVER": "Talk-Over Ratio",
+    "DEAD_AIR": "Dead Air (s)",
+    "HUNG_UP_BY": "Hung Up By"
 }
 
 
+def is_flagged(result: Dict) -> bool:
+    """
+    Check whether a processing result has a detected issue.
+    
+    Args:
+        result: Processing result from AudioProcessor.process_single_file
+        
+    Returns:
+        True if classification succeeded and Releasing or Late Hello is "Yes"
+    """
+    # Files with errors are never flagged
+    if not result.get('classification_success', False):
+        return False
+    
+    # Check if any detection is flagged
+    releasing_flagged = result.get('releasing_detection') == "Yes"
+    late_hello_flagged = result.get('late_hello_detection') == "Yes"
+    return releasing_flagged or late_hello_flagged
+
+
+def _seconds(ms) -> object:
+    """Milliseconds as seconds for a result column ('' when missing)."""
+    return round(ms / 1000.0, 2) if ms is not None else ''
+
+
+def to_dataframe_row(result: Dict) -> Dict:
+    """
+    Convert one processing result to a standardized DataFrame row.
+    
+    Call quality and conversation columns are only included when their
+    setting (call_metrics_enabled / dual_channel_enabled) is on or the result
+    carries those fields, so exports have no always-empty columns.
+    
+    Args:
+        result: Processing result
+        
+    Returns:
+        Dictionary keyed by RESULT_KEYS display names
+    """
+    row = {
+        RESULT_KEYS["AGENT_NAME"]: result.get('agent_name', ''),
+        RESULT_KEYS["PHONE_NUMBER"]: result.get('phone_number', ''),
+        RESULT_KEYS["RELEASING"]: result.get('releasing_detection', 'No'),
+        RESULT_KEYS["LATE_HELLO"]: result.get('late_hello_detection', 'No'),
+    }
+    if app_settings.call_metrics_enabled or any(field in result for field in METRIC_FIELDS):
+        row.update({
+            RESULT_KEYS["SOUND_LEVEL"]: result.get('sound_level', ''),
+            RESULT_KEYS["TONALITY"]: result.get('tonality', ''),
+            RESULT_KEYS["NETWORK_ISSUE"]: result.get('network_issue', ''),
+            RESULT_KEYS["CUTTING"]: result.get('cutting', ''),
+            RESULT_KEYS["SILENCE_RED_FLAG"]: result.get('silence_red_flag', ''),
+        })
+    if app_settings.dual_channel_enabled or any(field in result for field in CONVERSATION_FIELDS):
+        row.update({
+            RESULT_KEYS["CUSTOMER_ONSET"]: _seconds(result.get('customer_onset_ms')),
+            RESULT_KEYS["TALK_OVER"]: result.get('talk_over_ratio', ''),
+            RESULT_KEYS["DEAD_AIR"]: _seconds(result.get('dead_air_ms')),
+            RESULT_KEYS["HUNG_UP_BY"]: result.get('hung_up_by', '')
+        })
+    return row
+
+
 def convert_to_dataframe_format(results: List[Dict]) -> List[Dict]:
     """
     Convert processing results to standardized DataFrame format.
@@ -284,24 +529,4 @@ def convert_to_dataframe_format(results: List[Dict]) -> List[Dict]:
     Returns:
         List of dictionaries ready for DataFrame conversion
     """
-    flagged_calls = []
-    
-    for result in results:
-        # Skip files with errors
-        if not result.get('classification_success', False):
-            continue
-        
-        # Check if any detection is flagged
-        releasing_flagged = result.get('releasing_detection') == "Yes"
-        late_hello_flagged = result.get('late_hello_detection') == "Yes"
-        
-        # Only include flagged calls
-        if releasing_flagged or late_hello_flagged:
-            flagged_calls.append({
-                RESULT_KEYS["AGENT_NAME"]: result.get('agent_name', ''),
-                RESULT_KEYS["PHONE_NUMBER"]: result.get('phone_number', ''),
-                RESULT_KEYS["RELEASING"]: result.get('releasing_detection', 'No'),
-                RESULT_KEYS["LATE_HELLO"]: result.get('late_hello_detection', 'No')
-            })
-    
-    return flagged_calls
+    return [to_dataframe_row(result) for result in results if is_flagged(result)]
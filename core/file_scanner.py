@@ -0,0 +1,166 @@
+"""
+Recording Scanner
+Single-pass os.scandir walker that classifies audio files by extension and
+captures their stat data once, plus an optional cached directory index of
+the Recordings archive for locating an audit's folder without a full rescan.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from config import CACHE_DIR
+
+# Extensions the analyzer accepts (matched case-insensitively)
+AUDIO_EXTENSIONS = frozenset({'.mp3', '.wav', '.m4a', '.mp4'})
+
+# Default location of the cached Recordings directory index
+DEFAULT_INDEX_PATH = CACHE_DIR / "recordings_index.json"
+
+
+class ScannedFile(NamedTuple):
+    """
+    An audio file found by the scanner, with the stat data read during the
+    walk (st_size/st_mtime_ns, so it can stand in for an os.stat() result).
+    """
+    path: Path
+    st_size: int
+    st_mtime_ns: int
+
+
+def is_audio_name(name: str, extensions=AUDIO_EXTENSIONS) -> bool:
+    """True if a file name has one of the audio extensions."""
+    return os.path.splitext(name)[1].lower() in extensions
+
+
+def scan_audio_files(folder_path, extensions=AUDIO_EXTENSIONS) -> Iterator[ScannedFile]:
+    """
+    Walk a folder tree once, yielding audio files lazily as they are found.
+
+    Directory entries report their type without extra syscalls; each audio
+    file is stat'ed once. Unreadable directories are skipped and symlinked
+    directories are not followed (no loops).
+
+    Args:
+        folder_path: Root folder
+        extensions: Lower-case extensions to accept
+
+    Yields:
+        ScannedFile per audio file
+    """
+    pending = [str(folder_path)]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif is_audio_name(entry.name, extensions) and entry.is_file():
+                            stat = entry.stat()
+                            yield ScannedFile(Path(entry.path), stat.st_size, stat.st_mtime_ns)
+                    except OSError:
+                        continue  # Entry vanished or is unreadable
+        except OSError:
+            continue
+
+
+class RecordingsIndex:
+    """
+    Cached index of the directories under the Recordings archive.
+
+    Each directory's modification time, subdirectories and audio file count
+    are stored in a JSON file. refresh() lists only directories whose mtime
+    changed since the last refresh (a new file or folder changes its parent's
+    mtime), so finding an audit folder no longer rescans every recording.
+    """
+
+    def __init__(self, root="Recordings", index_path: Optional[Path] = None):
+        self.root = str(Path(root).resolve())
+        self.index_path = Path(index_path or DEFAULT_INDEX_PATH)
+        self.directories: Dict[str, dict] = {}
+        self.rescanned = 0  # Directories listed by the last refresh
+        self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get('root') == self.root:
+            self.directories = data.get('directories', {})
+
+    def _save(self):
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.index_path.with_suffix(".tmp")
+            temp_path.write_text(json.dumps({'root': self.root, 'directories': self.directories}),
+                                 encoding="utf-8")
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            pass
+
+    def refresh(self) -> "RecordingsIndex":
+        """Bring the index up to date, listing only changed directories."""
+        updated = {}
+        self.rescanned = 0
+        pending = [self.root]
+        while pending:
+            directory = pending.pop()
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            cached = self.directories.get(directory)
+            if cached is None or cached['mtime_ns'] != mtime_ns:
+                cached = self._list_directory(directory, mtime_ns)
+                if cached is None:
+                    continue
+                self.rescanned += 1
+            updated[directory] = cached
+            pending.extend(cached['subdirs'])
+        self.directories = updated
+        self._save()
+        return self
+
+    @staticmethod
+    def _list_directory(directory: str, mtime_ns: int) -> Optional[dict]:
+        subdirs, audio_files = [], 0
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif is_audio_name(entry.name):
+                            audio_files += 1
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        return {'mtime_ns': mtime_ns, 'subdirs': subdirs, 'audio_files': audio_files}
+
+    def find_folders(self, name: str, prefer: Optional[str] = None) -> List[Path]:
+        """
+        Find indexed folders holding recordings whose name contains `name`
+        (case-insensitive).
+
+        Args:
+            name: Agent or campaign name to look for in folder names
+            prefer: Optional text (e.g. today's date) that ranks matching folders first
+
+        Returns:
+            Matching folder paths, preferred and most recently modified first
+        """
+        wanted = name.lower()
+        matches = [
+            (directory, info) for directory, info in self.directories.items()
+            if info['audio_files'] and wanted in os.path.basename(directory).lower()
+        ]
+        matches.sort(key=lambda item: (
+            prefer is not None and prefer in os.path.basename(item[0]),
+            item[1]['mtime_ns']
+        ), reverse=True)
+        return [Path(directory) for directory, _ in matches]
@@ -0,0 +1,340 @@
+"""
+Persistent Result Cache
+SQLite-backed cache of per-file analysis results (verdicts, speech segments,
+timings), keyed by file content hash plus a fingerprint of the analysis
+settings, with size-bounded LRU eviction. A file index of
+(path, size, mtime) -> content hash lets incremental audits reuse results
+for unchanged files without reading them.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from config import CACHE_DIR, app_settings
+from analyzer.call_metrics import METRIC_FIELDS
+from analyzer.conversation_metrics import CONVERSATION_FIELDS
+
+# Default cache database location
+DEFAULT_CACHE_PATH = CACHE_DIR / "results.sqlite3"
+
+# Bump when detection logic changes so old entries are never reused
+CACHE_VERSION = 3
+
+# Settings that cannot change analysis results and are left out of the fingerprint
+NON_ANALYSIS_SETTINGS = {
+    'batch_executor',
+    'result_cache_enabled',
+    'result_cache_max_entries',
+    'pipeline_downloads',
+    'reuse_dialer_sessions',
+    'dialer_session_idle_timeout',
+    'call_log_backend',
+    'incremental_audits',
+}
+
+# Result fields stored in the cache (name/phone/path come from the file name, not its content)
+CACHED_FIELDS = (
+    'releasing_detection',
+    'late_hello_detection',
+    'classification_success',
+    'speech_segments',
+    'processing_time',
+) + METRIC_FIELDS + CONVERSATION_FIELDS
+
+HASH_CHUNK_BYTES = 1 << 20
+
+# Max bound parameters per batched SQLite query
+SQL_BATCH_SIZE = 500
+
+# Hashes computed while files were written (e.g. by the downloader):
+# resolved path -> (size, mtime_ns, hex digest)
+_known_hashes = {}
+MAX_KNOWN_HASHES = 100000
+
+
+def new_content_hash():
+    """Create the hash object used for content keys."""
+    return hashlib.sha256()
+
+
+def remember_content_hash(file_path: Path, hex_digest: str):
+    """
+    Record a hash computed while the file was written, so hash_file()
+    can skip re-reading it while its size and mtime are unchanged.
+    """
+    stat = os.stat(file_path)
+    if len(_known_hashes) >= MAX_KNOWN_HASHES:
+        _known_hashes.clear()
+    _known_hashes[str(Path(file_path).resolve())] = (stat.st_size, stat.st_mtime_ns, hex_digest)
+
+
+def hash_file(file_path: Path) -> str:
+    """
+    Hash a file's content in chunks (reuses a hash recorded at write time).
+
+    Args:
+        file_path: Path to file
+
+    Returns:
+        Hex digest of the file content
+    """
+    known = _known_hashes.get(str(Path(file_path).resolve()))
+    if known is not None:
+        stat = os.stat(file_path)
+        if known[:2] == (stat.st_size, stat.st_mtime_ns):
+            return known[2]
+
+    digest = new_content_hash()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def settings_fingerprint(settings=None) -> str:
+    """
+    Fingerprint every analysis-relevant setting.
+
+    Args:
+        settings: AppSettings instance (default: global app_settings)
+
+    Returns:
+        Short hex digest that changes whenever a relevant setting changes
+    """
+    snapshot = (settings or app_settings).snapshot()
+    relevant = {k: v for k, v in snapshot.items() if k not in NON_ANALYSIS_SETTINGS}
+    payload = json.dumps({'version': CACHE_VERSION, 'settings': relevant}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class ResultCache:
+    """
+    On-disk LRU cache of analysis results.
+
+    Safe to share between threads and worker processes: every operation
+    opens its own short-lived SQLite connection (WAL journal).
+    """
+
+    def __init__(self, db_path: Optional[Path] = None, max_entries: Optional[int] = None):
+        self.db_path = Path(db_path or DEFAULT_CACHE_PATH)
+        self.max_entries = max_entries or app_settings.result_cache_max_entries
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY,"
+                " content_hash TEXT NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_results_access ON results(last_access)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                " path TEXT PRIMARY KEY,"
+                " size INTEGER NOT NULL,"
+                " mtime_ns INTEGER NOT NULL,"
+                " content_hash TEXT NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_files_access ON files(last_access)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one transaction; commits (or rolls back) and closes on exit."""
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(content_hash: str) -> str:
+        """Combine a content hash with the current settings fingerprint."""
+        return f"{content_hash}:{settings_fingerprint()}"
+
+    def get(self, content_hash: str) -> Optional[Dict]:
+        """
+        Look up cached result fields for a file's content hash.
+
+        Returns:
+            Dict of CACHED_FIELDS or None on a miss
+        """
+        key = self.make_key(content_hash)
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT payload FROM results WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError):
+            return None
+
+    def put(self, content_hash: str, result: Dict):
+        """
+        Store a successful processing result and evict least recently used entries.
+        """
+        if not result.get('classification_success', False):
+            return
+        payload = json.dumps({field: result[field] for field in CACHED_FIELDS if field in result})
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (key, content_hash, payload, last_access) VALUES (?, ?, ?, ?)",
+                    (self.make_key(content_hash), content_hash, payload, time.time())
+                )
+                excess = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    conn.execute(
+                        "DELETE FROM results WHERE key IN "
+                        "(SELECT key FROM results ORDER BY last_access ASC LIMIT ?)",
+                        (excess,)
+                    )
+        except sqlite3.Error:
+            pass
+
+    def lookup_file(self, file_path: Path, stat: Optional[os.stat_result] = None) -> Optional[str]:
+        """
+        Get the indexed content hash of a file whose size and mtime are unchanged.
+
+        Args:
+            file_path: Path to file
+            stat: The file's os.stat() result, if already known
+
+        Returns:
+            Hex digest, or None if the file is not indexed or has changed
+        """
+        stat = stat or os.stat(file_path)
+        path = str(Path(file_path).resolve())
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT content_hash FROM files WHERE path = ? AND size = ? AND mtime_ns = ?",
+                    (path, stat.st_size, stat.st_mtime_ns)
+                ).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE files SET last_access = ? WHERE path = ?", (time.time(), path))
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def remember_file(self, file_path: Path, content_hash: str, stat: Optional[os.stat_result] = None):
+        """
+        Index a file's (path, size, mtime) -> content hash, evicting the least
+        recently used paths beyond twice the result capacity.
+        """
+        stat = stat or os.stat(file_path)
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO files (path, size, mtime_ns, content_hash, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (str(Path(file_path).resolve()), stat.st_size, stat.st_mtime_ns, content_hash, time.time())
+                )
+                excess = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0] - 2 * self.max_entries
+                if excess > 0:
+                    conn.execute(
+                        "DELETE FROM files WHERE path IN "
+                        "(SELECT path FROM files ORDER BY last_access ASC LIMIT ?)",
+                        (excess,)
+                    )
+        except sqlite3.Error:
+            pass
+
+    def content_hash(self, file_path: Path, stat=None) -> str:
+        """
+        Hash a file's content, reusing the indexed hash while its size and
+        mtime are unchanged (new hashes are indexed).
+
+        Args:
+            file_path: Path to file
+            stat: The file's os.stat() result (or ScannedFile), if already known
+        """
+        stat = stat or os.stat(file_path)
+        known = self.lookup_file(file_path, stat)
+        if known is not None:
+            return known
+        digest = hash_file(file_path)
+        self.remember_file(file_path, digest, stat)
+        return digest
+
+    def get_unchanged(self, file_paths: List[Path], stats: Optional[Dict] = None) -> Dict[Path, Dict]:
+        """
+        Cached result fields for files unchanged since they were analyzed,
+        found through the file index without reading the files (one
+        connection for the whole batch).
+
+        Args:
+            file_paths: Paths to look up
+            stats: Optional path -> os.stat() result (or ScannedFile) already known
+
+        Returns:
+            Dict of path -> CACHED_FIELDS for the files that can be reused
+            (new, changed and uncached files are left out)
+        """
+        known_stats, stats = stats or {}, {}
+        for file_path in file_paths:
+            try:
+                stat = known_stats.get(file_path) or os.stat(file_path)
+            except OSError:
+                continue
+            stats[str(Path(file_path).resolve())] = (file_path, stat)
+
+        fingerprint = settings_fingerprint()
+        found = {}
+        now = time.time()
+        paths = list(stats)
+        try:
+            with self._connect() as conn:
+                for i in range(0, len(paths), SQL_BATCH_SIZE):
+                    batch = paths[i:i + SQL_BATCH_SIZE]
+                    rows = conn.execute(
+                        f"SELECT path, size, mtime_ns, content_hash FROM files "
+                        f"WHERE path IN ({','.join('?' * len(batch))})", batch
+                    ).fetchall()
+                    hashes = {}
+                    for path, size, mtime_ns, content_hash in rows:
+                        file_path, stat = stats[path]
+                        if (size, mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                            hashes.setdefault(f"{content_hash}:{fingerprint}", []).append((path, file_path))
+                    if not hashes:
+                        continue
+                    keys = list(hashes)
+                    placeholders = ','.join('?' * len(keys))
+                    for key, payload in conn.execute(
+                            f"SELECT key, payload FROM results WHERE key IN ({placeholders})", keys):
+                        for _, file_path in hashes[key]:
+                            found[file_path] = json.loads(payload)
+                    conn.execute(f"UPDATE results SET last_access = ? WHERE key IN ({placeholders})", [now] + keys)
+                    conn.execute(
+                        f"UPDATE files SET last_access = ? WHERE path IN ({','.join('?' * len(rows))})",
+                        [now] + [row[0] for row in rows]
+                    )
+        except (sqlite3.Error, ValueError):
+            return {}
+        return found
+
+    def stats(self) -> Dict:
+        """Get entry count, indexed file count and database size."""
+        try:
+            with self._connect() as conn:
+                entries = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+                files = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        except sqlite3.Error:
+            entries = files = 0
+        size = self.db_path.stat().st_size if self.db_path.exists() else 0
+        return {'entries': entries, 'max_entries': self.max_entries, 'indexed_files': files, 'size_bytes': size}
+
+    def clear(self):
+        """Remove all cached results and the file index."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM results")
+            conn.execute("DELETE FROM files")
@@ -0,0 +1,58 @@
+"""
+Synthetic Call Audio
+Shared generator for the test scripts: line noise with speech-like bursts
+(smoothed noise under a syllable envelope), so every test builds its calls
+the same way and the signal can be tuned in one place
+"""
+
+import wave
+
+import numpy as np
+
+from core.audio_decoder import PCMAudio
+
+
+def make_channel(bursts, seconds=20, frame_rate=8000, level=3000, seed=0, dead_after=None,
+                 noise=30, hum=0):
+    """
+    Build one channel of 16-bit samples.
+
+    Args:
+        bursts: Speech-like bursts as (start_s, end_s)
+        seconds: Channel length
+        frame_rate: Sample rate (Hz)
+        level: Burst amplitude
+        seed: Random seed (same seed, same samples)
+        dead_after: Seconds after which the line is digital silence (None = never)
+        noise: Line noise standard deviation
+        hum: Amplitude of 60 Hz mains hum
+
+    Returns:
+        int16 NumPy array
+    """
+    rng = np.random.default_rng(seed)
+    n = int(seconds * frame_rate)
+    signal = rng.normal(0, noise, n)
+    if hum:
+        signal += hum * np.sin(2 * np.pi * 60 * np.arange(n) / frame_rate)
+    for start_s, end_s in bursts:
+        a, b = int(start_s * frame_rate), int(end_s * frame_rate)
+        burst = np.convolve(rng.normal(0, 1, b - a), np.ones(4) / 4, 'same')
+        signal[a:b] += burst * np.abs(np.sin(np.linspace(0, 3 * np.pi, b - a))) * level
+    if dead_after is not None:
+        signal[int(dead_after * frame_rate):] = 0
+    return np.clip(signal, -32768, 32767).astype("<i2")
+
+
+def make_call(bursts, seconds=20, frame_rate=8000, **options):
+    """Mono call as PCMAudio (options as for make_channel)."""
+    return PCMAudio(make_channel(bursts, seconds, frame_rate, **options), frame_rate)
+
+
+def write_wav(path, samples, frame_rate=8000, channels=1):
+    """Write 16-bit samples (interleaved when channels=2) to a WAV file."""
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(frame_rate)
+        wav.writeframes(np.asarray(samples, dtype="<i2").tobytes())
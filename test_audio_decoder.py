@@ -0,0 +1,60 @@
+"""
+Test script to verify the direct ffmpeg decoder's pipe handling
+Runs the decoder against a stand-in ffmpeg that floods stderr before
+writing any audio, which blocks forever if stderr is not drained
+"""
+
+import stat
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+from core.audio_decoder import decode_agent_channel
+
+FAKE_FFMPEG = '''#!{python}
+import struct, sys
+sys.stderr.write("Input #0, mp3, from 'x.mp3':\\n  Stream #0:0: Audio: mp3, 44100 Hz, stereo\\n")
+sys.stderr.write("Output #0, wav, to 'pipe:':\\n")
+for _ in range(20000):
+    sys.stderr.write("[mp3float @ 0x0] Header missing, skipping damaged frame\\n")
+sys.stderr.flush()
+samples = bytes(range(256)) * 125  # 32000 bytes = 2s of 8 kHz mono
+header = b"RIFF" + struct.pack("<I", 36 + len(samples)) + b"WAVEfmt " + struct.pack(
+    "<IHHIIHH", 16, 1, 1, 8000, 16000, 2, 16) + b"data" + struct.pack("<I", len(samples))
+sys.stdout.buffer.write(header + samples)
+'''
+
+
+def make_fake_ffmpeg(folder: Path) -> Path:
+    path = folder / "ffmpeg"
+    path.write_text(FAKE_FFMPEG.format(python=sys.executable))
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return path
+
+
+def test_chatty_ffmpeg_does_not_block():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        folder = Path(tmpdir)
+        ffmpeg = make_fake_ffmpeg(folder)
+        (folder / "Agent_1.mp3").write_bytes(bytes(4000))
+
+        result = []
+        worker = threading.Thread(target=lambda: result.append(
+            decode_agent_channel(folder / "Agent_1.mp3", sample_rate=8000, ffmpeg_path=str(ffmpeg))
+        ), daemon=True)
+        worker.start()
+        worker.join(timeout=30)
+        assert not worker.is_alive(), "decoder blocked on a full stderr pipe"
+
+    audio = result[0]
+    assert audio is not None and len(audio) == 2000 and audio.frame_rate == 8000
+    assert audio.source_frame_rate == 44100  # Parsed from the kept head of the log
+    assert np.array_equal(audio.samples[:2], np.frombuffer(bytes(range(4)), dtype="<i2"))
+    print("✅ ~1 MB of ffmpeg log drained while decoding; source rate still read")
+
+
+if __name__ == "__main__":
+    test_chatty_ffmpeg_does_not_block()
+    print("ALL TESTS PASSED")
@@ -0,0 +1,188 @@
+"""
+Test script to verify header-only audio probing
+Builds small MP3/WAV files in memory, so no ffmpeg is needed
+"""
+
+import os
+import tempfile
+import wave
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from pydub import AudioSegment
+from automation.mock_readymode import silent_mp3
+from config import app_settings
+from core.audio_decoder import PCMAudio
+from core.audio_probe import PROBE_BYTES, probe_bytes, probe_file, sniff_format
+from core.audio_processor import AudioProcessor
+
+
+def id3_tag(size):
+    """ID3v2 tag of `size` bytes in total (header included)."""
+    body = size - 10
+    synchsafe = bytes([(body >> 21) & 0x7F, (body >> 14) & 0x7F, (body >> 7) & 0x7F, body & 0x7F])
+    return b"ID3\x03\x00\x00" + synchsafe + bytes(body)
+
+
+def write_wav(path, seconds, rate=8000, channels=2):
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(bytes(int(seconds * rate) * channels * 2))
+
+
+def test_mp3_and_wav_headers():
+    folder = Path(tempfile.mkdtemp())
+    write_wav(folder / "call.wav", 12.5, rate=8000, channels=2)
+    info = probe_file(folder / "call.wav")
+    assert info.format == "wav" and info.channels == 2 and info.sample_rate == 8000
+    assert abs(info.duration - 12.5) < 0.01
+
+    data = silent_mp3(45)
+    info = probe_bytes(data[:4096], len(data))
+    assert info.format == "mp3" and info.channels == 2 and info.sample_rate == 44100
+    assert abs(info.duration - 45) < 0.5
+    print(f"✅ WAV 12.5s and MP3 {info.duration:.1f}s read from headers")
+
+
+def test_large_id3_tag():
+    folder = Path(tempfile.mkdtemp())
+    tag_body = bytes(200000)  # e.g. embedded cover art
+    size = len(tag_body)
+    synchsafe = bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F])
+    (folder / "tagged.mp3").write_bytes(b"ID3\x03\x00\x00" + synchsafe + tag_body + silent_mp3(20))
+    info = probe_file(folder / "tagged.mp3")
+    assert info is not None and abs(info.duration - 20) < 0.5
+    print("✅ Frames found past a 200 KB ID3 tag")
+
+
+def test_tag_ending_near_probe_boundary():
+    folder = Path(tempfile.mkdtemp())
+    audio = silent_mp3(20, bitrate_kbps=128, sample_rate=32000)  # 576-byte frames
+    # Tag ends less than a frame before the first block's end, or is followed by padding
+    for name, data in [("tag_65106.mp3", id3_tag(65106) + audio),
+                       ("tag_65326.mp3", id3_tag(65326) + audio),
+                       ("padded.mp3", id3_tag(1000) + bytes(20000) + audio),
+                       ("padded_past_block.mp3", id3_tag(40000) + bytes(30000) + audio)]:
+        (folder / name).write_bytes(data)
+        info = probe_file(folder / name)
+        assert info is not None and abs(info.duration - 20) < 0.5, name
+    print("✅ First frame found when the tag or its padding reaches the probe block's end")
+
+
+def test_unknown_formats():
+    folder = Path(tempfile.mkdtemp())
+    (folder / "clip.m4a").write_bytes(b"\x00\x00\x00\x20ftypM4A " + os.urandom(5000))
+    (folder / "noise.mp3").write_bytes(os.urandom(5000))
+    assert probe_file(folder / "clip.m4a") is None
+    assert probe_file(folder / "noise.mp3") is None
+    assert probe_file(folder / "missing.mp3") is None
+    print("✅ Unrecognised and missing files give no probe result")
+
+
+def test_short_file_rejected_without_decoding():
+    folder = Path(tempfile.mkdtemp())
+    write_wav(folder / "Agent_555-000-0000.wav", 0.5)
+    processor = AudioProcessor()
+    with mock.patch.object(processor, "decode_agent_audio") as decode, \
+            mock.patch.object(processor, "load_audio_file") as load:
+        result = processor.process_single_file(folder / "Agent_555-000-0000.wav")
+    assert not result['classification_success']
+    assert result['error'] == "Audio too short: 500ms"
+    assert not decode.called and not load.called
+    print("✅ Sub-second recording rejected from its header")
+
+
+def test_format_sniffing():
+    folder = Path(tempfile.mkdtemp())
+    write_wav(folder / "mislabeled.mp3", 2)
+    assert sniff_format((folder / "mislabeled.mp3").read_bytes()[:64]) == "wav"
+    assert sniff_format(silent_mp3(2)[:4096]) == "mp3"
+    assert sniff_format(b"ID3\x04\x00\x00\x00\x00\x00\x00") == "mp3"
+    assert sniff_format(b"\x00\x00\x00\x20ftypM4A \x00\x00") == "mp4"
+    assert sniff_format(b"<html><body>Session expired</body></html>") is None
+    print("✅ Containers identified from magic bytes, not extensions")
+
+
+def test_false_sync_not_taken_for_mp3():
+    frame = silent_mp3(1)[:104]  # One 32 kbps / 44.1 kHz frame
+    # A lone sync cut off by the end of the data, and two syncs chained into garbage
+    cut_off = b"<html>" + bytes(4000) + frame[:50]
+    short_chain = b"<html>" + bytes(4000) + frame + frame + b"</html>" * 20
+    assert sniff_format(cut_off) is None and sniff_format(short_chain) is None
+    # Real streams: confirmed by the following frames, or ending exactly after one
+    assert sniff_format(bytes(10) + frame * 3) == "mp3" and sniff_format(frame) == "mp3"
+    print("✅ Stray frame syncs in non-audio data are not sniffed as MP3")
+
+
+def test_bad_files_get_reason_codes():
+    folder = Path(tempfile.mkdtemp())
+    (folder / "Agent_1.mp3").write_bytes(b"<html>" + bytes(4000))  # Login page saved as a recording
+    (folder / "Agent_2.wav").write_bytes(b"RIFF\x00\x00\x00\x00WAVEjunk" + bytes(4000))
+    (folder / "Agent_3.mp3").write_bytes(b"ID3")
+    (folder / "Agent_4.txt").write_bytes(bytes(4000))
+    expected = {
+        "Agent_1.mp3": "unrecognized_format",
+        "Agent_2.wav": "corrupt_header",
+        "Agent_3.mp3": "file_too_small",
+        "Agent_4.txt": "unsupported_extension",
+        "Agent_5.mp3": "file_missing",
+    }
+    processor = AudioProcessor()
+    with mock.patch.object(processor, "decode_agent_audio", return_value=None) as decode, \
+            mock.patch("core.audio_processor.AudioSegment") as pydub, \
+            mock.patch.object(app_settings, "result_cache_enabled", False):
+        pydub.from_file.side_effect = Exception("Invalid data found when processing input")
+        for name, code in expected.items():
+            result = processor.process_single_file(folder / name)
+            assert not result['classification_success'] and result['error_code'] == code, (name, result)
+    # Only unrecognized content and the unreadable WAV header are tried by the decoders
+    assert [Path(c.args[0]).name for c in decode.call_args_list] == ["Agent_1.mp3", "Agent_2.wav"]
+    assert pydub.from_file.call_count == 2
+    print("✅ Corrupt files rejected with reason codes, decode tried only for unknown content and headers")
+
+
+def test_unreadable_header_still_decoded():
+    folder = Path(tempfile.mkdtemp())
+    path = folder / "Agent_555-000-0000.mp3"
+    path.write_bytes(id3_tag(1000) + bytes(PROBE_BYTES + 1000) + silent_mp3(5))  # Padding past the probe
+    assert probe_file(path) is None
+    pcm = PCMAudio(np.zeros(5 * 8000, dtype="<i2"), 8000)
+    processor = AudioProcessor()
+    with mock.patch.object(processor, "decode_agent_audio", return_value=pcm) as decode, \
+            mock.patch.object(app_settings, "result_cache_enabled", False):
+        result = processor.process_single_file(path)
+    assert decode.called and result['classification_success'], result
+    print("✅ Valid file the probe cannot read is decoded, not rejected")
+
+
+def test_unrecognized_content_still_decoded():
+    folder = Path(tempfile.mkdtemp())
+    path = folder / "Agent_555-000-0000.m4a"
+    path.write_bytes(b"\xff\xf1\x50\x80" + bytes(8000))  # ADTS/AAC saved as .m4a
+    assert sniff_format(path.read_bytes()) is None
+    audio = AudioSegment.silent(duration=5000, frame_rate=8000)
+    processor = AudioProcessor()
+    with mock.patch.object(processor, "decode_agent_audio", return_value=None), \
+            mock.patch("core.audio_processor.AudioSegment.from_file", return_value=audio) as from_file, \
+            mock.patch.object(app_settings, "result_cache_enabled", False):
+        result = processor.process_single_file(path)
+    assert result['classification_success'], result
+    assert from_file.call_args.kwargs['format'] is None  # ffmpeg probes the content itself
+    print("✅ Content the sniffer does not know is left to ffmpeg, not rejected")
+
+
+if __name__ == "__main__":
+    test_mp3_and_wav_headers()
+    test_large_id3_tag()
+    test_tag_ending_near_probe_boundary()
+    test_unknown_formats()
+    test_short_file_rejected_without_decoding()
+    test_format_sniffing()
+    test_false_sync_not_taken_for_mp3()
+    test_bad_files_get_reason_codes()
+    test_unreadable_header_still_decoded()
+    test_unrecognized_content_still_decoded()
+    print("ALL TESTS PASSED")
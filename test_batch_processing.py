@@ -0,0 +1,247 @@
+"""
+Test script to verify batch processing
+Runs the executor backends on small synthetic calls and checks that the
+process backend matches the thread backend with the parent's settings, and
+drives the continuous work queue and the download/analysis pipeline with
+stand-in analyses to check completion order, the in-flight window,
+backpressure, progress, cache counters and download errors
+"""
+
+import functools
+import multiprocessing
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+import analyzer.simple_main as simple_main
+from config import app_settings
+from synthetic_calls import make_channel, write_wav
+
+
+def write_call(path: Path, onset_s: float, seconds: int = 8, frame_rate: int = 8000, seed: int = 0):
+    """Mono WAV of line noise with a speech-like burst from onset_s to onset_s + 2."""
+    write_wav(path, make_channel([(onset_s, onset_s + 2)], seconds, frame_rate, seed=seed), frame_rate)
+
+
+def verdicts(results):
+    return {
+        Path(r['file_path']).name: (r['releasing_detection'], r['late_hello_detection'], r['speech_segments'])
+        for r in results
+    }
+
+
+def test_process_backend_matches_thread_backend():
+    spawn_pool = functools.partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn"))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = [Path(tmpdir) / "Alice_555-000-0001.wav", Path(tmpdir) / "Bob_555-000-0002.wav"]
+        write_call(files[0], onset_s=1.0)
+        write_call(files[1], onset_s=3.0, seed=1)
+
+        previous = app_settings.snapshot()
+        try:
+            app_settings.result_cache_enabled = False
+            # Non-default: spawned workers start from config defaults, so only the
+            # snapshot handed to _init_worker can make Bob's 3s hello late
+            app_settings.late_hello_time = 2.0
+            with mock.patch.object(simple_main, "ProcessPoolExecutor", spawn_pool):
+                processed = list(simple_main.BatchProcessor(max_workers=2).iter_process_files(files, 'process'))
+            threaded = list(simple_main.BatchProcessor(max_workers=2).iter_process_files(files, 'thread'))
+        finally:
+            app_settings.apply_snapshot(previous)
+
+    assert all(r['classification_success'] for r in processed)
+    assert verdicts(processed) == verdicts(threaded)
+    assert verdicts(processed)["Bob_555-000-0002.wav"][1] == "Yes"
+    assert verdicts(processed)["Alice_555-000-0001.wav"][1] == "No"
+    print("✅ Process backend matches thread backend; settings reach workers via the snapshot")
+
+
+def test_worker_applies_changed_snapshot():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "Bob_555-000-0002.wav"
+        write_call(path, onset_s=3.0, seed=1)
+
+        previous = app_settings.snapshot()
+        try:
+            app_settings.result_cache_enabled = False
+            early = dict(app_settings.snapshot(), late_hello_time=2.0)
+            late = dict(app_settings.snapshot(), late_hello_time=5.0)
+            # A warm worker gets a later batch's snapshot with different settings
+            first = simple_main._process_file_task(str(path), early)
+            worker = simple_main._worker_processor
+            second = simple_main._process_file_task(str(path), late)
+            assert simple_main._worker_processor is not worker  # Rebuilt for the new settings
+            assert app_settings.late_hello_time == 5.0
+        finally:
+            app_settings.apply_snapshot(previous)
+            simple_main._worker_processor = None
+
+    assert first['late_hello_detection'] == "Yes" and second['late_hello_detection'] == "No"
+    print("✅ Warm worker re-applies a changed settings snapshot")
+
+
+class FakeAnalysis:
+    """Stand-in for process_single_file: per-file delays, tracks concurrency."""
+
+    def __init__(self, delays=None, cache_hits=()):
+        self.delays = delays or {}
+        self.cache_hits = set(cache_hits)
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+        self.finished = 0
+
+    def __call__(self, file_path, include_debug=False, file_stat=None):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.delays.get(Path(file_path).name, 0.01))
+        with self.lock:
+            self.running -= 1
+            self.finished += 1
+        return {'file_path': str(file_path), 'classification_success': True,
+                'releasing_detection': "No", 'late_hello_detection': "No",
+                'cache_hit': Path(file_path).name in self.cache_hits}
+
+
+def run_queue(processor, file_queue, analysis):
+    """Run iter_process_queue with `analysis` in place of the real decode/VAD."""
+    in_flight, peak_in_flight = set(), [0]
+    submit = processor._submit
+
+    def tracking_submit(pool, backend, file_path, file_stat, snapshot):
+        future = submit(pool, backend, file_path, file_stat, snapshot)
+        in_flight.add(future)
+        peak_in_flight[0] = max(peak_in_flight[0], len(in_flight))
+        future.add_done_callback(in_flight.discard)
+        return future
+
+    with mock.patch.object(processor.audio_processor, "process_single_file", side_effect=analysis), \
+            mock.patch.object(processor, "_submit", side_effect=tracking_submit), \
+            mock.patch.object(app_settings, "result_cache_enabled", False):
+        results = list(processor.iter_process_queue(file_queue, executor='thread'))
+    return results, peak_in_flight[0]
+
+
+def test_queue_yields_in_completion_order():
+    # The first file is slow; nothing waits for it (no batch barrier)
+    file_queue = queue.Queue()
+    for name in ("slow.wav", "a.wav", "b.wav", "c.wav"):
+        file_queue.put(Path(name))
+    file_queue.put(None)
+
+    processor = simple_main.BatchProcessor(max_workers=2)
+    results, _ = run_queue(processor, file_queue, FakeAnalysis({"slow.wav": 0.5}))
+    names = [Path(r['file_path']).name for r in results]
+    assert sorted(names) == ["a.wav", "b.wav", "c.wav", "slow.wav"]
+    assert names[-1] == "slow.wav"
+    print("✅ Results stream in completion order; a slow file holds up nothing")
+
+
+def test_in_flight_window_and_counters():
+    file_queue = queue.Queue()
+    files = [Path(f"call_{i:02d}.wav") for i in range(20)]
+    for file_path in files:
+        file_queue.put(file_path)
+    # A stored result for an unchanged file is yielded as-is
+    file_queue.put({'file_path': "unchanged.wav", 'classification_success': True,
+                    'cache_hit': True, 'unchanged': True})
+    file_queue.put(None)
+
+    processor = simple_main.BatchProcessor(max_workers=2)
+    analysis = FakeAnalysis(cache_hits={"call_00.wav", "call_01.wav", "call_02.wav"})
+    results, peak = run_queue(processor, file_queue, analysis)
+
+    assert len(results) == 21 and {r['file_path'] for r in results} == {str(f) for f in files} | {"unchanged.wav"}
+    window = 2 * simple_main.IN_FLIGHT_PER_WORKER
+    assert peak == window and analysis.peak <= 2  # Window kept full; never more workers than asked
+    assert processor.cache_stats == {'hits': 4, 'misses': 17, 'unchanged': 1}
+    print(f"✅ {len(results)} results, at most {window} files in flight, cache counters {processor.cache_stats}")
+
+
+def test_folder_progress_per_file():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for i in range(5):
+            (Path(tmpdir) / f"Agent_{i}.wav").write_bytes(bytes(2000))
+        processor = simple_main.BatchProcessor(max_workers=2)
+        progress = []
+        with mock.patch.object(processor.audio_processor, "process_single_file", side_effect=FakeAnalysis()), \
+                mock.patch.object(app_settings, "result_cache_enabled", False), \
+                mock.patch.object(app_settings, "incremental_audits", False):
+            results = processor.process_folder_parallel(tmpdir, lambda done, total: progress.append((done, total)),
+                                                        executor='thread')
+    assert len(results) == 5 and progress == [(i, 5) for i in range(1, 6)]
+    print("✅ Progress reported once per completed file")
+
+
+def run_pipeline(download, analysis):
+    """Drive iter_analyze_downloads with a small queue; returns the records and the download's error."""
+    records = []
+    with mock.patch.object(simple_main._batch_processor.audio_processor, "process_single_file",
+                           side_effect=analysis), \
+            mock.patch.object(simple_main, "PIPELINE_QUEUE_SIZE", 2), \
+            mock.patch.object(app_settings, "result_cache_enabled", False):
+        try:
+            for record in simple_main.iter_analyze_downloads(download, executor='thread'):
+                records.append(record)
+        except RuntimeError as e:
+            return records, e
+    return records, None
+
+
+def test_pipeline_backpressure_and_download_error():
+    analysis = FakeAnalysis({f"call_{i:02d}.wav": 0.03 for i in range(20)})
+    window = simple_main._batch_processor._worker_count('thread') * simple_main.IN_FLIGHT_PER_WORKER
+    ahead = []
+
+    def download(on_file_saved):
+        for i in range(20):
+            on_file_saved(f"call_{i:02d}.wav")
+            ahead.append(i + 1 - analysis.finished)
+        raise RuntimeError("session expired")
+
+    records, error = run_pipeline(download, analysis)
+    # Every saved file is analyzed before the download's error is raised
+    assert str(error) == "session expired"
+    assert sorted(Path(r['file_path']).name for r in records) == [f"call_{i:02d}.wav" for i in range(20)]
+    assert [r['done'] for r in records] == list(range(1, 21))
+    assert all(r['done'] <= r['total'] <= 20 for r in records) and records[-1]['total'] == 20
+    # Backpressure: the download never runs more than queue + window files ahead
+    assert max(ahead) <= 2 + window
+    print(f"✅ Download ran at most {max(ahead)} files ahead of analysis; its error raised after all 20 results")
+
+
+def test_pipeline_consumer_stops_early():
+    download_finished = threading.Event()
+
+    def download(on_file_saved):
+        for i in range(50):
+            on_file_saved(f"call_{i:02d}.wav")
+        download_finished.set()
+
+    with mock.patch.object(simple_main._batch_processor.audio_processor, "process_single_file",
+                           side_effect=FakeAnalysis()), \
+            mock.patch.object(simple_main, "PIPELINE_QUEUE_SIZE", 2), \
+            mock.patch.object(app_settings, "result_cache_enabled", False):
+        records = simple_main.iter_analyze_downloads(download, executor='thread')
+        first = [next(records), next(records)]
+        records.close()
+    # A producer blocked on the full queue is released once the consumer is gone
+    assert download_finished.wait(timeout=5)
+    assert [r['done'] for r in first] == [1, 2]
+    print("✅ Closing the results stream releases the blocked download")
+
+
+if __name__ == "__main__":
+    test_process_backend_matches_thread_backend()
+    test_worker_applies_changed_snapshot()
+    test_queue_yields_in_completion_order()
+    test_in_flight_window_and_counters()
+    test_folder_progress_per_file()
+    test_pipeline_backpressure_and_download_error()
+    test_pipeline_consumer_stops_early()
+    print("ALL TESTS PASSED")
@@ -0,0 +1,188 @@
+"""
+Test script to verify the Selenium-free call-log client
+Runs against the local ReadyMode stand-in, so no browser or dialer is needed
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+import requests
+from automation.call_downloader import CallDownloader, build_call_filename
+from automation.call_log_client import CallLogClient, parse_page, download_call_recordings_http
+from automation.mock_readymode import MockReadyModeServer
+from core.audio_processor import AudioProcessor
+from core.result_cache import hash_file
+
+
+def test_login_and_agent_filter():
+    with MockReadyModeServer(num_calls=120) as server:
+        client = CallLogClient(server.url)
+        assert not CallLogClient(server.url).login("Auditor1", "wrong")
+        assert client.login(server.username, server.password)
+
+        rows = list(client.iter_calls(agent="John Smith"))
+        expected = [c for c in server.calls if c['agent'] == "John Smith"]
+        assert len(rows) == len(expected)
+        assert all(row['agent'] == "John Smith" for row in rows)
+        assert len({row['href'] for row in rows}) == len(rows)
+        print(f"✅ Logged in and listed {len(rows)} calls for one agent")
+
+
+def test_disposition_and_duration_filters():
+    with MockReadyModeServer(num_calls=120) as server:
+        client = CallLogClient(server.url)
+        client.login(server.username, server.password)
+        rows = list(client.iter_calls(disposition=["Voicemail"], min_duration=30, max_duration=60))
+        assert rows
+        assert all(row['disposition'] == "Voicemail" and 30 <= row['duration'] <= 60 for row in rows)
+        print(f"✅ Disposition + duration filters applied by the dialer ({len(rows)} calls)")
+
+
+def test_parser_row_pairing():
+    html = """<div id="list">
+      <div><span repvar="File">Call (555) 111-2222</span><span repvar="User">A B</span>
+        <a href="/r/1.mp3">rec</a></div>
+      <div><span repvar="File">Call (555) 333-4444</span><span repvar="User">C D</span>
+        <a href="/r/2.mp3">rec</a></div>
+    </div>
+    <ul id="ccs_cl_pagination"><li class="page selected">1</li><li class="page">2</li></ul>"""
+    page = parse_page(html)
+    assert page.rows == [({'File': "Call (555) 111-2222", 'User': "A B"}, "/r/1.mp3"),
+                         ({'File': "Call (555) 333-4444", 'User': "C D"}, "/r/2.mp3")]
+    assert page.pages == [(1, True), (2, False)]
+    print("✅ Each row paired with its own recording link")
+
+
+def test_parallel_pages_and_download():
+    with MockReadyModeServer(num_calls=300, page_size=25, latency=0.05) as server:
+        client = CallLogClient(server.url, page_prefetch=1)
+        client.login(server.username, server.password)
+        start = time.time()
+        serial = list(client.iter_calls())
+        serial_time = time.time() - start
+
+        client.page_prefetch = 4
+        start = time.time()
+        parallel = list(client.iter_calls())
+        parallel_time = time.time() - start
+        assert [row['href'] for row in parallel] == [row['href'] for row in serial]
+        print(f"✅ {len(parallel)} calls in order: {serial_time:.2f}s serial vs {parallel_time:.2f}s prefetched")
+
+        cwd = os.getcwd()
+        os.chdir(tempfile.mkdtemp())
+        try:
+            saved = []
+            count = download_call_recordings_http(server.url, "All users", max_samples=30,
+                                                  username="test", on_file_saved=saved.append)
+        finally:
+            os.chdir(cwd)
+        assert count == 30 and len(saved) == 30
+        assert all(os.path.getsize(path) > 1000 for path in saved)
+        print(f"✅ Downloaded {count} recordings over HTTP")
+
+
+def _downloader(server, client, min_duration, max_duration):
+    return CallDownloader(server.url, tempfile.mkdtemp(), {}, session=client.session,
+                          max_samples=10, max_attempts=20,
+                          min_duration=min_duration, max_duration=max_duration)
+
+
+def test_listed_duration_prefilter():
+    with MockReadyModeServer(num_calls=120) as server:
+        client = CallLogClient(server.url)
+        client.login(server.username, server.password)
+        calls = list(client.iter_calls())  # No dropdown filter: rows of every length
+
+        downloader = _downloader(server, client, 40, 130)
+        requests_before = server.request_count
+        downloader.download_calls(calls)
+        assert downloader.downloaded == 10 and downloader.attempted == 10
+        assert downloader.skipped_by_listing > 0
+        assert server.request_count - requests_before == 10  # Rejected rows never fetched
+        print(f"✅ {downloader.skipped_by_listing} out-of-range rows skipped before download")
+
+
+def test_header_probe_without_listed_duration():
+    with MockReadyModeServer(num_calls=60) as server:
+        client = CallLogClient(server.url)
+        client.login(server.username, server.password)
+        calls = [dict(call, duration=None) for call in client.iter_calls()]
+        expected = sum(1 for c in server.calls if 40 <= c['duration'] <= 130)
+
+        downloader = _downloader(server, client, 40, 130)
+        downloader.max_samples = downloader.max_attempts = len(calls)
+        downloader.download_calls(calls)
+        assert downloader.downloaded == expected
+        assert downloader.attempted == len(calls)
+        print(f"✅ Header probe kept {expected}/{len(calls)} recordings without decoding")
+
+
+def test_repeat_numbers_get_unique_files():
+    with MockReadyModeServer(num_calls=12) as server:
+        for call in server.calls:
+            call['agent'], call['uid'], call['phone'] = "John Smith", "100", "(555) 200-0000"
+        client = CallLogClient(server.url)
+        client.login(server.username, server.password)
+        calls = list(client.iter_calls())
+
+        saved = []
+        downloader = CallDownloader(server.url, tempfile.mkdtemp(), {}, session=client.session,
+                                    max_samples=len(calls), max_attempts=len(calls),
+                                    on_file_saved=saved.append)
+        downloader.download_calls(calls)
+        files = [name for name in os.listdir(downloader.download_dir) if not name.startswith(".")]
+    assert downloader.downloaded == len(calls) == len(set(saved)) == len(files)
+    assert "JohnSmith_((555) 200-0000).mp3" in files
+    print(f"✅ {len(files)} calls to one number saved as {len(files)} separate files")
+
+
+def test_repeat_number_names_round_trip():
+    downloader = CallDownloader("http://127.0.0.1/", tempfile.mkdtemp(), {}, session=requests.Session(),
+                                max_samples=2, max_attempts=2)
+    filename = build_call_filename("John Smith", "Call (555) 200-0000 05/01/2024", 1)
+    first, second = downloader._claim_filename(filename), downloader._claim_filename(filename)
+    assert first != second
+    processor = AudioProcessor()
+    names = {processor.names_from_path(Path(name)) for name in (first, second)}
+    assert names == {("John Smith", "((555) 200-0000)")}
+    print(f"✅ '{second}' parses to the same agent and phone as '{first}'")
+
+
+def test_failed_stream_leaves_no_file():
+    with MockReadyModeServer(num_calls=40) as server:
+        long_calls = [c for c in server.calls if c['duration'] >= 120]
+        server.broken_recordings = {c['id'] for c in long_calls[:2]}
+        client = CallLogClient(server.url)
+        client.login(server.username, server.password)
+        calls = [row for row in client.iter_calls() if row['duration'] >= 120]
+
+        downloader = CallDownloader(server.url, tempfile.mkdtemp(), {}, session=client.session,
+                                    max_samples=len(calls), max_attempts=len(calls))
+        downloader.download_calls(calls)
+        files = sorted(os.listdir(downloader.download_dir))
+
+        # Dropped mid-stream: neither a partial .mp3 nor its .part temp file is left
+        assert downloader.downloaded == len(calls) - 2 == len(files)
+        assert not any(name.startswith(".") or name.endswith(".part") for name in files)
+        for name in files:
+            path = os.path.join(downloader.download_dir, name)
+            content = Path(path).read_bytes()
+            assert content == server.recording(next(c for c in server.calls if c['phone'] in name))
+            # Hash taken while streaming matches the content and is what hash_file() reuses
+            assert downloader.content_hashes[path] == hashlib.sha256(content).hexdigest() == hash_file(path)
+    print(f"✅ 2 dropped downloads cleaned up; {len(files)} saved files carry their streamed hash")
+
+
+if __name__ == "__main__":
+    test_login_and_agent_filter()
+    test_disposition_and_duration_filters()
+    test_parser_row_pairing()
+    test_parallel_pages_and_download()
+    test_listed_duration_prefilter()
+    test_header_probe_without_listed_duration()
+    test_repeat_numbers_get_unique_files()
+    test_repeat_number_names_round_trip()
+    test_failed_stream_leaves_no_file()
+    print("ALL TESTS PASSED")
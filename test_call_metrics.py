@@ -0,0 +1,87 @@
+"""
+Test script to verify the call quality metrics
+Builds synthetic agent channels in memory and checks sound level, cutting,
+dead-air red flags and that the verdicts match the metrics-free pipeline
+"""
+
+from config import app_settings
+from core.audio_decoder import PCMAudio
+from core.audio_processor import AudioProcessor, to_dataframe_row, RESULT_KEYS
+from analyzer.intro_detection import SpeechTimeline
+from analyzer.call_metrics import METRIC_FIELDS, compute_call_metrics
+from synthetic_calls import make_call
+
+
+def test_metrics_from_shared_features():
+    call = make_call([(1.0, 3.0), (4.0, 6.0), (8.0, 10.0)], seconds=12)
+    timeline = SpeechTimeline.from_audio(call, with_features=True)
+    assert timeline.features is not None and timeline.has_speech
+    metrics = compute_call_metrics(timeline)
+    assert set(metrics) == set(METRIC_FIELDS)
+    assert metrics['sound_level'] in ("Perfect", "Good", "Low", "Very Low")
+    assert metrics['network_issue'] == "No" and metrics['silence_red_flag'] == "No"
+
+    # Same speech segments as the plain full VAD
+    assert timeline.speech_segments == SpeechTimeline.from_audio(call).speech_segments
+    assert compute_call_metrics(SpeechTimeline.from_audio(call)) is None
+    print(f"✅ Metrics from the VAD's features: sound {metrics['sound_level_dbfs']} dBFS, "
+          f"tonality {metrics['tonality_dbfs']} dBFS")
+
+
+def test_sound_level_ratings():
+    loud = compute_call_metrics(SpeechTimeline.from_audio(make_call([(1, 9)], level=12000), with_features=True))
+    quiet = compute_call_metrics(SpeechTimeline.from_audio(make_call([(1, 9)], level=300), with_features=True))
+    assert loud['sound_level_dbfs'] > quiet['sound_level_dbfs']
+    assert loud['sound_level'] in ("Perfect", "Good") and quiet['sound_level'] == "Very Low"
+    print("✅ Loud and quiet agents rated apart")
+
+
+def test_cuts_and_dead_air():
+    call = make_call([(1.0, 12.0)], seconds=20)
+    samples = call.samples.copy()
+    for start_s in (3.0, 6.0, 9.0):
+        # Voice drops to digital silence mid-sentence
+        samples[int(start_s * 8000):int((start_s + 0.4) * 8000)] = 0
+    samples[int(13 * 8000):] = 0  # Muted line for the rest of the call
+    metrics = compute_call_metrics(SpeechTimeline.from_audio(PCMAudio(samples, 8000), with_features=True))
+    assert metrics['silence_cuts'] == 3 and metrics['cutting'] == "Good"
+    assert metrics['silence_red_flag'] == "Yes" and metrics['longest_silence_ms'] >= 6000
+    print(f"✅ {metrics['silence_cuts']} cuts and {metrics['longest_silence_ms']:.0f}ms of dead air found")
+
+
+def test_verdicts_unchanged_and_columns():
+    processor = AudioProcessor()
+    call = make_call([(6.0, 9.0)])
+    previous = app_settings.snapshot()
+    try:
+        app_settings.dual_channel_enabled = False  # Also needs whole-call VAD
+        app_settings.call_metrics_enabled = False
+        plain = processor.classify_call(call)
+        app_settings.call_metrics_enabled = True
+        with_metrics = processor.classify_call(call)
+    finally:
+        app_settings.apply_snapshot(previous)
+    assert plain['call_metrics'] is None and with_metrics['call_metrics'] is not None
+    # Metrics need every frame, so they cost the onset-only early exit
+    assert plain['speech_timeline'].onset_only and not with_metrics['speech_timeline'].onset_only
+    assert plain['late_hello_detection'] == with_metrics['late_hello_detection'] == "Yes"
+    assert plain['releasing_detection'] == with_metrics['releasing_detection'] == "No"
+
+    row = to_dataframe_row({'late_hello_detection': "Yes", **with_metrics['call_metrics']})
+    assert row[RESULT_KEYS["SOUND_LEVEL"]] == with_metrics['call_metrics']['sound_level']
+    assert row[RESULT_KEYS["SILENCE_RED_FLAG"]] in ("Yes", "No")
+
+    # Metrics off: no always-empty quality columns in tables and exports
+    plain_row = to_dataframe_row({'late_hello_detection': "Yes", 'releasing_detection': "No"})
+    metric_columns = {RESULT_KEYS[key] for key in ("SOUND_LEVEL", "TONALITY", "NETWORK_ISSUE", "CUTTING",
+                                                   "SILENCE_RED_FLAG")}
+    assert not metric_columns & set(plain_row)
+    print("✅ Verdicts unchanged; metrics added as result columns only when computed")
+
+
+if __name__ == "__main__":
+    test_metrics_from_shared_features()
+    test_sound_level_ratings()
+    test_cuts_and_dead_air()
+    test_verdicts_unchanged_and_columns()
+    print("ALL TESTS PASSED")
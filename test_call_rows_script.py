@@ -0,0 +1,74 @@
+"""
+Test script to verify the Selenium call-row scraper
+Runs CALL_ROWS_SCRIPT in headless Chrome on a fixture call-log page (the
+ReadyMode stand-in's markup plus nested-row edge cases) and checks it finds
+the same rows as the HTTP client's parser
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+from automation.call_log_client import parse_page
+from automation.mock_readymode import MockReadyModeServer
+
+# Edge cases: a link in an inner div (climb to the row holding File and User),
+# a row without a recording (skipped) and a wrapper div around both
+EDGE_CASE_ROWS = """
+<div class="wrapper">
+  <div><span repvar="User">Nested Link</span>
+    <span repvar="File">Call (555) 111-2222</span>
+    <div class="player"><div><a href="/recordings/nested.mp3">Play</a></div></div>
+  </div>
+  <div><span repvar="User">No Link</span><span repvar="File">Call (555) 333-4444</span></div>
+</div>"""
+
+
+def fixture_page():
+    with MockReadyModeServer(num_calls=30, page_size=25) as server:
+        page = server.render_call_log({})
+    return page.replace("</body>", EDGE_CASE_ROWS + "</body>")
+
+
+def test_call_rows_script_on_fixture_dom():
+    try:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from automation.download_readymode_calls import CALL_ROWS_SCRIPT, scrape_call_blocks
+    except ImportError:
+        print("⚠️ selenium not installed, call-row script not tested")
+        return
+
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    try:
+        driver = webdriver.Chrome(options=options)
+    except Exception as e:
+        print(f"⚠️ Chrome not available ({e}), call-row script not tested")
+        return
+
+    html = fixture_page()
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "call_log.html"
+            path.write_text(html, encoding="utf-8")
+            driver.get(path.as_uri())
+            rows = json.loads(driver.execute_script(CALL_ROWS_SCRIPT))
+            latencies = []
+            calls = scrape_call_blocks(driver, "https://dialer.example/", latencies)
+    finally:
+        driver.quit()
+
+    expected = parse_page(html).rows
+    assert len(expected) == 26  # 25 listed calls + the nested-link row
+    assert [(row['fields'], row['href'].rsplit("/", 1)[-1]) for row in rows] == \
+        [(fields, href.rsplit("/", 1)[-1]) for fields, href in expected]
+    assert calls[-1]['agent'] == "Nested Link" and calls[0]['duration'] is not None
+    assert len(latencies) == 1  # Recorded on the caller's list, not module state
+    print(f"✅ Call-row script found the parser's {len(rows)} rows in one round-trip")
+
+
+if __name__ == "__main__":
+    test_call_rows_script_on_fixture_dom()
+    print("ALL TESTS PASSED")
@@ -0,0 +1,77 @@
+"""
+Test script to verify the detector plugin registry
+Checks that shared features are computed once per call, that disabled
+detectors cost nothing and that optional detectors never fail a call
+"""
+
+from config import app_settings
+from analyzer.detector_registry import (
+    AnalysisContext, DETECTORS, FEATURES, register_detector, register_feature, run_detectors
+)
+from synthetic_calls import make_call
+
+# Agent speaks from 6s to 8s of a 10s call (a late hello)
+LATE_HELLO = [(6.0, 8.0)]
+
+
+def test_shared_feature_computed_once():
+    calls = []
+
+    @register_feature('test_energy', requires=('frame_rms',))
+    def test_energy(ctx):
+        calls.append(1)
+        return float(ctx['frame_rms'].sum())
+
+    @register_detector('test_a', requires=('test_energy',), fields=('test_a',))
+    def test_a(ctx):
+        return {'test_a': ctx['test_energy'] > 0}
+
+    @register_detector('test_b', requires=('test_energy', 'speech_timeline'), fields=('test_b',))
+    def test_b(ctx):
+        return {'test_b': ctx['speech_timeline'].has_speech}
+
+    try:
+        results, ctx = run_detectors(make_call(LATE_HELLO, seconds=10), detectors=['late_hello', 'test_a', 'test_b'])
+    finally:
+        for name in ('test_a', 'test_b'):
+            DETECTORS.pop(name)
+        FEATURES.pop('test_energy')
+    assert results == {'late_hello_detection': "Yes", 'test_a': True, 'test_b': True}
+    assert len(calls) == 1
+    assert {'test_energy', 'frame_features', 'detector:test_a'} <= set(ctx.timings)
+    print("✅ Plugin detectors share one computation of each feature")
+
+
+def test_disabled_detectors_cost_nothing():
+    previous = app_settings.call_metrics_enabled, app_settings.dual_channel_enabled
+    try:
+        app_settings.call_metrics_enabled = app_settings.dual_channel_enabled = False
+        ctx = AnalysisContext(make_call(LATE_HELLO, seconds=10))
+        results, _ = ctx.run()
+    finally:
+        app_settings.call_metrics_enabled, app_settings.dual_channel_enabled = previous
+    assert set(results) == {'releasing_detection', 'late_hello_detection'}
+    assert 'frame_features' not in ctx.timings  # Onset-only VAD, no whole-call FFT
+    assert ctx['speech_timeline'].onset_only == app_settings.vad_onset_only
+    print("✅ Only enabled detectors run; their unused features are never computed")
+
+
+def test_optional_detector_errors_are_contained():
+    @register_detector('test_broken', requires=('frame_levels',), fields=('test_broken',), optional=True)
+    def test_broken(ctx):
+        raise ValueError("boom")
+
+    try:
+        ctx = AnalysisContext(make_call(LATE_HELLO, seconds=10), detectors=['releasing', 'test_broken'])
+        results, errors = ctx.run()
+    finally:
+        DETECTORS.pop('test_broken')
+    assert results == {'releasing_detection': "No"} and errors == {'test_broken': "boom"}
+    print("✅ A failing optional detector leaves the verdicts intact")
+
+
+if __name__ == "__main__":
+    test_shared_feature_computed_once()
+    test_disabled_detectors_cost_nothing()
+    test_optional_detector_errors_are_contained()
+    print("ALL TESTS PASSED")
@@ -0,0 +1,130 @@
+"""
+Test script to verify dual-channel analysis
+Builds synthetic stereo calls in memory and checks the shared 2-channel frame
+pass, customer first speech, talk-over, dead air and who hung up
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from pydub import AudioSegment
+from config import app_settings
+from core.audio_decoder import PCMAudio, decode_agent_channel, select_channel
+from core.audio_processor import AudioProcessor, to_dataframe_row, RESULT_KEYS
+from analyzer.detector_registry import AnalysisContext
+from analyzer.intro_detection import SpeechTimeline, compute_frame_features, _normalized_samples
+from synthetic_calls import make_channel, write_wav
+
+
+def make_stereo(agent, customer, frame_rate=8000):
+    interleaved = np.empty(len(agent) * 2, dtype="<i2")
+    interleaved[0::2], interleaved[1::2] = agent, customer
+    return PCMAudio(interleaved, frame_rate, channels=2)
+
+
+def test_two_channel_pass_matches_mono():
+    agent = _normalized_samples(PCMAudio(make_channel([(1, 4)], seconds=60), 8000))
+    customer = _normalized_samples(PCMAudio(make_channel([(2, 9)], seconds=60, seed=1), 8000))
+    both = compute_frame_features((agent, customer), 8000)
+    for row, samples in enumerate((agent, customer)):
+        mono = compute_frame_features(samples, 8000)
+        for key in ('rms', 'zcr', 'centroid', 'bandwidth', 'rolloff'):
+            assert np.array_equal(both[key][row], mono[key]), key
+    assert both['n_frames'] == mono['n_frames']
+    print("✅ 2-channel frame pass matches each channel analyzed alone")
+
+
+def test_conversation_metrics():
+    agent = make_channel([(1.0, 3.0), (8.0, 10.0)])
+    customer = make_channel([(2.5, 5.0), (12.5, 14.0)], seed=1, dead_after=15.0)
+    call = make_stereo(agent, customer)
+
+    previous = app_settings.snapshot()
+    try:
+        app_settings.call_metrics_enabled = app_settings.dual_channel_enabled = True
+        ctx = AnalysisContext(call)
+        results, errors = ctx.run()
+        alone = AudioProcessor().classify_call(PCMAudio(agent, 8000))
+    finally:
+        app_settings.apply_snapshot(previous)
+    assert not errors
+    assert 2300 <= results['customer_onset_ms'] <= 2800
+    assert 0 < results['talk_over_ratio'] < 0.5 and results['talk_over_ms'] > 0
+    assert results['dead_air_ms'] >= 4000  # 5-8s and 10-12.5s
+    assert results['hung_up_by'] == "Customer"
+    assert ctx['frame_features'] is ctx['channel_features'][0]  # Agent side of the shared pass
+
+    # Skipping the customer's spectral stats below its energy threshold changes no segment
+    customer_alone = SpeechTimeline.from_audio(PCMAudio(customer, 8000), with_features=True)
+    assert ctx['customer_timeline'].speech_segments == customer_alone.speech_segments
+
+    # Agent verdicts are the same as for the agent channel alone
+    assert alone['late_hello_detection'] == results['late_hello_detection'] == "No"
+    assert alone['call_metrics']['sound_level_dbfs'] == results['sound_level_dbfs']
+    assert 'hung_up_by' not in alone['call_metrics']  # Mono: no customer metrics
+
+    row = to_dataframe_row(results)
+    assert row[RESULT_KEYS["HUNG_UP_BY"]] == "Customer"
+    assert row[RESULT_KEYS["CUSTOMER_ONSET"]] == round(results['customer_onset_ms'] / 1000, 2)
+    # Dual-channel off (the default): no always-empty conversation columns
+    conversation_columns = {RESULT_KEYS[key] for key in ("CUSTOMER_ONSET", "TALK_OVER", "DEAD_AIR", "HUNG_UP_BY")}
+    mono_row = to_dataframe_row({'late_hello_detection': alone['late_hello_detection'], **alone['call_metrics']})
+    assert not conversation_columns & set(mono_row) and RESULT_KEYS["SOUND_LEVEL"] in mono_row
+    print(f"✅ Customer speaks at {results['customer_onset_ms']:.0f}ms, "
+          f"talk-over {results['talk_over_ratio']:.0%}, dead air {results['dead_air_ms']:.0f}ms, "
+          f"customer hung up")
+
+
+def test_last_speaker_hung_up_when_lines_stay_open():
+    agent = make_channel([(1.0, 3.0), (14.0, 17.0)])
+    customer = make_channel([(3.5, 6.0)], seed=1)
+    results, _ = AnalysisContext(make_stereo(agent, customer), detectors=['conversation']).run()
+    assert results['hung_up_by'] == "Agent"
+    print("✅ Last speaker taken as the party who hung up")
+
+
+def test_dual_channel_disabled():
+    call = make_stereo(make_channel([(1, 3)]), make_channel([(4, 6)], seed=1))
+    previous = app_settings.snapshot()
+    try:
+        app_settings.call_metrics_enabled = app_settings.dual_channel_enabled = False
+        ctx = AnalysisContext(call)
+        results, _ = ctx.run()
+        # Enabled but mono: nothing to read on the customer side, verdicts stop at the onset
+        app_settings.dual_channel_enabled = True
+        mono = AnalysisContext(PCMAudio(make_channel([(1, 3)]), 8000))
+        mono.run()
+    finally:
+        app_settings.apply_snapshot(previous)
+    assert 'hung_up_by' not in results and 'channel_features' not in ctx.required
+    assert 'conversation' not in mono.detectors and mono['speech_timeline'].onset_only
+    print("✅ Customer channel untouched when dual-channel analysis is off or the call is mono")
+
+
+def test_stereo_decode():
+    ffmpeg = shutil.which(AudioSegment.converter) or shutil.which("ffmpeg")
+    if ffmpeg is None:
+        print("⚠️ ffmpeg not found, stereo decode not tested")
+        return
+    agent, customer = make_channel([(1, 3)], seconds=3), make_channel([(1, 2)], seconds=3, seed=1)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "Agent_555-000-0000.wav"
+        write_wav(path, make_stereo(agent, customer).samples, channels=2)
+        stereo = decode_agent_channel(path, ffmpeg_path=ffmpeg, with_customer=True)
+        mono = decode_agent_channel(path, ffmpeg_path=ffmpeg)
+    assert stereo.channels == 2 and len(stereo) == len(mono) == 3000
+    assert np.array_equal(select_channel(stereo, 0).samples, agent)
+    assert np.array_equal(select_channel(stereo, 1).samples, customer)
+    assert np.array_equal(mono.samples, agent)
+    print("✅ Both channels decoded into one interleaved buffer")
+
+
+if __name__ == "__main__":
+    test_two_channel_pass_matches_mono()
+    test_conversation_metrics()
+    test_last_speaker_hung_up_when_lines_stay_open()
+    test_dual_channel_disabled()
+    test_stereo_decode()
+    print("ALL TESTS PASSED")
@@ -0,0 +1,103 @@
+"""
+Test script to verify the single-pass recording scanner
+Checks extension classification, captured stat data, streamed folder audits
+and the cached Recordings directory index
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import analyzer.simple_main as simple_main
+from core.file_scanner import RecordingsIndex, scan_audio_files
+
+
+def make_tree(root):
+    (root / "Agent" / "Alice-2024-05-01").mkdir(parents=True)
+    (root / "Agent" / "Bob-2024-05-01" / "nested").mkdir(parents=True)
+    (root / "Agent" / "Alice-2024-05-01" / "Alice_555-000-0001.mp3").write_bytes(b"a" * 2000)
+    (root / "Agent" / "Alice-2024-05-01" / "Alice_555-000-0002.WAV").write_bytes(b"b" * 3000)
+    (root / "Agent" / "Alice-2024-05-01" / "notes.txt").write_bytes(b"c" * 100)
+    (root / "Agent" / "Bob-2024-05-01" / "nested" / "Bob_555-000-0003.m4a").write_bytes(b"d" * 4000)
+
+
+def test_single_pass_scan():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        make_tree(root)
+        found = {f.path.name: f for f in scan_audio_files(root)}
+        assert set(found) == {"Alice_555-000-0001.mp3", "Alice_555-000-0002.WAV", "Bob_555-000-0003.m4a"}
+        wav = found["Alice_555-000-0002.WAV"]
+        assert wav.st_size == 3000 and wav.st_mtime_ns == os.stat(wav.path).st_mtime_ns
+        assert list(scan_audio_files(root / "missing")) == []
+        with mock.patch.object(simple_main.app_settings, "result_cache_enabled", False):
+            assert len(simple_main.BatchProcessor().find_audio_files(str(root))) == 3
+        print("✅ One walk finds every audio extension (any case) with its stat data")
+
+
+def test_folder_audit_streams_scanned_files():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        make_tree(root)
+        seen = []
+
+        def fake_process(file_path, include_debug=False, file_stat=None):
+            seen.append(file_stat)
+            return {'file_path': str(file_path), 'classification_success': True,
+                    'releasing_detection': "No", 'late_hello_detection': "No"}
+
+        # No result cache: nothing is read from or written to the real Cache/ folder
+        with mock.patch.object(simple_main.app_settings, "result_cache_enabled", False), \
+                mock.patch.object(simple_main.app_settings, "incremental_audits", False):
+            processor = simple_main.BatchProcessor(executor='serial')
+            with mock.patch.object(simple_main, "_batch_processor", processor), \
+                    mock.patch.object(processor.audio_processor, "process_single_file", side_effect=fake_process):
+                records = list(simple_main.iter_analyze_folder(str(root)))
+        assert len(records) == 3 and records[-1]['total'] == 3 and not records[-1]['scanning']
+        assert all(stat is not None for stat in seen)  # Workers reuse the scan's stat data
+        print("✅ Folder audit streams scanned files to the workers")
+
+
+def test_index_rescans_only_changed_directories():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir) / "Recordings"
+        make_tree(root)
+        index_path = Path(tmpdir) / "index.json"
+
+        index = RecordingsIndex(root, index_path).refresh()
+        assert index.rescanned == 5
+
+        index = RecordingsIndex(root, index_path).refresh()
+        assert index.rescanned == 0
+
+        (root / "Agent" / "Carol-2024-05-02").mkdir()
+        (root / "Agent" / "Carol-2024-05-02" / "Carol_555-000-0004.mp3").write_bytes(b"e" * 2000)
+        index = RecordingsIndex(root, index_path).refresh()
+        assert index.rescanned == 2  # Agent/ and the new folder
+        assert index.find_folders("carol") == [root.resolve() / "Agent" / "Carol-2024-05-02"]
+        print("✅ Index lists only directories changed since the last refresh")
+
+
+def test_find_folders_prefers_match():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir) / "Recordings"
+        (root / "Alice-2024-05-01").mkdir(parents=True)
+        (root / "Alice-2024-05-02").mkdir()
+        (root / "Alice-empty").mkdir()
+        for folder in ("Alice-2024-05-01", "Alice-2024-05-02"):
+            (root / folder / "Alice_1.mp3").write_bytes(b"f" * 2000)
+
+        index = RecordingsIndex(root, Path(tmpdir) / "index.json").refresh()
+        folders = [p.name for p in index.find_folders("ALICE", prefer="2024-05-01")]
+        assert folders == ["Alice-2024-05-01", "Alice-2024-05-02"]  # Folders without audio are skipped
+        assert index.find_folders("Dave") == []
+        print("✅ Folder lookup is case-insensitive and ranks the preferred date first")
+
+
+if __name__ == "__main__":
+    test_single_pass_scan()
+    test_folder_audit_streams_scanned_files()
+    test_index_rescans_only_changed_directories()
+    test_find_folders_prefers_match()
+    print("ALL TESTS PASSED")
@@ -0,0 +1,155 @@
+"""
+Test script to verify the persistent result cache
+Checks content-hash keys, settings fingerprint invalidation, LRU eviction,
+incremental re-audits through the file index and that connections are closed
+"""
+
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+from unittest import mock
+from config import app_settings
+from core.result_cache import ResultCache, hash_file
+from analyzer.simple_main import BatchProcessor
+
+RESULT = {
+    'releasing_detection': "No",
+    'late_hello_detection': "Yes",
+    'classification_success': True,
+    'speech_segments': [[5200.0, 6100.0]],
+    'processing_time': 0.25
+}
+
+
+def test_round_trip_by_content_hash():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        first, second = Path(tmpdir) / "a.wav", Path(tmpdir) / "b.wav"
+        first.write_bytes(b"RIFF" + b"\x01" * 4096)
+        second.write_bytes(b"RIFF" + b"\x01" * 4096)
+
+        cache = ResultCache(Path(tmpdir) / "results.sqlite3")
+        cache.put(hash_file(first), RESULT)
+
+        # Same content under another name is a hit
+        assert cache.get(hash_file(second)) == RESULT
+        print("✅ Identical content reuses the cached result")
+
+
+def test_settings_change_invalidates():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = ResultCache(Path(tmpdir) / "results.sqlite3")
+        cache.put("abc", RESULT)
+
+        original = app_settings.vad_energy_threshold
+        try:
+            app_settings.vad_energy_threshold = original + 100
+            assert cache.get("abc") is None
+        finally:
+            app_settings.vad_energy_threshold = original
+        assert cache.get("abc") == RESULT
+        print("✅ Changing an analysis setting misses the cache")
+
+
+def test_failed_results_not_cached():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = ResultCache(Path(tmpdir) / "results.sqlite3")
+        cache.put("abc", {'classification_success': False, 'error': "Failed to load audio"})
+        assert cache.get("abc") is None
+        print("✅ Failed results are not cached")
+
+
+def test_lru_eviction():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = ResultCache(Path(tmpdir) / "results.sqlite3", max_entries=3)
+        for i in range(3):
+            cache.put(f"file{i}", RESULT)
+        cache.get("file0")  # Most recently used now
+        cache.put("file3", RESULT)
+
+        assert cache.stats()['entries'] == 3
+        assert cache.get("file1") is None
+        assert cache.get("file0") == RESULT
+        print("✅ Least recently used entry evicted")
+
+
+def test_file_index_reuses_unchanged_files():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        audio = Path(tmpdir) / "Agent_555-000-0000.wav"
+        audio.write_bytes(b"RIFF" + b"\x01" * 4096)
+        cache = ResultCache(Path(tmpdir) / "results.sqlite3")
+        cache.put(cache.content_hash(audio), RESULT)
+        assert cache.get_unchanged([audio]) == {audio: RESULT}
+
+        # Changed content (new size and mtime) is analyzed again
+        audio.write_bytes(b"RIFF" + b"\x02" * 8192)
+        os.utime(audio, ns=(0, 10 ** 9))
+        assert cache.get_unchanged([audio]) == {}
+        assert cache.get_unchanged([Path(tmpdir) / "missing.wav"]) == {}
+        print("✅ File index matches unchanged files only")
+
+
+def test_incremental_folder_audit():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        old, new = Path(tmpdir) / "Old_555-000-0001.wav", Path(tmpdir) / "New_555-000-0002.wav"
+        old.write_bytes(b"RIFF" + b"\x01" * 4096)
+        new.write_bytes(b"RIFF" + b"\x02" * 4096)
+        cache = ResultCache(Path(tmpdir) / "results.sqlite3")
+        cache.put(cache.content_hash(old), RESULT)
+
+        processor = BatchProcessor(executor='serial')
+        processor._result_cache = cache
+        analyzed = []
+
+        def fake_process(file_path, include_debug=False, file_stat=None):
+            analyzed.append(file_path)
+            return {'file_path': str(file_path), 'classification_success': True, 'cache_hit': False}
+
+        with mock.patch.object(processor.audio_processor, "process_single_file", side_effect=fake_process):
+            results = list(processor.iter_process_files([old, new]))
+
+        assert analyzed == [new] and len(results) == 2
+        reused = next(r for r in results if r['file_path'] == str(old))
+        assert reused['late_hello_detection'] == "Yes" and reused['agent_name'] == "Old"
+        assert processor.cache_stats == {'hits': 1, 'misses': 1, 'unchanged': 1}
+        print("✅ Re-audit analyzed only the new file and reused the stored verdict")
+
+
+def test_connections_closed():
+    opened, real_connect = [], sqlite3.connect
+
+    def connect(*args, **kwargs):
+        opened.append(real_connect(*args, **kwargs))
+        return opened[-1]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        audio = Path(tmpdir) / "a.wav"
+        audio.write_bytes(b"RIFF" + b"\x01" * 4096)
+        with mock.patch("core.result_cache.sqlite3.connect", side_effect=connect):
+            cache = ResultCache(Path(tmpdir) / "results.sqlite3")
+            content_hash = cache.content_hash(audio)
+            cache.put(content_hash, RESULT)
+            assert cache.get(content_hash) == RESULT
+            assert audio in cache.get_unchanged([audio])
+            assert cache.stats()['entries'] == 1
+            cache.clear()
+        assert cache.stats()['entries'] == 0  # Writes were committed before closing
+    assert len(opened) >= 7
+    for conn in opened:
+        try:
+            conn.execute("SELECT 1")
+        except sqlite3.ProgrammingError:
+            continue  # Closed
+        raise AssertionError("connection left open")
+    print(f"✅ All {len(opened)} cache connections closed after use")
+
+
+if __name__ == "__main__":
+    test_round_trip_by_content_hash()
+    test_settings_change_invalidates()
+    test_failed_results_not_cached()
+    test_lru_eviction()
+    test_file_index_reuses_unchanged_files()
+    test_incremental_folder_audit()
+    test_connections_closed()
+    print("ALL TESTS PASSED")
@@ -0,0 +1,110 @@
+"""
+Analysis Sample Rate Validation Report
+
+Runs every recording in a folder twice - at its native sample rate and at the
+telephony analysis rate - and reports whether the Releasing / Late Hello
+verdicts and first speech onset are unchanged, plus the processing speedup.
+
+Usage:
+    python test_sample_rate_validation.py <folder_path> [analysis_rate]
+
+    analysis_rate: Sample rate in Hz to validate (default: 8000)
+
+Example:
+    python test_sample_rate_validation.py "Recordings/Agent/auditor1/JohnSmith-2025-01-15"
+"""
+
+import sys
+import time
+from pathlib import Path
+from config import app_settings
+from core.audio_processor import AudioProcessor
+
+# Onset differences below this are expected from resampling (one 25ms hop)
+ONSET_TOLERANCE_S = 0.05
+
+
+def analyze_at_rate(processor, file_path, sample_rate):
+    """Process one file at the given analysis rate (None = native)."""
+    app_settings.analysis_sample_rate = sample_rate
+    start = time.time()
+    result = processor.process_single_file(file_path, include_debug=True)
+    result['elapsed'] = time.time() - start
+    onset = result.get('debug_info', {}).get('first_speech_onset_s', "None")
+    result['onset_s'] = onset if isinstance(onset, (int, float)) else None
+    return result
+
+
+def validate_folder(folder_path, analysis_rate=8000):
+    """
+    Compare native-rate and telephony-rate verdicts for every file in a folder.
+
+    Returns:
+        Number of files whose verdicts changed
+    """
+    processor = AudioProcessor()
+    files = sorted(
+        f for f in Path(folder_path).rglob("*")
+        if f.suffix.lower() in processor.supported_formats
+    )
+    if not files:
+        print(f"❌ No audio files found in: {folder_path}")
+        return 0
+
+    original_rate = app_settings.analysis_sample_rate
+    print("=" * 90)
+    print(f"ANALYSIS SAMPLE RATE VALIDATION: native vs {analysis_rate} Hz ({len(files)} files)")
+    print("=" * 90)
+    print(f"{'File':40s} {'Releasing':>11s} {'Late Hello':>11s} {'Onset (s)':>15s} {'Speedup':>8s}")
+    print("-" * 90)
+
+    changed = 0
+    onset_drift = 0
+    native_total = telephony_total = 0.0
+
+    try:
+        for file_path in files:
+            native = analyze_at_rate(processor, file_path, None)
+            telephony = analyze_at_rate(processor, file_path, analysis_rate)
+            native_total += native['elapsed']
+            telephony_total += telephony['elapsed']
+
+            same_verdicts = (
+                native.get('releasing_detection') == telephony.get('releasing_detection') and
+                native.get('late_hello_detection') == telephony.get('late_hello_detection')
+            )
+            if not same_verdicts:
+                changed += 1
+
+            onsets = (native['onset_s'], telephony['onset_s'])
+            if None not in onsets and abs(onsets[0] - onsets[1]) > ONSET_TOLERANCE_S:
+                onset_drift += 1
+
+            marker = "" if same_verdicts else "  ❌ CHANGED"
+            print(
+                f"{file_path.name[:40]:40s} "
+                f"{native.get('releasing_detection', 'Error'):>5s}/{telephony.get('releasing_detection', 'Error'):<5s} "
+                f"{native.get('late_hello_detection', 'Error'):>5s}/{telephony.get('late_hello_detection', 'Error'):<5s} "
+                f"{str(onsets[0]):>7s}/{str(onsets[1]):<7s} "
+                f"{native['elapsed'] / max(telephony['elapsed'], 1e-9):7.1f}x{marker}"
+            )
+    finally:
+        app_settings.analysis_sample_rate = original_rate
+
+    print("-" * 90)
+    print(f"Verdicts unchanged: {len(files) - changed}/{len(files)}")
+    print(f"Onset drift > {ONSET_TOLERANCE_S * 1000:.0f}ms: {onset_drift}/{len(files)}")
+    print(f"Total time: native {native_total:.2f}s, {analysis_rate} Hz {telephony_total:.2f}s "
+          f"({native_total / max(telephony_total, 1e-9):.1f}x faster)")
+    print("=" * 90)
+    print("✅ VALIDATION PASSED" if changed == 0 else "❌ VALIDATION FAILED - review changed files above")
+    return changed
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python test_sample_rate_validation.py <folder_path> [analysis_rate]")
+        sys.exit(1)
+
+    rate = int(sys.argv[2]) if len(sys.argv) > 2 else 8000
+    sys.exit(1 if validate_folder(sys.argv[1], rate) else 0)
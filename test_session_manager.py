@@ -0,0 +1,114 @@
+"""
+Test script to verify warm dialer session reuse
+Uses fake browsers, so no Chrome or network access is needed
+"""
+
+import time
+from automation.session_manager import SessionManager
+
+
+class FakeDriver:
+    def __init__(self):
+        self.logged_in = False
+        self.closed = False
+
+    def quit(self):
+        self.closed = True
+
+
+def make_manager(login_delay=0.05, **options):
+    started = []
+
+    def create_driver():
+        time.sleep(login_delay)  # Simulated browser start-up
+        started.append(FakeDriver())
+        return started[-1]
+
+    def login(driver, dialer_url):
+        driver.logged_in = True
+
+    def is_logged_in(driver, dialer_url):
+        return driver.logged_in and not driver.closed
+
+    return SessionManager(create_driver, login, is_logged_in, **options), started
+
+
+def test_session_reused_across_audits():
+    manager, started = make_manager()
+    for _ in range(3):
+        with manager.session("https://resva.readymode.com/", "Auditor1") as driver:
+            assert driver.logged_in
+
+    stats = manager.stats()
+    assert len(started) == 1
+    assert stats['cold_starts'] == 1 and stats['reuses'] == 2
+    assert stats['time_saved_s'] > 0
+    print(f"✅ One browser for 3 audits (~{stats['time_saved_s']:.2f}s saved)")
+
+
+def test_expired_session_relogs_in():
+    manager, started = make_manager()
+    with manager.session("https://resva.readymode.com/", "Auditor1") as driver:
+        pass
+    driver.logged_in = False  # Dialer expired the session
+
+    with manager.session("https://resva.readymode.com/", "Auditor1") as driver:
+        assert driver.logged_in
+    assert len(started) == 1 and manager.stats()['relogins'] == 1
+    print("✅ Expired session re-logged in without a new browser")
+
+
+def test_failed_audit_closes_browser():
+    manager, started = make_manager()
+    try:
+        with manager.session("https://resva.readymode.com/", "Auditor1"):
+            raise RuntimeError("page changed")
+    except RuntimeError:
+        pass
+    assert started[0].closed and manager.stats()['idle_sessions'] == 0
+
+    with manager.session("https://resva.readymode.com/", "Auditor1"):
+        pass
+    assert len(started) == 2
+    print("✅ Browser from a failed audit is not reused")
+
+
+def test_sessions_kept_per_dialer():
+    manager, started = make_manager()
+    with manager.session("https://resva.readymode.com/", "Auditor1"):
+        pass
+    with manager.session("https://resva2.readymode.com/", "Auditor1"):
+        pass
+    assert len(started) == 2
+    manager.close_all()
+    assert all(driver.closed for driver in started)
+    print("✅ Separate sessions per dialer, closed on shutdown")
+
+
+def test_idle_browser_closed_without_another_audit():
+    manager, started = make_manager(idle_timeout=0.1, reap_interval=0.05)
+    with manager.session("https://resva.readymode.com/", "Auditor1"):
+        pass
+    assert not started[0].closed and manager.stats()['idle_sessions'] == 1
+
+    # No further acquire(): the reaper closes the browser and then stops
+    deadline = time.time() + 5
+    while manager._reaper is not None and time.time() < deadline:
+        time.sleep(0.02)
+    assert started[0].closed and manager.stats()['idle_sessions'] == 0
+    assert manager._reaper is None
+
+    with manager.session("https://resva.readymode.com/", "Auditor1"):
+        pass
+    assert len(started) == 2 and manager._reaper is not None  # Restarted for the new idle session
+    manager.close_all()
+    print("✅ Idle browser closed after the timeout with no further audits")
+
+
+if __name__ == "__main__":
+    test_session_reused_across_audits()
+    test_expired_session_relogs_in()
+    test_failed_audit_closes_browser()
+    test_sessions_kept_per_dialer()
+    test_idle_browser_closed_without_another_audit()
+    print("ALL TESTS PASSED")
@@ -0,0 +1,140 @@
+"""
+Test script to verify the vectorized VAD frame-feature engine
+Checks that compute_frame_features() matches the original per-frame calculations exactly,
+that segments and the noise floor come from array operations with unchanged values,
+that the agent channel is selected as a zero-copy view of stereo audio, and that
+the early-exit onset scan stops as soon as the first speech run is long enough
+"""
+
+from unittest import mock
+
+import numpy as np
+from pydub import AudioSegment
+from analyzer import intro_detection
+from analyzer.intro_detection import (
+    compute_frame_features, calculate_spectral_features, SpeechTimeline, _speech_segments,
+    estimate_noise_floor, percentile_select, first_speech_segment, voice_activity_detection
+)
+from core.audio_decoder import select_channel
+from synthetic_calls import make_call, make_channel
+
+
+def make_test_signal(seconds=10, frame_rate=8000, seed=0):
+    """Build a normalized test signal: line noise and hum with speech-like bursts."""
+    bursts = [(start_s, start_s + 0.8) for start_s in np.arange(0.5, seconds - 1, 2.0)]
+    # Digital silence for the last second
+    audio_array = make_channel(bursts, seconds, frame_rate, level=4000, seed=seed, dead_after=seconds - 1,
+                               noise=40, hum=30).astype(np.float32)
+    return audio_array / np.max(np.abs(audio_array))
+
+
+def test_frame_features_match_per_frame_loop():
+    for frame_rate in (8000, 16000, 44100):
+        audio_array = make_test_signal(frame_rate=frame_rate)
+        features = compute_frame_features(audio_array, frame_rate)
+        
+        frame_length = int(0.05 * frame_rate)
+        hop_length = int(0.025 * frame_rate)
+        starts = list(range(0, len(audio_array) - frame_length, hop_length))
+        assert len(features['rms']) == len(starts)
+        
+        for k, i in enumerate(starts):
+            frame = audio_array[i:i + frame_length]
+            spectral = calculate_spectral_features(frame, frame_rate)
+            assert features['rms'][k] == np.sqrt(np.mean(frame**2)) * 32767
+            assert features['zcr'][k] == np.sum(np.diff(np.sign(frame)) != 0) / len(frame)
+            assert features['centroid'][k] == spectral['centroid']
+            assert features['bandwidth'][k] == spectral['bandwidth']
+            assert features['rolloff'][k] == spectral['rolloff']
+        
+        print(f"✅ {frame_rate} Hz: {len(starts)} frames match")
+
+
+def test_short_signal_has_no_frames():
+    features = compute_frame_features(np.zeros(100, dtype=np.float32), 8000)
+    assert len(features['rms']) == 0
+
+
+def test_agent_channel_is_strided_view():
+    left = (make_test_signal(seed=1) * 20000).astype("<i2")
+    right = (make_test_signal(seed=2) * 20000).astype("<i2")
+    stereo = AudioSegment(np.column_stack([left, right]).tobytes(),
+                          frame_rate=8000, sample_width=2, channels=2)
+
+    agent = select_channel(stereo, 0)
+    assert np.shares_memory(agent.get_array_of_samples(), np.frombuffer(stereo.raw_data, dtype="<i2"))
+    assert np.array_equal(agent.get_array_of_samples(), stereo.split_to_mono()[0].get_array_of_samples())
+    assert np.array_equal(select_channel(stereo, 1).get_array_of_samples(), right)
+    assert select_channel(agent) is agent  # Already mono: no re-splitting
+
+    from_view = SpeechTimeline.from_audio(stereo)
+    from_split = SpeechTimeline.from_audio(stereo.split_to_mono()[0])
+    assert from_view.speech_segments == from_split.speech_segments and from_view.has_speech
+    print("✅ Agent channel read through a strided view with identical VAD segments")
+
+
+def loop_segments(speech_frames, hop_length, frame_rate, n_samples, min_speech_duration):
+    """The original per-frame segment loop, as the reference."""
+    segments, in_speech, speech_start = [], False, 0
+    for i, is_speech in enumerate(speech_frames):
+        time_ms = i * hop_length / frame_rate * 1000
+        if is_speech and not in_speech:
+            speech_start, in_speech = time_ms, True
+        elif not is_speech and in_speech:
+            if time_ms - speech_start >= min_speech_duration:
+                segments.append((speech_start, time_ms))
+            in_speech = False
+    if in_speech and n_samples / frame_rate * 1000 - speech_start >= min_speech_duration:
+        segments.append((speech_start, n_samples / frame_rate * 1000))
+    return segments
+
+
+def test_segments_and_noise_floor_match_loops():
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        mask = rng.random(int(rng.integers(0, 300))) < rng.random()
+        hop, frame_rate = int(rng.choice([200, 1102])), int(rng.choice([8000, 44100]))
+        n_samples = len(mask) * hop + int(rng.integers(0, 3 * hop))
+        for min_ms in (0, 100, 250):
+            assert _speech_segments(mask, hop, frame_rate, n_samples, min_ms) == \
+                loop_segments(mask, hop, frame_rate, n_samples, min_ms)
+
+    audio_array = make_test_signal()
+    frame_energies = [np.sqrt(np.mean(audio_array[i:i + 400] ** 2)) * 32767
+                      for i in range(0, len(audio_array) - 400, 200)]
+    assert estimate_noise_floor(audio_array, 8000) == np.percentile(frame_energies, 10)
+    rms = compute_frame_features(audio_array, 8000)['rms']
+    assert estimate_noise_floor(None, 8000, rms=rms) == estimate_noise_floor(audio_array, 8000, select=False)
+    for values in (rms, np.round(rms), rng.random(1001), np.zeros(5), np.array([3.0])):
+        for percentile in (0, 10, 37.5, 90, 100):
+            assert percentile_select(values, percentile) == np.percentile(values, percentile)
+    print("✅ Run-length segments and O(n) noise floor match the original loops")
+
+
+def test_onset_scan_stops_once_speech_is_long_enough():
+    for bursts in ([(0.5, 1.3), (6.0, 6.8)], [(5.0, 5.05), (7.0, 9.0)], [(19.0, 20.0)], []):
+        call = make_call(bursts, level=4000)
+        segments = voice_activity_detection(call)
+        first = first_speech_segment(call)
+        assert (first is None) == (not segments)
+        if first:
+            assert first[0] == segments[0][0] and first[0] < first[1] <= segments[0][1]
+
+    # One long run of speech: the scan stops in the block where it became long enough
+    call = make_call([(1.0, 115.0)], seconds=120, level=4000)
+    with mock.patch.object(intro_detection, 'compute_frame_features',
+                           wraps=intro_detection.compute_frame_features) as features:
+        start_ms, end_ms = first_speech_segment(call, min_speech_duration=250)
+    assert features.call_count == 1
+    assert start_ms == voice_activity_detection(call, min_speech_duration=250)[0][0]
+    assert 250 <= end_ms - start_ms < 300
+    print("✅ Onset scan returns the full VAD onset as soon as the first run is long enough")
+
+
+if __name__ == "__main__":
+    test_frame_features_match_per_frame_loop()
+    test_short_signal_has_no_frames()
+    test_agent_channel_is_strided_view()
+    test_segments_and_noise_floor_match_loops()
+    test_onset_scan_stops_once_speech_is_long_enough()
+    print("ALL TESTS PASSED")